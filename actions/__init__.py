@@ -4,24 +4,39 @@
 # See this guide on how to implement these action:
 # https://rasa.com/docs/rasa/custom-actions
 
-
+import importlib
 from typing import Any, Text, Dict, List
-    
-from rasa_sdk import Action, Tracker
-from rasa_sdk.executor import CollectingDispatcher
-
-# Import actual action implementations
-from .actions import (
-    ValidateKuesionerForm,
-    ValidateFeedbackForm,
-    ActionAnalisisKisahCinta,
-    ActionRekomendasiTema,
-    ActionDetailKonsep,
-    ActionJelaskanLegenda,
-    ActionSimpanDataRiset,
-    ActionInfoLokasiKontekstual,
-    ActionInfoPaketKontekstual,
-)
+
+# Action diekspor secara lazy (PEP 562): `from actions import X` tetap jalan,
+# tetapi modul action baru diimpor saat pertama kali dipakai. Dengan begitu
+# skrip yang hanya butuh `actions.supabase_client` dsb. tidak ikut memuat
+# rasa_sdk dan seluruh action.
+_LAZY_EXPORTS = {
+    "ValidateKuesionerForm": ".actions",
+    "ValidateFeedbackForm": ".actions",
+    "ActionAnalisisKisahCinta": ".actions",
+    "ActionRekomendasiTema": ".actions",
+    "ActionDetailKonsep": ".actions",
+    "ActionJelaskanLegenda": ".actions",
+    "ActionSimpanDataRiset": ".actions",
+    "ActionInfoLokasiKontekstual": ".actions",
+    "ActionInfoPaketKontekstual": ".actions",
+}
+
+__all__ = list(_LAZY_EXPORTS)
+
+
+def __getattr__(name: Text) -> Any:
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[Text]:
+    return sorted(list(globals()) + __all__)
 
 
 # Uncomment and modify this to create your first custom action
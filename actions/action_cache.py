@@ -0,0 +1,164 @@
+from typing import Any, Callable, Dict, List, Optional, Sequence, Text, Tuple
+from collections import OrderedDict
+import functools
+import inspect
+import os
+import threading
+import time
+
+from rasa_sdk.executor import CollectingDispatcher
+
+DEFAULT_MAXSIZE = 256
+DEFAULT_TTL = 300.0  # detik
+
+CachedResult = Tuple[List[Dict[Text, Any]], List[Dict[Text, Any]]]
+
+
+class ActionResultCache:
+    """LRU ber-TTL untuk hasil action: (pesan dispatcher, events).
+
+    Aman dipakai lintas thread. Entri yang kedaluwarsa dibuang saat dibaca;
+    bila penuh, entri yang paling lama tidak dipakai dikeluarkan.
+    """
+
+    def __init__(self, name: Text, maxsize: int = DEFAULT_MAXSIZE, ttl: float = DEFAULT_TTL) -> None:
+        self.name = name
+        self.maxsize = max(int(maxsize), 1)
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[Tuple, Tuple[float, CachedResult]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple) -> Optional[CachedResult]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key: Tuple, result: CachedResult) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[Text, Any]:
+        with self._lock:
+            size = len(self._entries)
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": size,
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+        }
+
+
+_caches: Dict[Text, ActionResultCache] = {}
+
+
+def cache_stats() -> Dict[Text, Dict[Text, Any]]:
+    """Statistik hit/miss semua action yang di-cache, per nama action"""
+    return {name: cache.stats() for name, cache in _caches.items()}
+
+
+def _cache_enabled() -> bool:
+    return os.environ.get("ACTION_CACHE_DISABLED", "").strip().lower() not in ("1", "true", "yes")
+
+
+def cached_action(
+    slots: Sequence[Text] = (),
+    latest_text: bool = False,
+    ttl: float = DEFAULT_TTL,
+    maxsize: int = DEFAULT_MAXSIZE,
+) -> Callable:
+    """Decorator untuk `run` milik action yang hanya bergantung pada slot/teks.
+
+    Key cache adalah nilai `slots` yang disebut (plus teks pesan terakhir
+    bila `latest_text=True`); action dengan nilai yang sama tidak dihitung
+    ulang, pesan dispatcher dan events hasil sebelumnya diputar ulang.
+    Dipakai sebagai decorator method, bukan base class, agar registrasi
+    action oleh rasa_sdk tidak berubah. Exception tidak di-cache.
+    Set ACTION_CACHE_DISABLED=1 untuk mematikan cache.
+    """
+    slots = tuple(slots)
+
+    def decorator(run: Callable) -> Callable:
+        cache_ref: Dict[Text, ActionResultCache] = {}
+
+        def get_cache(action: Any) -> ActionResultCache:
+            cache = cache_ref.get("cache")
+            if cache is None:
+                name = action.name()
+                cache = _caches.setdefault(name, ActionResultCache(name, maxsize, ttl))
+                cache_ref["cache"] = cache
+            return cache
+
+        def make_key(tracker: Any) -> Optional[Tuple]:
+            """Key cache, atau None bila ada nilai yang tidak hashable
+            (mis. slot berisi list saat satu pesan punya beberapa entity)"""
+            values = tuple(tracker.get_slot(slot) for slot in slots)
+            if latest_text:
+                values += ((tracker.latest_message or {}).get("text"),)
+            try:
+                hash(values)
+            except TypeError:
+                return None
+            return values
+
+        def replay(dispatcher: CollectingDispatcher, result: CachedResult) -> List[Dict[Text, Any]]:
+            messages, events = result
+            dispatcher.messages.extend(dict(m) for m in messages)
+            return [dict(e) for e in events]
+
+        if inspect.iscoroutinefunction(run):
+            @functools.wraps(run)
+            async def async_wrapper(self, dispatcher, tracker, domain):
+                key = make_key(tracker) if _cache_enabled() else None
+                if key is None:
+                    return await run(self, dispatcher, tracker, domain)
+                cache = get_cache(self)
+                result = cache.get(key)
+                if result is None:
+                    capture = CollectingDispatcher()
+                    events = await run(self, capture, tracker, domain)
+                    result = (capture.messages, list(events or []))
+                    cache.put(key, result)
+                return replay(dispatcher, result)
+
+            return async_wrapper
+
+        @functools.wraps(run)
+        def wrapper(self, dispatcher, tracker, domain):
+            key = make_key(tracker) if _cache_enabled() else None
+            if key is None:
+                return run(self, dispatcher, tracker, domain)
+            cache = get_cache(self)
+            result = cache.get(key)
+            if result is None:
+                capture = CollectingDispatcher()
+                events = run(self, capture, tracker, domain)
+                result = (capture.messages, list(events or []))
+                cache.put(key, result)
+            return replay(dispatcher, result)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,119 @@
+from typing import Any, Dict, List, Optional, Text
+import atexit
+import csv
+import os
+import threading
+
+DEFAULT_MAX_ROWS = 100
+DEFAULT_FLUSH_INTERVAL = 2.0  # detik
+# File Parquet tidak bisa di-append, jadi batch dibuat lebih besar agar
+# jumlah file per partisi tetap kecil
+PARQUET_MAX_ROWS = 1000
+PARQUET_FLUSH_INTERVAL = 60.0
+
+
+class CsvSink:
+    """Tulis batch baris ke satu file CSV (header hanya untuk file baru)"""
+
+    def __init__(self, filename: Text, fieldnames: List[Text]) -> None:
+        self.filename = filename
+        self.fieldnames = list(fieldnames)
+
+    def write(self, rows: List[Dict[Text, Any]]) -> None:
+        with open(self.filename, "a", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=self.fieldnames)
+            # Mode "a" sudah di akhir file; posisi 0 berarti file baru
+            if f.tell() == 0:
+                writer.writeheader()
+            writer.writerows(rows)
+
+
+class BufferedLogger:
+    """Logger ber-buffer yang aman dipakai lintas thread.
+
+    `log` hanya menambahkan baris ke buffer di memori (tanpa syscall).
+    Thread latar belakang menyerahkan buffer ke `sink` saat jumlah baris
+    mencapai `max_rows` atau setiap `flush_interval` detik, dan sekali lagi
+    saat proses berhenti (atexit).
+    """
+
+    def __init__(
+        self,
+        name: Text,
+        sink: Any,
+        max_rows: int = DEFAULT_MAX_ROWS,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+    ) -> None:
+        self.name = name
+        self.sink = sink
+        self.max_rows = max(int(max_rows), 1)
+        self.flush_interval = flush_interval
+
+        self._buffer: List[Dict[Text, Any]] = []
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = False
+        self._thread = threading.Thread(
+            target=self._run, name=f"buffered-logger-{name}", daemon=True
+        )
+        self._thread.start()
+
+    def log(self, row: Dict[Text, Any]) -> None:
+        with self._lock:
+            self._buffer.append(row)
+            full = len(self._buffer) >= self.max_rows
+        if full:
+            self._wakeup.set()
+
+    def flush(self) -> None:
+        with self._write_lock:
+            with self._lock:
+                rows, self._buffer = self._buffer, []
+            if not rows:
+                return
+            try:
+                self.sink.write(rows)
+            except Exception as e:
+                print(f"Error logging data to {self.name}: {e}")
+
+    def close(self) -> None:
+        self._stopped = True
+        self._wakeup.set()
+        self._thread.join()
+        self.flush()
+
+    def _run(self) -> None:
+        while not self._stopped:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+
+
+_loggers: Dict[Text, BufferedLogger] = {}
+_loggers_lock = threading.Lock()
+
+
+def _create_logger(filename: Text, fieldnames: List[Text]) -> BufferedLogger:
+    # CONVERSATION_LOG_FORMAT=parquet → dataset Parquet terpartisi harian
+    log_format = os.environ.get("CONVERSATION_LOG_FORMAT", "csv").strip().lower()
+    if log_format == "parquet":
+        from .columnar_log import ParquetPartitionSink
+
+        return BufferedLogger(
+            filename, ParquetPartitionSink(filename), PARQUET_MAX_ROWS, PARQUET_FLUSH_INTERVAL
+        )
+    return BufferedLogger(filename, CsvSink(filename, fieldnames))
+
+
+def get_buffered_logger(filename: Text, fieldnames: List[Text]) -> BufferedLogger:
+    """Logger bersama per file untuk seluruh proses"""
+    logger: Optional[BufferedLogger] = _loggers.get(filename)
+    if logger is None:
+        with _loggers_lock:
+            logger = _loggers.get(filename)
+            if logger is None:
+                logger = _create_logger(filename, fieldnames)
+                _loggers[filename] = logger
+                atexit.register(logger.close)
+    return logger
@@ -0,0 +1,157 @@
+"""Penulisan log percakapan dalam format kolumnar (Parquet) terpartisi harian.
+
+Mode ini opsional (CONVERSATION_LOG_FORMAT=parquet) dan butuh `pyarrow`.
+Setiap flush menulis satu file `part-*.parquet` ke folder
+`<dataset>/date=YYYY-MM-DD/`, sehingga skrip analisis cukup membaca
+partisi dan kolom yang dibutuhkan.
+"""
+
+from typing import Any, Callable, Dict, List, Optional, Text
+from datetime import datetime
+import ast
+import itertools
+import os
+import time
+
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+_part_seq = itertools.count()
+
+
+def _pyarrow():
+    """Impor pyarrow saat dibutuhkan saja.
+
+    rasa_sdk mengimpor semua submodul `actions` saat start, jadi impor di
+    level modul akan membebani cold start walau mode CSV yang dipakai.
+    """
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise ImportError("CONVERSATION_LOG_FORMAT=parquet membutuhkan paket 'pyarrow'")
+    return pyarrow
+
+
+def _entity_type():
+    pa = _pyarrow()
+    return pa.list_(pa.struct([
+        ("entity", pa.string()),
+        ("value", pa.string()),
+        ("start", pa.int32()),
+        ("end", pa.int32()),
+        ("extractor", pa.string()),
+    ]))
+
+
+def conversation_schema():
+    pa = _pyarrow()
+    return pa.schema([
+        ("timestamp", pa.timestamp("s")),
+        ("user_id", pa.string()),
+        ("user_message", pa.string()),
+        ("predicted_intent", pa.string()),
+        ("confidence_score", pa.float64()),
+        ("entities", _entity_type()),
+        ("correct_prediction", pa.string()),
+    ])
+
+
+def quality_schema():
+    pa = _pyarrow()
+    return pa.schema([
+        ("conversation_id", pa.string()),
+        ("timestamp", pa.timestamp("s")),
+        ("total_messages", pa.int32()),
+        ("total_fallbacks", pa.int32()),
+        ("low_confidence_predictions", pa.int32()),
+        ("fallback_rate", pa.float64()),
+        ("low_confidence_rate", pa.float64()),
+    ])
+
+
+# Nama file CSV lama → fungsi schema untuk dataset kolumnar-nya
+SCHEMAS: Dict[Text, Callable[[], Any]] = {
+    "user_conversations_log.csv": conversation_schema,
+    "conversation_quality_log.csv": quality_schema,
+}
+
+
+def dataset_dir(csv_filename: Text) -> Text:
+    """user_conversations_log.csv → user_conversations_log/"""
+    return os.path.splitext(csv_filename)[0]
+
+
+def _to_timestamp(value: Any) -> Optional[datetime]:
+    if value in (None, ""):
+        return None
+    if isinstance(value, datetime):
+        return value
+    return datetime.strptime(str(value), TIMESTAMP_FORMAT)
+
+
+def _to_entities(value: Any) -> List[Dict[Text, Any]]:
+    # CSV lama menyimpan str(list_of_dicts); mode baru menerima list langsung
+    if value in (None, ""):
+        return []
+    if isinstance(value, str):
+        value = ast.literal_eval(value)
+    return [
+        {
+            "entity": e.get("entity"),
+            "value": None if e.get("value") is None else str(e.get("value")),
+            "start": e.get("start"),
+            "end": e.get("end"),
+            "extractor": e.get("extractor"),
+        }
+        for e in value
+    ]
+
+
+def _converter(field_type) -> Callable[[Any], Any]:
+    pa = _pyarrow()
+    if pa.types.is_timestamp(field_type):
+        return _to_timestamp
+    if pa.types.is_list(field_type):
+        return _to_entities
+    if pa.types.is_integer(field_type):
+        return lambda v: None if v in (None, "") else int(float(v))
+    if pa.types.is_floating(field_type):
+        return lambda v: None if v in (None, "") else float(v)
+    return lambda v: None if v in (None, "") else str(v)
+
+
+def rows_to_table(rows: List[Dict[Text, Any]], schema) -> "pa.Table":
+    """Konversi baris dict (dari action atau CSV) ke tabel Arrow bertipe"""
+    pa = _pyarrow()
+    columns = {}
+    for field in schema:
+        convert = _converter(field.type)
+        columns[field.name] = [convert(r.get(field.name)) for r in rows]
+    return pa.Table.from_pydict(columns, schema=schema)
+
+
+def write_partitioned(table: "pa.Table", root: Text, basename: Optional[Text] = None) -> List[Text]:
+    """Tulis tabel ke root/date=YYYY-MM-DD/part-*.parquet; kembalikan path yang ditulis"""
+    pa = _pyarrow()
+    basename = basename or f"part-{int(time.time() * 1000)}-{os.getpid()}-{next(_part_seq)}"
+    dates = [None if ts is None else ts.strftime("%Y-%m-%d") for ts in table.column("timestamp").to_pylist()]
+    written = []
+    for day in sorted(set(d for d in dates if d is not None)):
+        mask = pa.array([d == day for d in dates])
+        part_dir = os.path.join(root, f"date={day}")
+        os.makedirs(part_dir, exist_ok=True)
+        path = os.path.join(part_dir, f"{basename}.parquet")
+        pa.parquet.write_table(table.filter(mask), path)
+        written.append(path)
+    return written
+
+
+class ParquetPartitionSink:
+    """Sink untuk BufferedLogger yang menulis batch ke dataset Parquet harian"""
+
+    def __init__(self, csv_filename: Text) -> None:
+        self.root = dataset_dir(csv_filename)
+        self.schema = SCHEMAS[csv_filename]()
+
+    def write(self, rows: List[Dict[Text, Any]]) -> None:
+        write_partitioned(rows_to_table(rows, self.schema), self.root)
@@ -0,0 +1,102 @@
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Text, Tuple
+import json
+import os
+import threading
+
+CATALOG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "content_catalog.json")
+
+
+def _freeze(value: Any) -> Any:
+    """dict → MappingProxyType dan list → tuple, rekursif"""
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _thaw(value: Any) -> Any:
+    """Kebalikan `_freeze`, untuk payload yang harus bisa di-serialisasi JSON"""
+    if isinstance(value, Mapping):
+        return {k: _thaw(v) for k, v in value.items()}
+    if isinstance(value, tuple):
+        return [_thaw(v) for v in value]
+    return value
+
+
+class ContentCatalog:
+    """Konten konsep, legenda, kisah, sinonim dan template (read-only).
+
+    Dimuat sekali dari `content_catalog.json` lalu dibekukan, sehingga
+    semua action memakai objek yang sama tanpa membangun ulang literal
+    dict/list di setiap `run`. Urutan key mengikuti file JSON.
+    """
+
+    def __init__(self, data: Dict[Text, Any]) -> None:
+        self.concepts: Mapping[Text, Mapping[Text, Text]] = _freeze(data["concepts"])
+        self.theme_explanations: Mapping[Text, Text] = _freeze(data["theme_explanations"])
+        self.legend_explanations: Mapping[Text, Text] = _freeze(data["legend_explanations"])
+        self.synonyms: Mapping[Text, Tuple[Text, ...]] = _freeze(data["synonyms"])
+        self.stories: Tuple[Mapping[Text, Any], ...] = _freeze(data["stories"])
+        self.kisah_tema: Mapping[Text, Text] = _freeze(data["kisah_tema"])
+        self.paket: Mapping[Text, Text] = _freeze(data["paket"])
+        self.rekomendasi_templates: Mapping[Text, Text] = _freeze(data["rekomendasi_templates"])
+
+        # Indeks yang dihitung sekali
+        self.stories_by_id: Mapping[Text, Mapping[Text, Any]] = MappingProxyType(
+            {s["id"]: s for s in self.stories}
+        )
+        stories_by_theme: Dict[Text, List[Mapping[Text, Any]]] = {}
+        for story in self.stories:
+            for theme in story["themes"]:
+                stories_by_theme.setdefault(theme, []).append(story)
+        self.stories_by_theme: Mapping[Text, Tuple[Mapping[Text, Any], ...]] = MappingProxyType(
+            {theme: tuple(items) for theme, items in stories_by_theme.items()}
+        )
+        # Sinonim → key; bila satu sinonim dipakai beberapa key, key pertama menang
+        by_synonym: Dict[Text, Text] = {}
+        for key, syns in self.synonyms.items():
+            by_synonym.setdefault(key.replace("_", " "), key)
+            for syn in syns:
+                by_synonym.setdefault(syn, key)
+        self.by_synonym: Mapping[Text, Text] = MappingProxyType(by_synonym)
+        # Salinan biasa (list/dict) untuk json_message; dibuat sekali, jangan diubah
+        self.stories_json: List[Dict[Text, Any]] = _thaw(self.stories)
+        self._stories_json_by_id = {s["id"]: s for s in self.stories_json}
+
+    def concept(self, concept_id: Text) -> Optional[Mapping[Text, Text]]:
+        return self.concepts.get(concept_id)
+
+    def story(self, story_id: Text) -> Optional[Mapping[Text, Any]]:
+        return self.stories_by_id.get(story_id)
+
+    def story_json(self, story_id: Text) -> Optional[Dict[Text, Any]]:
+        """Seperti `story`, tetapi dalam bentuk dict biasa untuk json_message"""
+        return self._stories_json_by_id.get(story_id)
+
+    def tema_for_kisah(self, kisah_id: Text) -> Optional[Text]:
+        return self.kisah_tema.get(kisah_id)
+
+    def key_for_synonym(self, value: Text) -> Optional[Text]:
+        """Key tema/legenda untuk sinonim yang persis sama (lowercase)"""
+        return self.by_synonym.get((value or "").lower().strip())
+
+    def render_rekomendasi(self, tema: Text, budget: Text) -> Text:
+        """Template rekomendasi tema dengan blok paket sesuai budget"""
+        return self.rekomendasi_templates[tema].replace("{paket}", self.paket[budget])
+
+
+_catalog: Optional[ContentCatalog] = None
+_catalog_lock = threading.Lock()
+
+
+def get_content_catalog() -> ContentCatalog:
+    """Katalog bersama untuk seluruh proses (dimuat saat pertama dipakai)"""
+    global _catalog
+    if _catalog is None:
+        with _catalog_lock:
+            if _catalog is None:
+                with open(CATALOG_PATH, encoding="utf-8") as f:
+                    _catalog = ContentCatalog(json.load(f))
+    return _catalog
@@ -1,10 +1,21 @@
 from typing import Any, Text, Dict, List
 from rasa_sdk import Action, Tracker
 from rasa_sdk.executor import CollectingDispatcher
+from collections import OrderedDict
 from datetime import datetime
-import json
-import csv
-import os
+import threading
+
+from .buffered_logger import get_buffered_logger
+from .metrics import instrument_actions
+
+CONVERSATION_LOG_FILE = 'user_conversations_log.csv'
+CONVERSATION_LOG_FIELDS = ['timestamp', 'user_id', 'user_message',
+                           'predicted_intent', 'confidence_score',
+                           'entities', 'correct_prediction']
+QUALITY_LOG_FILE = 'conversation_quality_log.csv'
+QUALITY_LOG_FIELDS = ['conversation_id', 'timestamp', 'total_messages',
+                      'total_fallbacks', 'low_confidence_predictions',
+                      'fallback_rate', 'low_confidence_rate']
 
 class ActionLogUserInput(Action):
     """Log semua user input untuk analisis & improvement"""
@@ -29,27 +40,12 @@ class ActionLogUserInput(Action):
             'user_message': user_message,
             'predicted_intent': intent,
             'confidence_score': round(confidence, 4),
-            'entities': str(entities),
+            'entities': entities,  # CSV sink menulis str(entities) seperti sebelumnya
             'correct_prediction': 'unknown'  # Bisa diupdate manual nanti
         }
         
-        # Simpan ke CSV untuk analisis
-        filename = 'user_conversations_log.csv'
-        file_exists = os.path.isfile(filename)
-        
-        try:
-            with open(filename, 'a', newline='', encoding='utf-8') as f:
-                fieldnames = ['timestamp', 'user_id', 'user_message', 
-                            'predicted_intent', 'confidence_score', 
-                            'entities', 'correct_prediction']
-                writer = csv.DictWriter(f, fieldnames=fieldnames)
-                
-                if not file_exists:
-                    writer.writeheader()
-                
-                writer.writerow(log_data)
-        except Exception as e:
-            print(f"Error logging data: {e}")
+        # Simpan ke CSV untuk analisis (di-buffer, ditulis batch oleh thread latar)
+        get_buffered_logger(CONVERSATION_LOG_FILE, CONVERSATION_LOG_FIELDS).log(log_data)
         
         # Jika confidence rendah, kasih feedback
         if confidence < 0.6:
@@ -80,6 +76,56 @@ class ActionCollectFeedback(Action):
         return []
 
 
+class QualityCounterCache:
+    """Counter kualitas per sender, diperbarui hanya dari event baru.
+
+    Setiap entri menyimpan jumlah event yang sudah diproses beserta
+    timestamp event terakhirnya. Bila tracker berikutnya masih diawali
+    event yang sama, hanya event sesudahnya yang dihitung; bila tidak
+    (mis. tracker di-reset), counter dihitung ulang dari awal.
+    """
+
+    def __init__(self, max_senders: int = 10000) -> None:
+        self.max_senders = max_senders
+        self._entries: "OrderedDict[Text, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def update(self, sender_id: Text, events: List[Dict[Text, Any]]) -> tuple:
+        """Kembalikan (total_messages, total_fallbacks, low_confidence_count)"""
+        with self._lock:
+            entry = self._entries.get(sender_id)
+
+        start, total_messages, total_fallbacks, low_confidence_count = 0, 0, 0, 0
+        if entry is not None:
+            processed, last_ts, counts = entry
+            if 0 < processed <= len(events) and events[processed - 1].get('timestamp') == last_ts:
+                start = processed
+                total_messages, total_fallbacks, low_confidence_count = counts
+
+        for i in range(start, len(events)):
+            event = events[i]
+            if event.get('name') == 'action_default_fallback':
+                total_fallbacks += 1
+            if event.get('event') == 'user':
+                total_messages += 1
+                intent = event.get('parse_data', {}).get('intent', {})
+                confidence = intent.get('confidence', 1)
+                if confidence < 0.7:
+                    low_confidence_count += 1
+
+        counts = (total_messages, total_fallbacks, low_confidence_count)
+        last_ts = events[-1].get('timestamp') if events else None
+        with self._lock:
+            self._entries[sender_id] = (len(events), last_ts, counts)
+            self._entries.move_to_end(sender_id)
+            while len(self._entries) > self.max_senders:
+                self._entries.popitem(last=False)
+        return counts
+
+
+_quality_counters = QualityCounterCache()
+
+
 class ActionAnalyzeConversationQuality(Action):
     """Analisis kualitas conversation untuk improvement"""
     
@@ -90,19 +136,10 @@ class ActionAnalyzeConversationQuality(Action):
             tracker: Tracker,
             domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
         
-        events = tracker.events
-        
-        # Hitung metrics
-        total_messages = len([e for e in events if e.get('event') == 'user'])
-        total_fallbacks = len([e for e in events if e.get('name') == 'action_default_fallback'])
-        
-        low_confidence_count = 0
-        for event in events:
-            if event.get('event') == 'user':
-                intent = event.get('parse_data', {}).get('intent', {})
-                confidence = intent.get('confidence', 1)
-                if confidence < 0.7:
-                    low_confidence_count += 1
+        # Hitung metrics (inkremental: hanya event baru sejak run terakhir)
+        total_messages, total_fallbacks, low_confidence_count = _quality_counters.update(
+            tracker.sender_id, tracker.events
+        )
         
         # Save conversation quality
         quality_data = {
@@ -115,19 +152,10 @@ class ActionAnalyzeConversationQuality(Action):
             'low_confidence_rate': round(low_confidence_count / max(total_messages, 1), 4)
         }
         
-        filename = 'conversation_quality_log.csv'
-        file_exists = os.path.isfile(filename)
-        
-        try:
-            with open(filename, 'a', newline='', encoding='utf-8') as f:
-                fieldnames = list(quality_data.keys())
-                writer = csv.DictWriter(f, fieldnames=fieldnames)
-                
-                if not file_exists:
-                    writer.writeheader()
-                
-                writer.writerow(quality_data)
-        except Exception as e:
-            print(f"Error logging quality data: {e}")
+        get_buffered_logger(QUALITY_LOG_FILE, QUALITY_LOG_FIELDS).log(quality_data)
         
-        return []
\ No newline at end of file
+        return []
+
+
+# Latensi, jumlah panggilan dan exception per action (lihat metrics.py)
+instrument_actions(__name__)
@@ -0,0 +1,163 @@
+from typing import Dict, Iterable, List, NamedTuple, Optional, Pattern, Sequence, Set, Text, Tuple
+import json
+import os
+import re
+import threading
+
+from .content_catalog import get_content_catalog
+
+GAZETTEER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "gazetteer.json")
+
+
+class GazetteerMatch(NamedTuple):
+    group: Text
+    category: Text
+    start: int
+    end: int
+    phrase: Text
+
+
+_WORD_CHAR = re.compile(r"\w")
+
+
+class Gazetteer:
+    """Penanda frasa (lokasi, budget, tema, ...) untuk satu ucapan.
+
+    `groups` berbentuk {grup: (word_boundary, {kategori: [frasa, ...]})}.
+    `tag` mengembalikan setiap kecocokan (termasuk yang tumpang tindih)
+    beserta span-nya, hanya untuk grup yang diminta. Grup dengan
+    `word_boundary` hanya menerima kata utuh dan dicari dengan satu regex
+    terkompilasi; grup lain cukup substring (seperti `frasa in teks`) dan
+    dicari dengan `str.find`, yang untuk daftar frasa sependek ini lebih
+    cepat daripada regex (lihat scripts/bench_keyword_matcher.py). Dalam
+    satu grup, frasa yang dipakai beberapa kategori milik kategori pertama.
+    Urutan kategori mengikuti data dan dipakai sebagai prioritas oleh
+    `first_category_in`.
+    """
+
+    def __init__(self, groups: Dict[Text, Tuple[bool, Dict[Text, Sequence[Text]]]]) -> None:
+        self.word_boundary: Dict[Text, bool] = {}
+        self.category_order: Dict[Text, Tuple[Text, ...]] = {}
+        self._owners: Dict[Text, Dict[Text, Text]] = {}
+        self._patterns: Dict[Text, Pattern] = {}
+        self._prefixes: Dict[Text, Dict[Text, List[Text]]] = {}
+        self._by_category: Dict[Text, Tuple[Tuple[Text, Tuple[Text, ...]], ...]] = {}
+        for group, (word_boundary, categories) in groups.items():
+            self.word_boundary[group] = bool(word_boundary)
+            self.category_order[group] = tuple(categories)
+            owners: Dict[Text, Text] = {}
+            for category, phrases in categories.items():
+                for phrase in phrases:
+                    phrase = phrase.lower()
+                    if phrase:
+                        owners.setdefault(phrase, category)
+            self._owners[group] = owners
+            self._by_category[group] = tuple(
+                (category, tuple(p for p, owner in owners.items() if owner == category))
+                for category in categories
+            )
+            if word_boundary and owners:
+                # Lookahead: setiap posisi awal kata diperiksa, jadi kecocokan yang
+                # tumpang tindih tetap ditemukan. Alternatif terpanjang dicoba dulu;
+                # frasa lebih pendek di posisi yang sama adalah prefiksnya
+                alternation = "|".join(re.escape(p) for p in sorted(owners, key=len, reverse=True))
+                self._patterns[group] = re.compile(rf"(?<!\w)(?=({alternation})(?!\w))")
+                self._prefixes[group] = {
+                    phrase: [p for p in owners if p != phrase and phrase.startswith(p)] for phrase in owners
+                }
+
+    def tag(self, text: Text, groups: Optional[Iterable[Text]] = None) -> List[GazetteerMatch]:
+        """Semua kecocokan di teks (lowercase), urut menurut posisi"""
+        text = (text or "").lower()
+        matches = []
+        for group in (self._owners if groups is None else groups):
+            owners = self._owners[group]
+            pattern = self._patterns.get(group)
+            if pattern is not None:
+                prefixes = self._prefixes[group]
+                for m in pattern.finditer(text):
+                    start, phrase = m.start(), m.group(1)
+                    matches.append(GazetteerMatch(group, owners[phrase], start, start + len(phrase), phrase))
+                    for shorter in prefixes[phrase]:
+                        end = start + len(shorter)
+                        if not _WORD_CHAR.match(text, end):
+                            matches.append(GazetteerMatch(group, owners[shorter], start, end, shorter))
+            else:
+                for phrase, category in owners.items():
+                    start = text.find(phrase)
+                    while start != -1:
+                        matches.append(GazetteerMatch(group, category, start, start + len(phrase), phrase))
+                        start = text.find(phrase, start + 1)
+        matches.sort(key=lambda m: (m.start, -m.end))
+        return matches
+
+    def categories_in(self, text: Text, group: Text) -> Set[Text]:
+        """Kategori grup yang disebut di teks.
+
+        Tanpa span: grup substring cukup dicek dengan `in`, secepat daftar
+        `any(k in text ...)` yang dulu ditulis langsung di action.
+        """
+        if self.word_boundary[group]:
+            return {m.category for m in self.tag(text, (group,))}
+        text = (text or "").lower()
+        found = set()
+        for category, phrases in self._by_category[group]:
+            for phrase in phrases:
+                if phrase in text:
+                    found.add(category)
+                    break
+        return found
+
+    def first_category_in(self, text: Text, group: Text) -> Optional[Text]:
+        """Kategori dengan prioritas tertinggi (urutan data) yang disebut di teks"""
+        if self.word_boundary[group]:
+            found = self.categories_in(text, group)
+            return next((c for c in self.category_order[group] if c in found), None)
+        text = (text or "").lower()
+        for category, phrases in self._by_category[group]:
+            for phrase in phrases:
+                if phrase in text:
+                    return category
+        return None
+
+    @staticmethod
+    def longest(matches: Iterable[GazetteerMatch], group: Text) -> Optional[Text]:
+        """Kategori dari kecocokan terpanjang; bila sama panjang, yang paling kiri"""
+        best: Optional[GazetteerMatch] = None
+        for m in matches:
+            if m.group != group:
+                continue
+            if best is None or (m.end - m.start, -m.start) > (best.end - best.start, -best.start):
+                best = m
+        return best.category if best else None
+
+    def resolve_tema(self, text: Text) -> Optional[Text]:
+        """Tema/legenda yang disebut di teks bebas atau nilai slot (mis. 'ratu_pantai')"""
+        return self.longest(self.tag((text or "").replace("_", " "), ("tema",)), "tema")
+
+
+def _tema_phrases() -> Dict[Text, List[Text]]:
+    """Grup 'tema' dari sinonim katalog: key (dengan spasi) lalu sinonimnya"""
+    catalog = get_content_catalog()
+    return {key: [key.replace("_", " ")] + list(syns) for key, syns in catalog.synonyms.items()}
+
+
+_gazetteer: Optional[Gazetteer] = None
+_gazetteer_lock = threading.Lock()
+
+
+def get_gazetteer() -> Gazetteer:
+    """Gazetteer bersama: grup dari gazetteer.json plus grup 'tema' dari katalog konten"""
+    global _gazetteer
+    if _gazetteer is None:
+        with _gazetteer_lock:
+            if _gazetteer is None:
+                with open(GAZETTEER_PATH, encoding="utf-8") as f:
+                    data = json.load(f)
+                groups = {
+                    name: (spec.get("word_boundary", True), spec["categories"])
+                    for name, spec in data.items()
+                }
+                groups["tema"] = (True, _tema_phrases())
+                _gazetteer = Gazetteer(groups)
+    return _gazetteer
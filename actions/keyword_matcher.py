@@ -0,0 +1,41 @@
+from typing import Dict, List, Text, Tuple
+
+
+class WeightedKeywordScorer:
+    """Skor tema berbobot dari keyword per tingkat kekuatan.
+
+    `keywords` berbentuk {tema: {strength: [keyword, ...]}}. Setiap keyword
+    yang muncul di teks (substring) menambah bobot `weights[strength]` ke
+    temanya, sekali per keyword, persis seperti loop `keyword in text`.
+    Urutan tema dan urutan keyword yang cocok mengikuti urutan input.
+
+    Pencocokan tetap memakai `in` (pencarian substring di C), tetapi setiap
+    keyword unik hanya dicek sekali walau dipakai beberapa tema (mis.
+    'susah'). Automaton atau regex alternation di Python lebih lambat untuk
+    jumlah keyword sebesar ini (lihat scripts/bench_keyword_matcher.py).
+    """
+
+    def __init__(self, keywords: Dict[Text, Dict[Text, List[Text]]], weights: Dict[Text, int]) -> None:
+        self.themes: List[Text] = list(keywords)
+        entries: List[Tuple[Text, int, Text]] = []
+        for theme, by_strength in keywords.items():
+            for strength, words in by_strength.items():
+                for word in words:
+                    entries.append((theme, weights[strength], word))
+        self._entries = entries
+        # Keyword unik → index entri-nya (satu keyword bisa milik beberapa tema)
+        by_word: Dict[Text, List[int]] = {}
+        for entry_index, (_, _, word) in enumerate(entries):
+            by_word.setdefault(word, []).append(entry_index)
+        self._words: List[Tuple[Text, List[int]]] = list(by_word.items())
+
+    def score(self, text: Text) -> Tuple[Dict[Text, int], Dict[Text, List[Text]]]:
+        scores = {theme: 0 for theme in self.themes}
+        matched: Dict[Text, List[Text]] = {theme: [] for theme in self.themes}
+        hits = [entry_index for word, indexes in self._words if word in text for entry_index in indexes]
+        hits.sort()
+        for entry_index in hits:
+            theme, weight, word = self._entries[entry_index]
+            scores[theme] += weight
+            matched[theme].append(word)
+        return scores, matched
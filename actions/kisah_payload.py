@@ -0,0 +1,86 @@
+from typing import Any, Dict, Optional, Text
+import hashlib
+import json
+import threading
+
+from .content_catalog import get_content_catalog
+
+KISAH_TITLE = "Kisah Cinta Bali – Inspirasi Konsep Prewedding"
+KISAH_CTA = {
+    "text": "Rekomendasikan tema dari kisah ini",
+    "payload": "/rekomendasi_dari_kisah",
+}
+KISAH_SUGGESTIONS = [
+    {"title": "Analisis kisah kami", "payload": "/isi_kuesioner"},
+    {"title": "Lihat detail konsep", "payload": "/lihat_detail_konsep"},
+    # Gunakan intent yang sudah terikat rules agar selalu memanggil action_jelaskan_legenda
+    {"title": "Tanya makna tiap tema", "payload": "/jelaskan_legenda"},
+]
+
+
+class KisahPayload:
+    """Payload json_message `kisah_bali` yang dibangun sekali beserta versinya.
+
+    `version` adalah hash sha256 (12 karakter pertama) dari payload lengkap
+    yang di-serialisasi kanonik, sehingga berubah hanya bila kontennya
+    berubah. Hanya payload lengkap yang membawa `version`; frontend
+    menyimpannya dan mengirim balik versi tersebut (entity `kisah_version`).
+    Bila sama, action cukup mengirim marker `not_modified` atau delta berisi
+    kisah yang dipilih saja. Semua dict di sini dibagikan antar request dan
+    tidak boleh diubah.
+    """
+
+    def __init__(self) -> None:
+        catalog = get_content_catalog()
+        full: Dict[Text, Any] = {
+            "type": "kisah_bali",
+            "title": KISAH_TITLE,
+            "stories": catalog.stories_json,
+            "cta": KISAH_CTA,
+            "suggestions": KISAH_SUGGESTIONS,
+        }
+        canonical = json.dumps(full, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+        self.version: Text = hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:12]
+        self.size_bytes = len(canonical.encode("utf-8"))
+
+        self.full: Dict[Text, Any] = dict(full, version=self.version)
+        self.not_modified: Dict[Text, Any] = {
+            "type": "kisah_bali",
+            "version": self.version,
+            "not_modified": True,
+        }
+        self._selected: Dict[Text, Dict[Text, Any]] = {}
+        self._delta: Dict[Text, Dict[Text, Any]] = {}
+        for story in catalog.stories_json:
+            title = f"Kisah Cinta Bali – {story['title']}"
+            # Payload lama untuk kisah terpilih (tanpa versi: bukan daftar lengkap
+            # yang boleh disimpan frontend)
+            self._selected[story["id"]] = dict(full, stories=[story], title=title)
+            # Delta: frontend menggabungkan cta/suggestions dari versi yang dipegangnya
+            self._delta[story["id"]] = {
+                "type": "kisah_bali",
+                "version": self.version,
+                "delta": True,
+                "title": title,
+                "stories": [story],
+            }
+
+    def response(self, selected_id: Text = "", client_version: Optional[Text] = None) -> Dict[Text, Any]:
+        """Payload yang perlu dikirim untuk kisah terpilih dan versi milik klien"""
+        up_to_date = bool(client_version) and client_version == self.version
+        if selected_id in self._selected:
+            return self._delta[selected_id] if up_to_date else self._selected[selected_id]
+        return self.not_modified if up_to_date else self.full
+
+
+_payload: Optional[KisahPayload] = None
+_payload_lock = threading.Lock()
+
+
+def get_kisah_payload() -> KisahPayload:
+    global _payload
+    if _payload is None:
+        with _payload_lock:
+            if _payload is None:
+                _payload = KisahPayload()
+    return _payload
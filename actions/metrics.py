@@ -0,0 +1,352 @@
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Text, Tuple
+from bisect import bisect_left
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+import functools
+import inspect
+import os
+import sys
+import threading
+import time
+
+from .profiling import start_profile
+from .trace_capture import get_trace_recorder
+
+# Batas bucket histogram latensi (detik), gaya default Prometheus
+LATENCY_BUCKETS: Tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+DEFAULT_PORT = 9108
+BACKGROUND = "background"
+
+# Action yang sedang berjalan di konteks ini (async task / thread), untuk
+# mengatribusikan waktu HTTP keluar ke action tersebut
+_current_action: ContextVar[Text] = ContextVar("current_action", default=BACKGROUND)
+# Pemilik HTTP keluar yang dikirim atas nama action lain (mis. batch Supabase di
+# thread latar): ((action, bagian), ...); None = pakai _current_action
+_http_owners: ContextVar[Optional[Tuple[Tuple[Text, float], ...]]] = ContextVar("http_owners", default=None)
+
+
+class Histogram:
+    """Histogram kumulatif sederhana dengan bucket tetap (tidak thread-safe sendiri)"""
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS) -> None:
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # slot terakhir = +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class ActionStats:
+    def __init__(self) -> None:
+        self.latency = Histogram()
+        self.errors: Dict[Text, int] = {}
+        self.http_seconds = 0.0
+        self.http_requests = 0
+
+
+class MetricsRegistry:
+    """Metrik per nama action: latensi, jumlah panggilan, exception, HTTP keluar.
+
+    Setiap pencatatan hanya mengambil satu lock dan beberapa operasi
+    aritmetika, sehingga aman dibiarkan aktif di produksi.
+    """
+
+    def __init__(self) -> None:
+        self._actions: Dict[Text, ActionStats] = {}
+        self._lock = threading.Lock()
+
+    def _stats(self, action: Text) -> ActionStats:
+        stats = self._actions.get(action)
+        if stats is None:
+            stats = self._actions.setdefault(action, ActionStats())
+        return stats
+
+    def observe_run(self, action: Text, seconds: float, error: Optional[BaseException] = None) -> None:
+        with self._lock:
+            stats = self._stats(action)
+            stats.latency.observe(seconds)
+            if error is not None:
+                name = type(error).__name__
+                stats.errors[name] = stats.errors.get(name, 0) + 1
+
+    def observe_http(self, action: Text, seconds: float) -> None:
+        with self._lock:
+            stats = self._stats(action)
+            stats.http_seconds += seconds
+            stats.http_requests += 1
+
+    def observe_shared_http(self, owners: Tuple[Tuple[Text, float], ...], seconds: float) -> None:
+        """Satu request untuk beberapa action: waktu dibagi per bagian, request dihitung per action"""
+        with self._lock:
+            for action, share in owners:
+                stats = self._stats(action)
+                stats.http_seconds += seconds * share
+                stats.http_requests += 1
+
+    def snapshot(self) -> Dict[Text, ActionStats]:
+        """Salinan data per action (dibuat di bawah lock)"""
+        with self._lock:
+            copy = {}
+            for action, stats in self._actions.items():
+                clone = ActionStats()
+                clone.latency.counts = list(stats.latency.counts)
+                clone.latency.sum = stats.latency.sum
+                clone.latency.count = stats.latency.count
+                clone.errors = dict(stats.errors)
+                clone.http_seconds = stats.http_seconds
+                clone.http_requests = stats.http_requests
+                copy[action] = clone
+            return copy
+
+    def render_prometheus(self) -> Text:
+        """Semua metrik dalam format teks Prometheus (exposition 0.0.4)"""
+        snapshot = self.snapshot()
+        lines: List[Text] = []
+
+        def header(name: Text, kind: Text, help_text: Text) -> None:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        header("action_run_duration_seconds", "histogram", "Latency of custom action runs")
+        # Entri yang hanya punya HTTP keluar (mis. "background") tidak punya histogram
+        ran = sorted((action, stats) for action, stats in snapshot.items() if stats.latency.count)
+        for action, stats in ran:
+            label = _label(action)
+            cumulative = 0
+            for bound, count in zip(stats.latency.buckets, stats.latency.counts):
+                cumulative += count
+                lines.append(f'action_run_duration_seconds_bucket{{action="{label}",le="{bound}"}} {cumulative}')
+            lines.append(f'action_run_duration_seconds_bucket{{action="{label}",le="+Inf"}} {stats.latency.count}')
+            lines.append(f'action_run_duration_seconds_sum{{action="{label}"}} {stats.latency.sum:.6f}')
+            lines.append(f'action_run_duration_seconds_count{{action="{label}"}} {stats.latency.count}')
+
+        header("action_calls_total", "counter", "Number of custom action runs")
+        for action, stats in ran:
+            lines.append(f'action_calls_total{{action="{_label(action)}"}} {stats.latency.count}')
+
+        header("action_errors_total", "counter", "Exceptions raised by custom action runs")
+        for action, stats in sorted(snapshot.items()):
+            for error, count in sorted(stats.errors.items()):
+                lines.append(f'action_errors_total{{action="{_label(action)}",exception="{_label(error)}"}} {count}')
+
+        header("action_outbound_http_seconds_total", "counter",
+               "Time spent in outbound HTTP calls, by the action that made them")
+        for action, stats in sorted(snapshot.items()):
+            if stats.http_requests:
+                lines.append(f'action_outbound_http_seconds_total{{action="{_label(action)}"}} {stats.http_seconds:.6f}')
+
+        header("action_outbound_http_requests_total", "counter", "Outbound HTTP calls, by the action that made them")
+        for action, stats in sorted(snapshot.items()):
+            if stats.http_requests:
+                lines.append(f'action_outbound_http_requests_total{{action="{_label(action)}"}} {stats.http_requests}')
+
+        # Statistik cache hasil action (lihat action_cache.py), bila modul sudah dimuat
+        action_cache = sys.modules.get(f"{__package__}.action_cache")
+        if action_cache is not None:
+            cache_stats = action_cache.cache_stats()
+            for metric, field, help_text in (
+                ("action_cache_hits_total", "hits", "Action result cache hits"),
+                ("action_cache_misses_total", "misses", "Action result cache misses"),
+                ("action_cache_evictions_total", "evictions", "Action result cache evictions"),
+            ):
+                header(metric, "counter", help_text)
+                for action, stats in sorted(cache_stats.items()):
+                    lines.append(f'{metric}{{action="{_label(action)}"}} {stats[field]}')
+
+        return "\n".join(lines) + "\n"
+
+
+def _label(value: Text) -> Text:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+registry = MetricsRegistry()
+
+
+def current_action() -> Text:
+    return _current_action.get()
+
+
+def record_outbound_http(seconds: float) -> None:
+    """Dipanggil klien HTTP; waktu dicatat ke action yang sedang berjalan"""
+    owners = _http_owners.get()
+    if owners is None:
+        registry.observe_http(_current_action.get(), seconds)
+    else:
+        registry.observe_shared_http(owners, seconds)
+
+
+@contextmanager
+def outbound_http_for(actions: Iterable[Text]) -> Iterator[None]:
+    """Atribusikan HTTP keluar di blok ini ke `actions` (satu entri per baris).
+
+    Untuk kerja yang dikirim di thread latar atas nama action, mis. batch
+    upsert Supabase: waktu request dibagi menurut jumlah baris tiap action.
+    """
+    counts = Counter(actions)
+    total = sum(counts.values())
+    owners = tuple((action, count / total) for action, count in counts.items()) if total else None
+    token = _http_owners.set(owners)
+    try:
+        yield
+    finally:
+        _http_owners.reset(token)
+
+
+def _wrap_run(run: Callable) -> Callable:
+    """Bungkus `run` dengan pencatatan latensi/error, profiling sampel (profiling.py)
+    dan rekaman trace (trace_capture.py).
+
+    Nama action di-cache per instance.
+    """
+
+    def action_name(action: Any) -> Text:
+        name = action.__dict__.get("_metrics_name")
+        if name is None:
+            name = action.name()
+            action.__dict__["_metrics_name"] = name
+        return name
+
+    if inspect.iscoroutinefunction(run):
+        @functools.wraps(run)
+        async def async_wrapper(self, dispatcher, tracker, domain):
+            if not _server_attempted:
+                start_metrics_server()
+            name = action_name(self)
+            recorder = get_trace_recorder()
+            state = recorder.snapshot(tracker) if recorder is not None else None
+            token = _current_action.set(name)
+            session = start_profile(name)
+            wall = time.time()
+            started = time.perf_counter()
+            try:
+                result = await run(self, dispatcher, tracker, domain)
+            except BaseException as e:
+                elapsed = time.perf_counter() - started
+                registry.observe_run(name, elapsed, e)
+                if state is not None:
+                    recorder.record(name, state, domain, dispatcher, None, wall, elapsed, e)
+                raise
+            finally:
+                _current_action.reset(token)
+                if session is not None:
+                    session.stop()
+            elapsed = time.perf_counter() - started
+            registry.observe_run(name, elapsed)
+            if state is not None:
+                recorder.record(name, state, domain, dispatcher, result, wall, elapsed)
+            return result
+
+        async_wrapper.__metrics_wrapped__ = True
+        return async_wrapper
+
+    @functools.wraps(run)
+    def wrapper(self, dispatcher, tracker, domain):
+        if not _server_attempted:
+            start_metrics_server()
+        name = action_name(self)
+        recorder = get_trace_recorder()
+        state = recorder.snapshot(tracker) if recorder is not None else None
+        token = _current_action.set(name)
+        session = start_profile(name)
+        wall = time.time()
+        started = time.perf_counter()
+        try:
+            result = run(self, dispatcher, tracker, domain)
+        except BaseException as e:
+            elapsed = time.perf_counter() - started
+            registry.observe_run(name, elapsed, e)
+            if state is not None:
+                recorder.record(name, state, domain, dispatcher, None, wall, elapsed, e)
+            raise
+        finally:
+            _current_action.reset(token)
+            if session is not None:
+                session.stop()
+        elapsed = time.perf_counter() - started
+        registry.observe_run(name, elapsed)
+        if state is not None:
+            recorder.record(name, state, domain, dispatcher, result, wall, elapsed)
+        return result
+
+    wrapper.__metrics_wrapped__ = True
+    return wrapper
+
+
+def instrument_actions(module_name: Text) -> None:
+    """Bungkus `run` semua action yang didefinisikan di modul `module_name`.
+
+    Dipanggil di akhir modul action. Action form (FormValidationAction)
+    ikut terbungkus lewat `run` warisannya. Server metrik baru dijalankan
+    saat action pertama kali berjalan, di proses worker yang memang
+    melayani webhook (proses utama Sanic juga mengimpor modul action).
+    """
+    from rasa_sdk import Action
+
+    module = sys.modules[module_name]
+    for obj in vars(module).values():
+        if (
+            inspect.isclass(obj)
+            and issubclass(obj, Action)
+            and obj.__module__ == module_name
+            and not inspect.isabstract(obj)
+            and not getattr(obj.run, "__metrics_wrapped__", False)
+        ):
+            obj.run = _wrap_run(obj.run)
+
+
+_server: Optional[Any] = None
+_server_attempted = False
+_server_lock = threading.Lock()
+
+
+def start_metrics_server(port: Optional[int] = None, host: Optional[Text] = None) -> Optional[Any]:
+    """Jalankan endpoint /metrics di thread latar (sekali per proses).
+
+    Port dari ACTION_METRICS_PORT (default 9108; 0 = mati), host dari
+    ACTION_METRICS_HOST (default 127.0.0.1, hanya lokal).
+    """
+    global _server, _server_attempted
+    if _server is not None:
+        return _server
+    _server_attempted = True
+    if port is None:
+        port = int(os.environ.get("ACTION_METRICS_PORT", DEFAULT_PORT) or 0)
+    if not port:
+        return None
+    host = host or os.environ.get("ACTION_METRICS_HOST", "127.0.0.1")
+
+    with _server_lock:
+        if _server is not None:
+            return _server
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                if self.path.split("?")[0] not in ("/metrics", "/"):
+                    self.send_error(404)
+                    return
+                body = registry.render_prometheus().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: Text, *args: Any) -> None:
+                pass  # jangan penuhi log action server dengan scrape Prometheus
+
+        try:
+            server = ThreadingHTTPServer((host, port), MetricsHandler)
+        except OSError as e:
+            print(f"Metrics server not started on {host}:{port}: {e}")
+            return None
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, name="action-metrics", daemon=True).start()
+        _server = server
+        return _server
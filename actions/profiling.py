@@ -0,0 +1,324 @@
+from typing import Any, Callable, Dict, Optional, Text, Tuple
+from collections import Counter
+import atexit
+import cProfile
+import functools
+import inspect
+import os
+import random
+import re
+import sys
+import threading
+import time
+
+# Profiling opsional untuk action dan komponen NLU, hanya stdlib.
+#
+#   PROFILING_ENABLED=1         aktifkan
+#   PROFILING_SAMPLE_RATE=0.01  fraksi panggilan yang diprofil (default 1%)
+#   PROFILING_FORMAT=auto       "pstats" (cProfile, untuk snakeviz / pstats),
+#                               "collapsed" (sampler stack, untuk flamegraph.pl /
+#                               speedscope) atau "auto": pstats untuk action,
+#                               collapsed untuk komponen NLU
+#   PROFILING_INTERVAL_MS=1     interval sampling stack untuk format collapsed
+#   PROFILING_DIR=logs/profiles direktori output
+#
+# Action hanya berjalan 2-100 µs (scripts/bench_actions.py), jauh di bawah
+# interval sampling, jadi untuk action hanya pstats yang menghasilkan data:
+# cProfile mencatat setiap panggilan. Sampler cocok untuk komponen NLU yang
+# berjalan dalam hitungan milidetik.
+#
+# Keduanya mengumpulkan lintas panggilan dan ditulis ke disk paling sering
+# tiap PROFILE_FLUSH_INTERVAL detik, plus saat proses keluar:
+#   pstats     satu profil kumulatif per nama per proses (`<nama>-<pid>.pstats`,
+#              ditimpa setiap flush);
+#   collapsed  ditambahkan ke satu file per nama (`<nama>.collapsed`, baris
+#              "frame;frame;frame jumlah"), sehingga bisa langsung digabung
+#              jadi flame graph dari trafik produksi.
+
+DEFAULT_SAMPLE_RATE = 0.01
+DEFAULT_INTERVAL_MS = 1.0
+DEFAULT_PROFILE_DIR = os.path.join("logs", "profiles")
+PROFILE_FLUSH_INTERVAL = 10.0  # detik
+FORMATS = ("auto", "collapsed", "pstats")
+
+_SAFE_NAME = re.compile(r"[^A-Za-z0-9_.-]+")
+
+
+def _env_enabled() -> bool:
+    return os.environ.get("PROFILING_ENABLED", "").strip().lower() in ("1", "true", "yes", "on")
+
+
+class _Config:
+    def __init__(self) -> None:
+        self.enabled = _env_enabled()
+        try:
+            self.sample_rate = min(max(float(os.environ.get("PROFILING_SAMPLE_RATE", DEFAULT_SAMPLE_RATE)), 0.0), 1.0)
+        except ValueError:
+            self.sample_rate = DEFAULT_SAMPLE_RATE
+        fmt = os.environ.get("PROFILING_FORMAT", "auto").strip().lower()
+        self.format = fmt if fmt in FORMATS else "auto"
+        try:
+            self.interval = max(float(os.environ.get("PROFILING_INTERVAL_MS", DEFAULT_INTERVAL_MS)), 0.1) / 1000.0
+        except ValueError:
+            self.interval = DEFAULT_INTERVAL_MS / 1000.0
+        self.directory = os.environ.get("PROFILING_DIR", DEFAULT_PROFILE_DIR)
+        if self.enabled and self.sample_rate <= 0.0:
+            self.enabled = False
+
+
+_config = _Config()
+
+# cProfile (sys.monitoring di Python 3.12+) hanya boleh aktif satu per
+# proses, dan sampler mencatat satu panggilan per waktu; panggilan yang
+# terpilih saat profil lain sedang berjalan dilewati saja.
+_busy = threading.Lock()
+_write_lock = threading.Lock()
+
+
+def configure(**overrides: Any) -> None:
+    """Ubah konfigurasi saat runtime (mis. dari skrip); tanpa argumen = baca ulang env"""
+    global _config
+    config = _Config()
+    for key, value in overrides.items():
+        if not hasattr(config, key):
+            raise AttributeError(f"Unknown profiling option: {key}")
+        setattr(config, key, value)
+    flush()
+    _config = config
+
+
+def is_enabled() -> bool:
+    return _config.enabled
+
+
+def _profile_path(directory: Text, name: Text, suffix: Text) -> Text:
+    os.makedirs(directory, exist_ok=True)
+    return os.path.join(directory, _SAFE_NAME.sub("_", name) + suffix)
+
+
+def _frame_label(frame: Any) -> Text:
+    code = frame.f_code
+    name = getattr(code, "co_qualname", code.co_name)
+    return f"{name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class _CumulativeProfiles:
+    """Satu cProfile.Profile per nama, di-enable/disable di setiap panggilan terpilih"""
+
+    def __init__(self) -> None:
+        self._profiles: Dict[Text, cProfile.Profile] = {}
+        self._dirty: Dict[Text, Text] = {}  # nama -> direktori, belum ditulis
+        self._last_flush = time.monotonic()
+
+    def start(self, name: Text) -> cProfile.Profile:
+        profile = self._profiles.get(name)
+        if profile is None:
+            profile = self._profiles[name] = cProfile.Profile()
+        profile.enable()
+        return profile
+
+    def stop(self, name: Text, profile: cProfile.Profile, directory: Text) -> None:
+        """Dipanggil dengan `_busy` masih dipegang"""
+        profile.disable()
+        self._dirty[name] = directory
+        if time.monotonic() - self._last_flush >= PROFILE_FLUSH_INTERVAL:
+            self.flush()
+
+    def flush(self) -> None:
+        self._last_flush = time.monotonic()
+        dirty, self._dirty = self._dirty, {}
+        for name, directory in dirty.items():
+            self._profiles[name].dump_stats(_profile_path(directory, name, f"-{os.getpid()}.pstats"))
+
+
+class _StackSampler:
+    """Satu thread per proses yang mengambil stack panggilan terdaftar secara berkala (wall-clock).
+
+    Thread dibuat saat panggilan pertama diprofil dan hidup selama proses;
+    sampel dari banyak panggilan dijumlahkan per nama. Saat tidak ada
+    panggilan terdaftar, thread menunggu tanpa memakai CPU.
+
+    Saat thread dimulai, switch interval GIL proses diturunkan sekali ke
+    `interval` (tidak dikembalikan) agar sampler tetap kebagian giliran saat
+    thread target sibuk CPU.
+
+    Hanya frame di atas `boundary` (frame wrapper yang memulai profil) yang
+    dicatat. Bila `boundary` tidak ada di stack, coroutine yang diprofil
+    sedang menunggu `await` dan sampel dicatat sebagai SUSPENDED.
+    """
+
+    SUSPENDED = "(suspended)"
+
+    def __init__(self, interval: float) -> None:
+        self.interval = interval
+        self._active: Optional[Tuple[Text, int, Any, Text]] = None  # nama, thread, boundary, direktori
+        self._samples: Dict[Tuple[Text, Text], Counter] = {}  # (nama, direktori) -> stack -> jumlah
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._last_flush = time.monotonic()
+        sys.setswitchinterval(min(interval, sys.getswitchinterval()))
+        threading.Thread(target=self._loop, name="profiling-sampler", daemon=True).start()
+
+    def begin(self, name: Text, thread_id: int, boundary: Any, directory: Text) -> None:
+        with self._lock:
+            self._active = (name, thread_id, boundary, directory)
+        self._wake.set()
+
+    def end(self) -> None:
+        with self._lock:
+            self._active = None
+
+    def _sample(self, thread_id: int, boundary: Any) -> Optional[Text]:
+        frame = sys._current_frames().get(thread_id)
+        stack = []
+        while frame is not None and frame is not boundary:
+            if frame.f_code.co_filename == __file__:
+                return None  # sedang di dalam start/stop profil ini sendiri
+            stack.append(_frame_label(frame))
+            frame = frame.f_back
+        if frame is None:
+            return self.SUSPENDED
+        return ";".join(reversed(stack)) or None
+
+    def _loop(self) -> None:
+        while True:
+            with self._lock:
+                active = self._active
+            if active is not None:
+                name, thread_id, boundary, directory = active
+                stack = self._sample(thread_id, boundary)
+                if stack is not None:
+                    with self._lock:
+                        if self._active is active:
+                            self._samples.setdefault((name, directory), Counter())[stack] += 1
+                time.sleep(self.interval)
+            else:
+                self._wake.clear()
+                if self._active is None:
+                    self._wake.wait(PROFILE_FLUSH_INTERVAL)
+            if time.monotonic() - self._last_flush >= PROFILE_FLUSH_INTERVAL:
+                self.flush()
+
+    def flush(self) -> None:
+        self._last_flush = time.monotonic()
+        with self._lock:
+            samples, self._samples = self._samples, {}
+        for (name, directory), counts in samples.items():
+            lines = "".join(f"{name};{stack} {count}\n" for stack, count in counts.items())
+            with _write_lock, open(_profile_path(directory, name, ".collapsed"), "a", encoding="utf-8") as f:
+                f.write(lines)
+
+
+_profiles = _CumulativeProfiles()
+_sampler: Optional[_StackSampler] = None
+
+
+def _get_sampler(interval: float) -> _StackSampler:
+    """Sampler bersama; dibuat di bawah `_busy`, jadi tanpa lock tambahan"""
+    global _sampler
+    if _sampler is None:
+        _sampler = _StackSampler(interval)
+    return _sampler
+
+
+def flush() -> None:
+    """Tulis profil yang terkumpul ke disk (juga dipanggil saat proses keluar)"""
+    try:
+        with _busy:
+            _profiles.flush()
+        if _sampler is not None:
+            _sampler.flush()
+    except Exception as e:
+        print(f"Error writing profiles: {e}")
+
+
+atexit.register(flush)
+
+
+class ProfileSession:
+    """Satu panggilan yang sedang diprofil; `stop()` mengakhirinya"""
+
+    def __init__(self, name: Text, config: _Config, fmt: Text, boundary: Any) -> None:
+        self.name = name
+        self.config = config
+        self.format = fmt
+        self.boundary = boundary
+        self._profiler: Optional[cProfile.Profile] = None
+        self._sampler: Optional[_StackSampler] = None
+
+    def start(self) -> "ProfileSession":
+        if self.format == "pstats":
+            # Untuk action async, waktu task lain di event loop selama
+            # `await` ikut tercatat; format collapsed memisahkannya
+            self._profiler = _profiles.start(self.name)
+        else:
+            self._sampler = _get_sampler(self.config.interval)
+            self._sampler.begin(self.name, threading.get_ident(), self.boundary, self.config.directory)
+        return self
+
+    def stop(self) -> None:
+        try:
+            if self._profiler is not None:
+                _profiles.stop(self.name, self._profiler, self.config.directory)
+            elif self._sampler is not None:
+                self._sampler.end()
+        except Exception as e:
+            print(f"Error writing profile for {self.name}: {e}")
+        finally:
+            _busy.release()
+
+
+def start_profile(name: Text, boundary: Any = None, default_format: Text = "pstats") -> Optional[ProfileSession]:
+    """Mulai memprofil panggilan ini bila profiling aktif dan panggilan terpilih sampel.
+
+    Mengembalikan None (biaya hampir nol) bila tidak; pemanggil wajib
+    memanggil `stop()` pada sesi yang dikembalikan, sebaiknya di `finally`.
+    `boundary` adalah frame batas stack; default frame pemanggil.
+    `default_format` dipakai bila PROFILING_FORMAT=auto: pstats untuk
+    action (metrics.py), collapsed untuk komponen NLU (`profile_calls`).
+    """
+    config = _config
+    if not config.enabled or random.random() >= config.sample_rate:
+        return None
+    if not _busy.acquire(blocking=False):
+        return None
+    try:
+        fmt = default_format if config.format == "auto" else config.format
+        return ProfileSession(name, config, fmt, boundary or sys._getframe(1)).start()
+    except Exception as e:
+        _busy.release()
+        print(f"Error starting profile for {name}: {e}")
+        return None
+
+
+def profile_calls(name: Text) -> Callable[[Callable], Callable]:
+    """Decorator: profil sebagian panggilan fungsi (sync atau async) dengan nama `name`.
+
+    Dipakai komponen NLU, jadi default-nya sampler stack (format collapsed).
+    """
+
+    def decorate(func: Callable) -> Callable:
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                session = start_profile(name, default_format="collapsed")
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    if session is not None:
+                        session.stop()
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            session = start_profile(name, default_format="collapsed")
+            try:
+                return func(*args, **kwargs)
+            finally:
+                if session is not None:
+                    session.stop()
+
+        return wrapper
+
+    return decorate
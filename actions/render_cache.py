@@ -0,0 +1,110 @@
+from typing import Any, Dict, List, Optional, Text, Tuple
+import threading
+
+from .content_catalog import get_content_catalog
+
+Rendered = Tuple[Text, List[Dict[Text, Any]]]
+
+PAKET_LABELS = ("pantai", "gunung", "lokasi")
+
+INFO_PAKET_BUTTONS: List[Dict[Text, Any]] = [
+    {"title": "Analisis kisah kami", "payload": "/isi_kuesioner"},
+    {"title": "Lihat detail konsep", "payload": "/lihat_detail_konsep"},
+    {"title": "Booking sekarang", "payload": "/booking"},
+]
+
+
+def _rekomendasi_buttons(tema: Text) -> List[Dict[Text, Any]]:
+    return [
+        {
+            "title": "Lihat detail konsep",
+            "payload": f"/lihat_detail_konsep{{\"tema\": \"{tema}\"}}",
+        },
+        {
+            "title": "Jelaskan legenda",
+            "payload": "/jelaskan_legenda",
+        },
+        {
+            "title": "Beri rating",
+            "payload": "/mulai_feedback",
+        },
+    ]
+
+
+def _info_paket_text(label: Text) -> Text:
+    return (
+        "💼 INFO PAKET & HARGA\n\n"
+        + "• BASIC — Rp 4.500.000\n  1 "
+        + label
+        + ", 4 jam, 50+ foto\n\n  Cocok untuk pasangan dengan waktu terbatas.\n\n"
+        + "• PREMIUM — Rp 8.500.000\n  2 "
+        + label
+        + ", 6 jam, 100+ foto, MUA, video 2 menit\n\n  Paket paling populer, balance hasil & harga.\n\n"
+        + "• DIAMOND — Rp 15.000.000\n  3 "
+        + label
+        + ", 8–10 jam, 150+ foto, full team, video 5 menit\n\n  Maksimalkan storytelling konsep legenda.\n\n"
+        + "Mau saya bantu rekomendasikan paket berdasarkan tema dan budget?"
+    )
+
+
+class ResponseRenderCache:
+    """Teks + buttons siap pakai untuk respons yang hanya bergantung pada slot.
+
+    Rekomendasi tema di-key dengan (rekomendasi_tema, budget), info paket
+    dengan label lokasi. Hanya kombinasi yang diminta yang di-render; hasil
+    disimpan dan dibagikan ke semua request, jadi teks dan list buttons yang
+    dikembalikan tidak boleh diubah oleh pemanggil. Key yang tidak dikenal
+    tetap melempar KeyError seperti sebelumnya dan tidak disimpan.
+    """
+
+    def __init__(self) -> None:
+        self._rekomendasi: Dict[Tuple[Text, Text], Rendered] = {}
+        self._info_paket: Dict[Text, Rendered] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def rekomendasi_tema(self, tema: Text, budget: Text) -> Rendered:
+        key = (tema, budget)
+        rendered = self._rekomendasi.get(key)
+        if rendered is not None:
+            self.hits += 1
+            return rendered
+        self.misses += 1
+        rendered = (get_content_catalog().render_rekomendasi(tema, budget), _rekomendasi_buttons(tema))
+        with self._lock:
+            return self._rekomendasi.setdefault(key, rendered)
+
+    def info_paket(self, label: Text) -> Rendered:
+        rendered = self._info_paket.get(label)
+        if rendered is not None:
+            self.hits += 1
+            return rendered
+        self.misses += 1
+        rendered = (_info_paket_text(label), INFO_PAKET_BUTTONS)
+        with self._lock:
+            return self._info_paket.setdefault(label, rendered)
+
+    def warm(self) -> None:
+        """Render semua kombinasi yang valid sekali, saat action server start"""
+        catalog = get_content_catalog()
+        for tema in catalog.rekomendasi_templates:
+            for budget in catalog.paket:
+                self.rekomendasi_tema(tema, budget)
+        for label in PAKET_LABELS:
+            self.info_paket(label)
+        self.hits = self.misses = 0
+
+
+_cache: Optional[ResponseRenderCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_render_cache() -> ResponseRenderCache:
+    """Cache render bersama untuk seluruh proses"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ResponseRenderCache()
+    return _cache
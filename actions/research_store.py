@@ -0,0 +1,80 @@
+from typing import Any, Dict, List, Optional, Text
+from abc import ABC, abstractmethod
+import csv
+import os
+import threading
+
+try:
+    import fcntl
+except ImportError:  # Windows: cukup pakai lock antar-thread
+    fcntl = None
+
+RESEARCH_CSV_PATH = "data_riset_prewedding.csv"
+
+# Urutan kolom harus sama dengan layout lama (pd.DataFrame dari dict data)
+# agar scripts/import_csv_to_supabase.py tetap bisa membaca file-nya.
+RESEARCH_FIELDNAMES = [
+    "timestamp",
+    "nama_pasangan",
+    "kisah_cinta",
+    "latar_belakang",
+    "tahu_legenda_sebelumnya",
+    "rekomendasi_tema",
+    "kepuasan",
+    "budget",
+    "conversation_id",
+]
+
+
+class ResearchRecordStore(ABC):
+    """Interface penyimpanan data riset (append-only)"""
+
+    @abstractmethod
+    def append(self, record: Dict[Text, Any]) -> None:
+        ...
+
+
+class CsvResearchStore(ResearchRecordStore):
+    """Append satu baris ke CSV tanpa membaca ulang seluruh file.
+
+    Biaya per simpan konstan (tidak tergantung jumlah baris). Penulisan
+    dilindungi lock antar-thread dan `flock` antar-proses, sehingga dua
+    percakapan yang selesai bersamaan tidak saling menimpa baris.
+    """
+
+    def __init__(self, path: Text = RESEARCH_CSV_PATH, fieldnames: Optional[List[Text]] = None) -> None:
+        self.path = path
+        self.fieldnames = list(fieldnames or RESEARCH_FIELDNAMES)
+        self._lock = threading.Lock()
+
+    def append(self, record: Dict[Text, Any]) -> None:
+        with self._lock:
+            with open(self.path, "a", newline="", encoding="utf-8") as f:
+                if fcntl is not None:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+                try:
+                    writer = csv.DictWriter(
+                        f, fieldnames=self.fieldnames, extrasaction="ignore", lineterminator="\n"
+                    )
+                    # Mode "a" selalu diposisikan di akhir file; 0 berarti file baru/kosong
+                    if f.seek(0, os.SEEK_END) == 0:
+                        writer.writeheader()
+                    writer.writerow(record)
+                    f.flush()
+                finally:
+                    if fcntl is not None:
+                        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+_store: Optional[ResearchRecordStore] = None
+_store_lock = threading.Lock()
+
+
+def get_research_store() -> ResearchRecordStore:
+    """Store bersama untuk seluruh action (path bisa diatur via RESEARCH_CSV_PATH)"""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = CsvResearchStore(os.environ.get("RESEARCH_CSV_PATH", RESEARCH_CSV_PATH))
+    return _store
@@ -0,0 +1,166 @@
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Text, Tuple
+import os
+import threading
+import time
+
+from .metrics import record_outbound_http
+
+if TYPE_CHECKING:
+    import requests
+
+# (connect, read) timeout per jenis endpoint, dalam detik
+DEFAULT_TIMEOUTS: Dict[Text, Tuple[float, float]] = {
+    "upsert": (3.05, 10),
+    "select": (3.05, 15),
+    "bulk_upsert": (3.05, 60),
+}
+
+
+class CircuitOpenError(Exception):
+    """Dilempar saat circuit breaker terbuka; request tidak dikirim sama sekali"""
+
+
+class CircuitBreaker:
+    """Circuit breaker sederhana: closed → open → half-open.
+
+    Setelah `failure_threshold` kegagalan berturut-turut, semua request
+    langsung gagal selama `reset_timeout` detik. Setelah itu satu request
+    percobaan diizinkan; sukses menutup kembali circuit, gagal membukanya lagi.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def before_request(self) -> None:
+        with self._lock:
+            if self.state == self.CLOSED:
+                return
+            if self.state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+            if self.state == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return
+            raise CircuitOpenError("Supabase circuit breaker is open")
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = self.CLOSED
+            self._failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self.state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+
+
+class SupabaseClient:
+    """Klien REST Supabase bersama dengan connection pool keep-alive.
+
+    Satu `requests.Session` dipakai ulang sehingga handshake TLS tidak
+    diulang di setiap panggilan. Timeout diatur per jenis endpoint, dan
+    circuit breaker membuat panggilan gagal cepat saat Supabase down.
+    """
+
+    def __init__(
+        self,
+        url: Text,
+        key: Text,
+        pool_maxsize: int = 10,
+        timeouts: Optional[Dict[Text, Tuple[float, float]]] = None,
+        breaker: Optional[CircuitBreaker] = None,
+    ) -> None:
+        self.base_url = f"{url.rstrip('/')}/rest/v1"
+        self.timeouts = dict(DEFAULT_TIMEOUTS, **(timeouts or {}))
+        self.breaker = breaker or CircuitBreaker()
+
+        # `requests` (+urllib3) diimpor saat klien pertama dibuat, bukan saat
+        # action server start, agar cold start tetap ringan
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        self._request_exception = requests.RequestException
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize, max_retries=0)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({
+            "apikey": key,
+            "Authorization": f"Bearer {key}",
+        })
+
+    @classmethod
+    def from_env(cls, key_vars: Iterable[Text] = ("SUPABASE_SERVICE_KEY", "SUPABASE_KEY")) -> Optional["SupabaseClient"]:
+        url = os.environ.get("SUPABASE_URL")
+        key = next((os.environ[v] for v in key_vars if os.environ.get(v)), None)
+        if not url or not key:
+            return None
+        return cls(url, key, pool_maxsize=int(os.environ.get("SUPABASE_POOL_SIZE", 10)))
+
+    def request(self, method: Text, endpoint: Text, path: Text, **kwargs: Any) -> "requests.Response":
+        """Kirim request lewat circuit breaker; `endpoint` memilih timeout"""
+        self.breaker.before_request()
+        kwargs.setdefault("timeout", self.timeouts.get(endpoint, self.timeouts["select"]))
+        started = time.perf_counter()
+        try:
+            r = self.session.request(method, f"{self.base_url}/{path}", **kwargs)
+        except self._request_exception:
+            self.breaker.record_failure()
+            raise
+        finally:
+            # Waktu HTTP keluar dicatat ke action yang sedang berjalan (atau "background")
+            record_outbound_http(time.perf_counter() - started)
+        # 4xx adalah kesalahan request, bukan tanda Supabase down
+        if r.status_code >= 500 or r.status_code == 429:
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+        return r
+
+    def upsert(
+        self,
+        table: Text,
+        rows: List[Dict[Text, Any]],
+        on_conflict: Iterable[Text],
+        endpoint: Text = "upsert",
+    ) -> "requests.Response":
+        return self.request(
+            "POST",
+            endpoint,
+            f"{table}?on_conflict={','.join(on_conflict)}",
+            json=rows,
+            headers={"Content-Type": "application/json", "Prefer": "resolution=merge-duplicates"},
+        )
+
+    def select(self, table: Text, params: Dict[Text, Any]) -> "requests.Response":
+        return self.request("GET", "select", table, params=params, headers={"Accept": "application/json"})
+
+    def close(self) -> None:
+        self.session.close()
+
+
+_client: Optional[SupabaseClient] = None
+_client_lock = threading.Lock()
+
+
+def get_supabase_client() -> Optional[SupabaseClient]:
+    """Klien bersama untuk action server, atau None bila env belum diset"""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = SupabaseClient.from_env()
+    return _client
@@ -0,0 +1,175 @@
+from typing import Any, Callable, Dict, List, Optional, Text, Tuple
+import json
+import random
+import sqlite3
+import threading
+import time
+
+DEFAULT_OUTBOX_PATH = "supabase_outbox.db"
+
+
+class SupabaseOutbox:
+    """Outbox SQLite (WAL, fsync penuh) untuk payload Supabase yang belum terkirim.
+
+    `SupabaseBatchWriter` mencatat setiap baris di sini sebelum dikirim
+    (write-ahead) dan menandainya terkirim setelah upsert sukses, sehingga
+    baris yang masih di antrian memori saat proses mati tidak hilang.
+    `OutboxReplayWorker` mengirim ulang hanya baris yang belum terkirim
+    dengan exponential backoff, lalu menandainya selesai (`sent_at`),
+    sehingga pemulihan tidak perlu meng-upload ulang seluruh CSV.
+    """
+
+    def __init__(self, path: Text = DEFAULT_OUTBOX_PATH) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # FULL: fsync WAL di setiap commit, baris tetap ada walau proses/host mati
+        self._conn.execute("PRAGMA synchronous=FULL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS outbox (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                payload TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                next_attempt_at REAL NOT NULL,
+                created_at REAL NOT NULL,
+                sent_at REAL,
+                last_error TEXT
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_outbox_pending ON outbox (sent_at, next_attempt_at)"
+        )
+
+    def add_many(
+        self, payloads: List[Dict[Text, Any]], error: Optional[Text] = None, delay: float = 0.0
+    ) -> List[int]:
+        """Catat payload sebagai belum terkirim; dicoba ulang paling cepat `delay` detik lagi.
+
+        Mengembalikan id baris, urut sesuai `payloads`.
+        """
+        now = time.time()
+        ids = []
+        with self._lock:
+            with self._conn:
+                for payload in payloads:
+                    cur = self._conn.execute(
+                        "INSERT INTO outbox (payload, next_attempt_at, created_at, last_error) VALUES (?, ?, ?, ?)",
+                        (json.dumps(payload, ensure_ascii=False), now + delay, now, error),
+                    )
+                    ids.append(cur.lastrowid)
+        return ids
+
+    def due(self, limit: int, now: Optional[float] = None) -> List[Tuple[int, int, Dict[Text, Any]]]:
+        """Baris yang belum terkirim dan sudah waktunya dicoba ulang: (id, attempts, payload)"""
+        now = time.time() if now is None else now
+        with self._lock:
+            cur = self._conn.execute(
+                "SELECT id, attempts, payload FROM outbox "
+                "WHERE sent_at IS NULL AND next_attempt_at <= ? ORDER BY id LIMIT ?",
+                (now, limit),
+            )
+            return [(row_id, attempts, json.loads(payload)) for row_id, attempts, payload in cur.fetchall()]
+
+    def mark_sent(self, ids: List[int]) -> None:
+        now = time.time()
+        with self._lock:
+            with self._conn:
+                self._conn.executemany(
+                    "UPDATE outbox SET sent_at = ?, last_error = NULL WHERE id = ?",
+                    [(now, i) for i in ids],
+                )
+
+    def reschedule(self, ids_attempts: List[Tuple[int, int]], delays: List[float], error: Optional[Text]) -> None:
+        now = time.time()
+        with self._lock:
+            with self._conn:
+                self._conn.executemany(
+                    "UPDATE outbox SET attempts = ?, next_attempt_at = ?, last_error = ? WHERE id = ?",
+                    [(attempts + 1, now + delay, error, i) for (i, attempts), delay in zip(ids_attempts, delays)],
+                )
+
+    def purge_sent(self, older_than_seconds: float) -> None:
+        cutoff = time.time() - older_than_seconds
+        with self._lock:
+            with self._conn:
+                self._conn.execute("DELETE FROM outbox WHERE sent_at IS NOT NULL AND sent_at < ?", (cutoff,))
+
+    def pending_count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM outbox WHERE sent_at IS NULL").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class OutboxReplayWorker:
+    """Thread yang mengirim ulang isi outbox dengan exponential backoff + jitter"""
+
+    def __init__(
+        self,
+        outbox: SupabaseOutbox,
+        send: Callable[[List[Dict[Text, Any]]], Optional[Text]],
+        batch_size: int = 50,
+        poll_interval: float = 5.0,
+        base_delay: float = 2.0,
+        max_delay: float = 600.0,
+        retention_seconds: float = 7 * 24 * 3600,
+    ) -> None:
+        # `send` mengembalikan None bila sukses, atau pesan error bila gagal
+        self.outbox = outbox
+        self.send = send
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retention_seconds = retention_seconds
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def backoff(self, attempts: int) -> float:
+        delay = min(self.base_delay * (2 ** attempts), self.max_delay)
+        return delay * random.uniform(0.5, 1.0)
+
+    def replay_once(self) -> int:
+        """Kirim satu batch baris yang jatuh tempo; mengembalikan jumlah baris terkirim"""
+        rows = self.outbox.due(self.batch_size)
+        if not rows:
+            return 0
+        error = self.send([payload for _, _, payload in rows])
+        if error is None:
+            self.outbox.mark_sent([row_id for row_id, _, _ in rows])
+            return len(rows)
+        self.outbox.reschedule(
+            [(row_id, attempts) for row_id, attempts, _ in rows],
+            [self.backoff(attempts) for _, attempts, _ in rows],
+            error,
+        )
+        return 0
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="supabase-outbox-replay", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self) -> None:
+        last_purge = 0.0
+        while not self._stop.is_set():
+            try:
+                # Terus kirim selama masih ada batch penuh yang sukses
+                while self.replay_once() >= self.batch_size and not self._stop.is_set():
+                    pass
+                if time.time() - last_purge > 3600:
+                    self.outbox.purge_sent(self.retention_seconds)
+                    last_purge = time.time()
+            except Exception as e:
+                print(f"Supabase outbox replay error: {e}")
+            self._stop.wait(self.poll_interval)
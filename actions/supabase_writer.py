@@ -0,0 +1,216 @@
+from typing import Any, Dict, List, Optional, Text, Tuple
+import atexit
+import os
+import queue
+import threading
+import time
+
+from .metrics import current_action, outbound_http_for
+from .supabase_client import SupabaseClient, get_supabase_client
+from .supabase_outbox import DEFAULT_OUTBOX_PATH, OutboxReplayWorker, SupabaseOutbox
+
+DEFAULT_BATCH_SIZE = 20
+DEFAULT_FLUSH_INTERVAL_MS = 500
+CONFLICT_COLUMNS = ("conversation_id", "timestamp")
+# Baris yang baru dicatat ke outbox "dipegang" writer selama ini (detik) sebelum
+# replay worker boleh mengirimnya; lebih lama dari flush + timeout upsert
+OUTBOX_LEASE_SECONDS = 60.0
+
+# (id baris di outbox atau None, action pengirim, payload)
+QueueItem = Tuple[Optional[int], Text, Dict[Text, Any]]
+
+
+class SupabaseBatchWriter:
+    """Antrian tulis in-process untuk upsert data riset ke Supabase.
+
+    `submit` hanya memasukkan payload ke antrian dan langsung kembali.
+    Thread latar belakang mengirim semua payload sebagai satu upsert
+    multi-baris setiap `batch_size` baris atau `flush_interval_ms`,
+    mana yang lebih dulu tercapai. Sisa antrian dikirim saat `close`
+    (dipanggil otomatis lewat atexit).
+
+    Bila ada `outbox`, setiap payload dicatat ke sana sebelum masuk antrian
+    dan ditandai terkirim setelah upsert sukses. Baris yang gagal, atau yang
+    masih di antrian saat proses mati, dikirim ulang oleh
+    `OutboxReplayWorker` (yang langsung berjalan saat writer dibuat, jadi
+    sisa dari proses sebelumnya ikut terkirim). Upsert memakai kunci
+    konflik, sehingga baris yang terkirim dua kali tidak menggandakan data.
+    """
+
+    def __init__(
+        self,
+        client: SupabaseClient,
+        table: Text,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        flush_interval_ms: int = DEFAULT_FLUSH_INTERVAL_MS,
+        outbox: Optional[SupabaseOutbox] = None,
+    ) -> None:
+        self.client = client
+        self.table = table
+        self.batch_size = max(int(batch_size), 1)
+        self.flush_interval = max(int(flush_interval_ms), 1) / 1000.0
+        self.outbox = outbox
+        self.replay_worker: Optional[OutboxReplayWorker] = None
+        if outbox is not None:
+            self.replay_worker = OutboxReplayWorker(outbox, self._post)
+            self.replay_worker.start()
+
+        self._queue: "queue.Queue[Optional[QueueItem]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._closed = False
+
+    def submit(self, payload: Dict[Text, Any]) -> None:
+        # Action pengirim ikut dicatat: upsert terjadi di thread latar, tetapi
+        # waktu HTTP-nya diatribusikan ke action tersebut (metrics.py)
+        item = (self._journal(payload), current_action(), payload)
+        if self._closed:
+            # Setelah shutdown, kirim langsung agar data tidak hilang
+            self._send([item])
+            return
+        self._ensure_started()
+        self._queue.put(item)
+
+    def _journal(self, payload: Dict[Text, Any]) -> Optional[int]:
+        """Catat payload ke outbox sebelum dikirim; None bila tanpa outbox atau gagal"""
+        if self.outbox is None:
+            return None
+        try:
+            return self.outbox.add_many([payload], delay=OUTBOX_LEASE_SECONDS)[0]
+        except Exception as e:
+            print(f"Supabase outbox error: {e}")
+            return None
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Hentikan worker setelah semua payload di antrian terkirim"""
+        if self._closed:
+            return
+        self._closed = True
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join(timeout)
+        if self.replay_worker is not None:
+            self.replay_worker.stop(timeout)
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="supabase-batch-writer", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self) -> None:
+        batch: List[QueueItem] = []
+        deadline = None
+        stopping = False
+        while not stopping:
+            timeout = None if deadline is None else max(deadline - time.monotonic(), 0)
+            try:
+                item = self._queue.get(timeout=timeout)
+                if item is None:
+                    stopping = True
+                    batch.extend(self._drain())
+                else:
+                    batch.append(item)
+                    if deadline is None:
+                        deadline = time.monotonic() + self.flush_interval
+            except queue.Empty:
+                pass
+
+            if batch and (stopping or len(batch) >= self.batch_size or time.monotonic() >= deadline):
+                self._send(batch)
+                batch = []
+                deadline = None
+
+    def _drain(self) -> List[QueueItem]:
+        items = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return items
+            if item is not None:
+                items.append(item)
+
+    def _send(self, batch: List[QueueItem]) -> None:
+        with outbound_http_for(action for _, action, _ in batch):
+            error = self._post([payload for _, _, payload in batch])
+        journaled = [row_id for row_id, _, _ in batch if row_id is not None]
+        try:
+            if error is None:
+                if journaled:
+                    self.outbox.mark_sent(journaled)
+                return
+            print(f"Supabase insert failed: {error}")
+            if self.outbox is None:
+                return
+            if journaled:
+                self.outbox.reschedule(
+                    [(row_id, 0) for row_id in journaled],
+                    [self.replay_worker.backoff(0) for _ in journaled],
+                    error,
+                )
+            unjournaled = [payload for row_id, _, payload in batch if row_id is None]
+            if unjournaled:
+                self.outbox.add_many(unjournaled, error)
+        except Exception as e:
+            print(f"Supabase outbox error: {e}")
+
+    def _post(self, rows: List[Dict[Text, Any]]) -> Optional[Text]:
+        """Kirim satu upsert multi-baris; None bila sukses, pesan error bila gagal"""
+        # Postgres menolak upsert yang menyentuh baris sama dua kali dalam satu
+        # statement, jadi duplikat kunci konflik dalam batch diambil yang terakhir.
+        rows = list({tuple(p.get(c) for c in CONFLICT_COLUMNS): p for p in rows}.values())
+        try:
+            r = self.client.upsert(self.table, rows, on_conflict=CONFLICT_COLUMNS)
+            if r.status_code < 200 or r.status_code >= 300:
+                return f"{r.status_code} {r.text}"
+        except Exception as e:
+            return str(e)
+        return None
+
+
+_writer: Optional[SupabaseBatchWriter] = None
+_writer_lock = threading.Lock()
+
+
+def get_supabase_writer() -> Optional[SupabaseBatchWriter]:
+    """Writer bersama, atau None bila Supabase tidak dikonfigurasi/dimatikan"""
+    global _writer
+    if _writer is not None:
+        return _writer
+
+    table = os.environ.get("SUPABASE_TABLE", "data_riset_prewedding")
+    supabase_enabled = str(os.environ.get("SUPABASE_ENABLED", "true")).strip().lower() not in ("false", "0", "no", "off")
+    client = get_supabase_client() if supabase_enabled else None
+    if client is None:
+        return None
+
+    with _writer_lock:
+        if _writer is None:
+            # SUPABASE_OUTBOX_PATH kosong = outbox dimatikan
+            outbox_path = os.environ.get("SUPABASE_OUTBOX_PATH", DEFAULT_OUTBOX_PATH)
+            outbox = SupabaseOutbox(outbox_path) if outbox_path else None
+            _writer = SupabaseBatchWriter(
+                client,
+                table,
+                batch_size=int(os.environ.get("SUPABASE_BATCH_SIZE", DEFAULT_BATCH_SIZE)),
+                flush_interval_ms=int(os.environ.get("SUPABASE_FLUSH_MS", DEFAULT_FLUSH_INTERVAL_MS)),
+                outbox=outbox,
+            )
+            atexit.register(_writer.close)
+    return _writer
+
+
+def resume_outbox() -> None:
+    """Bangun writer saat modul action dimuat bila outbox sudah ada.
+
+    Replay worker ikut berjalan, sehingga baris yang tertunda dari proses
+    sebelumnya langsung dikirim ulang tanpa menunggu data riset baru.
+    """
+    outbox_path = os.environ.get("SUPABASE_OUTBOX_PATH", DEFAULT_OUTBOX_PATH)
+    if outbox_path and os.path.exists(outbox_path):
+        get_supabase_writer()
@@ -0,0 +1,314 @@
+from typing import Any, Dict, Iterator, List, Optional, Text
+import atexit
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+
+from .buffered_logger import BufferedLogger
+
+# Rekam setiap panggilan action (tracker, domain, respons, durasi) ke file
+# JSONL teranonimkan, untuk diputar ulang dengan scripts/replay_action_trace.py.
+#
+#   ACTION_TRACE=1               aktifkan
+#   ACTION_TRACE_PATH=...        file output (default logs/traces/actions-<waktu>-<pid>.jsonl)
+#   ACTION_TRACE_SAMPLE_RATE=1.0 fraksi percakapan yang direkam (per sender, utuh)
+#   ACTION_TRACE_SALT=...        salt hash sender_id; tanpa salt dipakai salt acak per proses
+#   ACTION_TRACE_REDACT_TEXT=1   samarkan juga teks bebas (pesan user, kisah_cinta, ...);
+#                                default aktif; trace untuk cek kebenaran respons saat
+#                                replay direkam dengan 0, di storage yang boleh dibuang
+#
+# Nama pasangan selalu disamarkan, termasuk pesan user yang memuatnya (slot
+# diisi from_text, jadi nilainya juga ada di teks pesan dan parse_data).
+
+TRACE_FORMAT_VERSION = 1
+DEFAULT_TRACE_DIR = os.path.join("logs", "traces")
+# Slot yang selalu disamarkan, dan slot teks bebas yang disamarkan bila REDACT_TEXT.
+# Pesan (user maupun bot) yang memuat nilai slot tersamar ikut disamarkan utuh
+MASKED_SLOTS = frozenset({"nama_pasangan"})
+TEXT_SLOTS = frozenset({"kisah_cinta", "latar_belakang"})
+# Masukan teks yang menentukan respons action tanpa ikut tertulis di respons:
+# "text" = teks latest_message, selain itu nama slot. Bila salah satunya
+# disamarkan, respons asli tidak bisa dibandingkan saat replay
+TEXT_DEPENDENT_ACTIONS = {
+    "action_analisis_kisah_cinta": ("kisah_cinta", "latar_belakang"),
+    "action_jelaskan_legenda": ("text",),
+    "action_info_lokasi_kontekstual": ("text",),
+}
+TRACE_FLUSH_INTERVAL = 1.0  # detik
+
+_WORD_CHAR = re.compile(r"\w")
+
+
+def _strings(value: Any) -> Iterator[Text]:
+    """Semua string di dalam struktur JSON"""
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from _strings(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from _strings(item)
+
+
+def mask_text(value: Any) -> Any:
+    """Ganti huruf/angka dengan 'x', spasi dan tanda baca tetap.
+
+    Panjang dan bentuk teks terjaga, sehingga validasi berbasis panjang
+    (mis. validate_nama_pasangan) memberi hasil yang sama saat diputar ulang.
+    """
+    return _WORD_CHAR.sub("x", value) if isinstance(value, str) else value
+
+
+class TraceAnonymizer:
+    def __init__(self, salt: bytes, redact_text: bool) -> None:
+        self.salt = salt
+        self.redact_text = redact_text
+        self.masked_slots = MASKED_SLOTS | TEXT_SLOTS if redact_text else MASKED_SLOTS
+
+    def sender(self, sender_id: Optional[Text]) -> Optional[Text]:
+        if sender_id is None:
+            return None
+        return "s_" + hashlib.sha256(self.salt + str(sender_id).encode("utf-8")).hexdigest()[:16]
+
+    def secrets(self, state: Dict[Text, Any], events: List[Dict[Text, Any]]) -> List[Text]:
+        """Nilai asli slot tersamar di state tracker dan event respons"""
+        values = [(state.get("slots") or {}).get(name) for name in self.masked_slots]
+        for event in list(state.get("events") or []) + list(events):
+            if event.get("event") == "slot" and event.get("name") in self.masked_slots:
+                values.append(event.get("value"))
+        return sorted({v.strip() for v in values if isinstance(v, str) and v.strip()}, key=len, reverse=True)
+
+    def _text(self, message: Dict[Text, Any], secrets: List[Text], redact: bool) -> None:
+        text = message.get("text")
+        if isinstance(text, str) and (redact or any(s in text for s in secrets)):
+            message["text"] = mask_text(text)
+
+    def _message(self, message: Dict[Text, Any], secrets: List[Text]) -> None:
+        self._text(message, secrets, self.redact_text)
+        for entity in message.get("entities") or []:
+            value = entity.get("value")
+            if (self.redact_text or entity.get("entity") in self.masked_slots
+                    or (isinstance(value, str) and value.strip()
+                        and any(s in value or value.strip() in s for s in secrets))):
+                entity["value"] = mask_text(value)
+
+    def events(self, events: List[Dict[Text, Any]], secrets: List[Text] = ()) -> None:
+        for event in events:
+            kind = event.get("event")
+            if kind == "slot" and event.get("name") in self.masked_slots:
+                event["value"] = mask_text(event.get("value"))
+            elif kind == "user":
+                self._message(event, secrets)
+                if isinstance(event.get("parse_data"), dict):
+                    self._message(event["parse_data"], secrets)
+            elif kind == "bot":
+                self._text(event, secrets, False)
+
+    def tracker(self, state: Dict[Text, Any], secrets: List[Text] = ()) -> None:
+        state["sender_id"] = self.sender(state.get("sender_id"))
+        if state.get("user_id") is not None:
+            state["user_id"] = self.sender(state["user_id"])
+        slots = state.get("slots") or {}
+        for name in self.masked_slots:
+            if name in slots:
+                slots[name] = mask_text(slots[name])
+        if isinstance(state.get("latest_message"), dict):
+            self._message(state["latest_message"], secrets)
+        self.events(state.get("events") or [], secrets)
+
+    def _redacted(self, action: Text, state: Dict[Text, Any], response: Dict[Text, Any],
+                  secrets: List[Text]) -> bool:
+        """Apakah teks yang disamarkan sampai ke respons (dipanggil sebelum anonimisasi)"""
+        latest = state.get("latest_message") if isinstance(state.get("latest_message"), dict) else {}
+        text = latest.get("text")
+        masked = isinstance(text, str) and (self.redact_text or any(s in text for s in secrets))
+        text = text.strip() if masked else ""
+        slots = state.get("slots") or {}
+        for name in TEXT_DEPENDENT_ACTIONS.get(action, ()):
+            if (text if name == "text" else name in self.masked_slots and slots.get(name)):
+                return True
+        # Nilai slot tersamar bisa tertulis di mana saja (mis. disapa di pesan bot);
+        # teks pesan dihitung hanya bila utuh menjadi nilai (slot from_text)
+        for value in _strings(response):
+            if (text and value.strip() == text) or any(s in value for s in secrets):
+                return True
+        return False
+
+    def call(self, record: Dict[Text, Any]) -> None:
+        """Anonimkan record "call" di tempat.
+
+        `redacted` diset bila teks yang disamarkan sampai ke respons: ditulis
+        di event/pesan respons, atau dibaca action di TEXT_DEPENDENT_ACTIONS.
+        Respons seperti itu tidak bisa dibandingkan saat replay.
+        """
+        state, response = record["tracker"], record["response"]
+        secrets = self.secrets(state, response["events"])
+        record["redacted"] = self._redacted(record["action"], state, response, secrets)
+        self.tracker(state, secrets)
+        self.events(response["events"], secrets)
+        # Pesan bot bukan teks user, tapi bisa menyapa dengan nama pasangan
+        for message in response["responses"]:
+            if isinstance(message, dict):
+                self._text(message, secrets, False)
+
+
+class JsonlTraceSink:
+    """Sink BufferedLogger: anonimkan baris lalu tulis sebagai JSONL.
+
+    Domain hanya ditulis sekali per versi (record "domain"); record "call"
+    merujuk ke hash-nya. Semua penyalinan dan serialisasi terjadi di thread
+    penulis, bukan di jalur action.
+    """
+
+    def __init__(self, path: Text, anonymizer: TraceAnonymizer, sample_rate: float) -> None:
+        self.path = path
+        self.anonymizer = anonymizer
+        self.sample_rate = sample_rate
+        self._domain_hashes: set = set()
+        self._last_domain: Any = None
+        self._last_domain_hash: Optional[Text] = None
+
+    def _domain_hash(self, domain: Any) -> Text:
+        if domain is not self._last_domain:
+            encoded = json.dumps(domain, sort_keys=True, default=str).encode("utf-8")
+            self._last_domain = domain
+            self._last_domain_hash = hashlib.sha256(encoded).hexdigest()[:16]
+        return self._last_domain_hash
+
+    def write(self, rows: List[Dict[Text, Any]]) -> None:
+        lines = []
+        new_file = not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+        if new_file:
+            lines.append(json.dumps({
+                "type": "meta",
+                "format": TRACE_FORMAT_VERSION,
+                "started": time.time(),
+                "pid": os.getpid(),
+                "redact_text": self.anonymizer.redact_text,
+                "sample_rate": self.sample_rate,
+                "masked_slots": sorted(self.anonymizer.masked_slots),
+            }))
+            self._domain_hashes.clear()
+        for row in rows:
+            domain_hash = self._domain_hash(row["domain"])
+            if domain_hash not in self._domain_hashes:
+                lines.append(json.dumps({"type": "domain", "hash": domain_hash, "domain": row["domain"]},
+                                        default=str))
+                self._domain_hashes.add(domain_hash)
+            # Salinan lewat JSON, supaya anonimisasi tidak mengubah objek milik Rasa SDK
+            record = json.loads(json.dumps({
+                "type": "call",
+                "t": row["t"],
+                "duration_ms": round(row["duration"] * 1000, 3),
+                "action": row["action"],
+                "domain_hash": domain_hash,
+                "tracker": row["tracker"],
+                "response": {"events": row["events"], "responses": row["messages"]},
+                "error": row["error"],
+            }, default=str))
+            self.anonymizer.call(record)
+            lines.append(json.dumps(record, ensure_ascii=False))
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+
+
+class TraceRecorder:
+    """Rekam panggilan action; `record` hanya menaruh referensi ke buffer"""
+
+    def __init__(self, path: Text, salt: bytes, redact_text: bool = True, sample_rate: float = 1.0) -> None:
+        self.path = path
+        self.sample_rate = min(max(sample_rate, 0.0), 1.0)
+        self._salt = salt
+        self._logger = BufferedLogger(
+            f"trace-{os.path.basename(path)}",
+            JsonlTraceSink(path, TraceAnonymizer(salt, redact_text), self.sample_rate),
+            flush_interval=TRACE_FLUSH_INTERVAL,
+        )
+
+    def wants(self, sender_id: Text) -> bool:
+        if self.sample_rate >= 1.0:
+            return True
+        digest = hashlib.sha256(self._salt + str(sender_id).encode("utf-8")).digest()
+        return int.from_bytes(digest[:4], "big") / 2**32 < self.sample_rate
+
+    def snapshot(self, tracker: Any) -> Optional[Dict[Text, Any]]:
+        """State tracker seperti yang diterima action, atau None bila percakapan tidak disampel.
+
+        Harus dipanggil sebelum `run`: form validation menambah slot dan
+        event ke tracker yang sama. Hanya dict/list teratas yang disalin.
+        """
+        if not self.wants(tracker.sender_id):
+            return None
+        state = tracker.current_state()
+        state["slots"] = dict(state["slots"])
+        state["events"] = list(state["events"])
+        state["followup_action"] = tracker.followup_action
+        return state
+
+    def record(
+        self,
+        action: Text,
+        state: Dict[Text, Any],
+        domain: Any,
+        dispatcher: Any,
+        events: Optional[List[Dict[Text, Any]]],
+        started_at: float,
+        duration: float,
+        error: Optional[BaseException] = None,
+    ) -> None:
+        self._logger.log({
+            "t": started_at,
+            "duration": duration,
+            "action": action,
+            "tracker": state,
+            "domain": domain,
+            "events": list(events or []),
+            "messages": list(dispatcher.messages),
+            "error": type(error).__name__ if error is not None else None,
+        })
+
+    def close(self) -> None:
+        self._logger.close()
+
+
+_recorder: Optional[TraceRecorder] = None
+_configured = False
+_recorder_lock = threading.Lock()
+
+
+def _create_recorder() -> Optional[TraceRecorder]:
+    if os.environ.get("ACTION_TRACE", "").strip().lower() not in ("1", "true", "yes", "on"):
+        return None
+    path = os.environ.get("ACTION_TRACE_PATH") or os.path.join(
+        DEFAULT_TRACE_DIR, f"actions-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}.jsonl"
+    )
+    salt_env = os.environ.get("ACTION_TRACE_SALT")
+    salt = salt_env.encode("utf-8") if salt_env else os.urandom(16)
+    try:
+        sample_rate = float(os.environ.get("ACTION_TRACE_SAMPLE_RATE", 1.0))
+    except ValueError:
+        sample_rate = 1.0
+    redact_text = os.environ.get("ACTION_TRACE_REDACT_TEXT", "1").strip().lower() not in ("0", "false", "no", "off")
+    print(f"Action trace capture enabled: {path}")
+    return TraceRecorder(path, salt, redact_text, sample_rate)
+
+
+def get_trace_recorder() -> Optional[TraceRecorder]:
+    """Recorder bersama untuk proses ini, atau None bila ACTION_TRACE tidak aktif"""
+    global _recorder, _configured
+    if _configured:
+        return _recorder
+    with _recorder_lock:
+        if not _configured:
+            _recorder = _create_recorder()
+            if _recorder is not None:
+                atexit.register(_recorder.close)
+            _configured = True
+    return _recorder
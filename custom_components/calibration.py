@@ -0,0 +1,76 @@
+from __future__ import annotations
+from itertools import chain
+from typing import Any, Dict, List, Optional, Sequence, Text, Tuple
+
+import numpy as np
+
+
+def calibrate_batch(
+    probs_rows: Sequence[Sequence[float]],
+    temperature: float,
+    max_confidence: float,
+    min_confidence: float,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Temperature-scale and cap many probability vectors at once.
+
+    The rows may have different lengths; they are stacked into one
+    zero-padded `(n, max_len)` float32 array so scaling, normalisation, the
+    cap and argmax each run as a single vectorized operation. Per row this
+    computes `min((p + min_c) ** (1/T) / sum(...), max_c)`, the same formula
+    as calibrating each message on its own.
+
+    Returns `(calibrated, top_idx, valid)`: the calibrated padded array
+    (padding is 0), the argmax per row, and a mask of rows whose normaliser
+    was positive. Rows that are not valid must be left untouched.
+    """
+    n = len(probs_rows)
+    lengths = np.fromiter((len(r) for r in probs_rows), dtype=np.int64, count=n)
+    width = int(lengths.max()) if n else 0
+    if width == 0:
+        return np.zeros((n, 0), dtype=np.float32), np.zeros(n, dtype=np.int64), np.zeros(n, dtype=bool)
+    mask = np.arange(width)[None, :] < lengths[:, None]
+
+    probs = np.zeros((n, width), dtype=np.float32)
+    probs[mask] = np.fromiter(chain.from_iterable(probs_rows), dtype=np.float32, count=int(lengths.sum()))
+    np.maximum(probs, 0.0, out=probs)
+
+    exps = np.power(probs + np.float32(min_confidence), np.float32(1.0 / max(temperature, 1e-3)))
+    exps[~mask] = 0.0
+    denom = exps.sum(axis=1)
+    valid = denom > 0.0
+
+    calibrated = exps / np.where(valid, denom, np.float32(1.0))[:, None]
+    np.minimum(calibrated, np.float32(max_confidence), out=calibrated)
+    # Padding sits after the real entries and argmax returns the first
+    # maximum, so a padded 0 can never win over a real entry
+    top_idx = np.argmax(calibrated, axis=1)
+    return calibrated, top_idx, valid
+
+
+def top_k(
+    calibrated: np.ndarray, lengths: Sequence[int], k: int
+) -> Tuple[List[List[int]], List[List[float]]]:
+    """Per row, indices and confidences of the `k` best calibrated intents.
+
+    The sort is stable, so ties (e.g. several intents clipped to the cap)
+    keep their original ranking order; padding (0) sorts after real entries.
+    `k <= 0` keeps every entry in its original order. The arrays are turned
+    into Python lists once for the whole batch, not per message.
+    """
+    if k <= 0:
+        values = calibrated.tolist()
+        return [list(range(n)) for n in lengths], [values[row][:n] for row, n in enumerate(lengths)]
+    order = np.argsort(-calibrated, axis=1, kind="stable")[:, :k]
+    indices = order.tolist()
+    values = np.take_along_axis(calibrated, order, axis=1).tolist()
+    return (
+        [indices[row][: min(k, n)] for row, n in enumerate(lengths)],
+        [values[row][: min(k, n)] for row, n in enumerate(lengths)],
+    )
+
+
+def ranking_probs(ranking: List[Dict[Text, Any]]) -> Tuple[List[Optional[Text]], List[float]]:
+    """Split an `intent_ranking` into names and non-negative confidences"""
+    names = [r.get("name") for r in ranking]
+    probs = [max(float(r.get("confidence", 0.0)), 0.0) for r in ranking]
+    return names, probs
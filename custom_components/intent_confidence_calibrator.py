@@ -2,8 +2,6 @@ from __future__ import annotations
 import logging
 from typing import Any, Dict, List, Text
 
-import numpy as np
-
 from rasa.engine.graph import GraphComponent, ExecutionContext
 from rasa.engine.recipes.default_recipe import DefaultV1Recipe
 from rasa.engine.storage.resource import Resource
@@ -11,6 +9,9 @@ from rasa.engine.storage.storage import ModelStorage
 from rasa.shared.nlu.training_data.message import Message
 from rasa.shared.nlu.training_data.training_data import TrainingData
 
+from .profiling import profile_calls
+from .calibration import calibrate_batch, ranking_probs, top_k
+
 logger = logging.getLogger(__name__)
 
 
@@ -24,6 +25,11 @@ class IntentConfidenceCalibrator(GraphComponent):
     intent classifiers using temperature scaling and an optional cap.
     It preserves ranking order but reduces overconfident peaks to make
     downstream fallback and policies behave more conservatively.
+    All messages of a batch are calibrated together in one vectorized pass.
+
+    Only the top `ranking_length` calibrated intents are written back to
+    `intent_ranking` (0 keeps the full ranking), which keeps the ranking
+    stored in every tracker `user` event small.
     """
 
     @staticmethod
@@ -35,6 +41,8 @@ class IntentConfidenceCalibrator(GraphComponent):
             "max_confidence": 0.92,
             # ignore tiny probabilities to avoid numerical noise
             "min_confidence": 1e-6,
+            # number of intents kept in `intent_ranking` (0 = keep all)
+            "ranking_length": 10,
         }
 
     def __init__(
@@ -56,11 +64,18 @@ class IntentConfidenceCalibrator(GraphComponent):
     ) -> "IntentConfidenceCalibrator":
         return cls(config, model_storage, resource, execution_context)
 
+    @profile_calls("IntentConfidenceCalibrator.process")
     def process(self, messages: List[Message], **kwargs: Any) -> List[Message]:
         T = float(self.component_config.get("temperature", 1.6))
         max_c = float(self.component_config.get("max_confidence", 0.92))
         min_c = float(self.component_config.get("min_confidence", 1e-6))
+        ranking_length = int(self.component_config.get("ranking_length", 10))
 
+        # Collect every calibratable message first so the whole batch is
+        # scaled in one vectorized pass (see `calibrate_batch`)
+        batch: List[Message] = []
+        batch_names: List[List[Any]] = []
+        batch_probs: List[List[float]] = []
         for message in messages:
             ranking: List[Dict[Text, Any]] = message.get("intent_ranking") or []
             top_intent: Dict[Text, Any] = message.get("intent") or {}
@@ -69,29 +84,37 @@ class IntentConfidenceCalibrator(GraphComponent):
                 continue
 
             try:
-                names = [r.get("name") for r in ranking]
-                probs = np.array([max(float(r.get("confidence", 0.0)), 0.0) for r in ranking], dtype=np.float32)
-
-                # Temperature scaling on probabilities; preserve order
-                # p' = (p ** (1/T)) / sum(p ** (1/T))
-                exps = np.power(probs + min_c, 1.0 / max(T, 1e-3))
-                denom = float(np.sum(exps))
-                if denom <= 0.0:
-                    continue
-
-                calibrated = exps / denom
-                # cap maximum confidence
-                calibrated = np.minimum(calibrated, max_c)
-
-                # rebuild ranking
-                new_ranking = [{"name": n, "confidence": float(c)} for n, c in zip(names, calibrated)]
-                message.set("intent_ranking", new_ranking)
-
-                top_idx = int(np.argmax(calibrated))
-                message.set("intent", {"name": names[top_idx], "confidence": float(calibrated[top_idx])})
+                names, probs = ranking_probs(ranking)
             except Exception as e:
                 logger.exception(f"IntentConfidenceCalibrator failed: {e}")
                 continue
+            batch.append(message)
+            batch_names.append(names)
+            batch_probs.append(probs)
+
+        if not batch:
+            return messages
+
+        try:
+            calibrated, top_idx, valid = calibrate_batch(batch_probs, T, max_c, min_c)
+        except Exception as e:
+            logger.exception(f"IntentConfidenceCalibrator failed: {e}")
+            return messages
+
+        # Names stay as plain lists and confidences in the batch array; only
+        # the top-k entries per message are turned into ranking dicts
+        kept_idx, kept_conf = top_k(calibrated, [len(n) for n in batch_names], ranking_length)
+        for row, (message, names) in enumerate(zip(batch, batch_names)):
+            if not valid[row]:
+                continue
+            # rebuild ranking
+            new_ranking = [
+                {"name": names[i], "confidence": c} for i, c in zip(kept_idx[row], kept_conf[row])
+            ]
+            message.set("intent_ranking", new_ranking)
+
+            top = int(top_idx[row])
+            message.set("intent", {"name": names[top], "confidence": float(calibrated[row, top])})
 
         return messages
 
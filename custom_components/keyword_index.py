@@ -0,0 +1,59 @@
+from __future__ import annotations
+import re
+from typing import Dict, List, Set, Text, Tuple
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def _tokens(text: Text, case_sensitive: bool) -> List[Text]:
+    tokens = _TOKEN_RE.findall(text)
+    return tokens if case_sensitive else [t.lower() for t in tokens]
+
+
+def find_ambiguous_keywords(
+    intent_keyword_map: Dict[Text, Text], case_sensitive: bool = False
+) -> List[Tuple[Text, Text, Text, Text]]:
+    """Find keywords that occur (on word boundaries) inside a keyword of another intent.
+
+    Returns `(keyword1, intent1, keyword2, intent2)` for every pair where
+    `re.search(r"\\b" + re.escape(keyword1) + r"\\b", keyword2)` matches and the
+    intents differ, in the same order as a nested loop over the map would
+    produce them.
+
+    Instead of testing all K² pairs, keywords are indexed by their `\\w+`
+    tokens. Every token of `keyword1` must appear as a whole token of
+    `keyword2` for the word-boundary regex to match, so only keywords that
+    contain the rarest token of `keyword1` are checked with the regex.
+    Keywords without tokens, and non-ASCII keywords (where `re.IGNORECASE`
+    and `str.lower` can disagree), are always checked against every keyword.
+    """
+    re_flag = 0 if case_sensitive else re.IGNORECASE
+    items = list(intent_keyword_map.items())
+
+    postings: Dict[Text, List[int]] = {}
+    always_candidates: List[int] = []
+    for index, (keyword, _) in enumerate(items):
+        if not keyword.isascii():
+            always_candidates.append(index)
+            continue
+        for token in set(_tokens(keyword, case_sensitive)):
+            postings.setdefault(token, []).append(index)
+
+    all_indices = range(len(items))
+    ambiguous = []
+    for keyword1, intent1 in items:
+        tokens = _tokens(keyword1, case_sensitive)
+        if not tokens or not keyword1.isascii():
+            candidates = all_indices
+        else:
+            rarest = min(tokens, key=lambda t: len(postings.get(t, ())))
+            found: Set[int] = set(postings.get(rarest, ()))
+            found.update(always_candidates)
+            candidates = sorted(found)
+
+        pattern = re.compile(r"\b" + re.escape(keyword1) + r"\b", flags=re_flag)
+        for index in candidates:
+            keyword2, intent2 = items[index]
+            if intent1 != intent2 and pattern.search(keyword2):
+                ambiguous.append((keyword1, intent1, keyword2, intent2))
+    return ambiguous
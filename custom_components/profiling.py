@@ -0,0 +1,17 @@
+from __future__ import annotations
+from typing import Any, Callable, Text
+
+# The sampling profiler lives in actions/profiling.py (stdlib only) and is
+# shared with the action server. Models are also trained and served where the
+# action package is not deployed, so fall back to a no-op decorator there.
+try:
+    from actions.profiling import profile_calls
+except ImportError:
+
+    def profile_calls(name: Text) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+        """No-op stand-in for `actions.profiling.profile_calls`."""
+
+        def decorate(fn: Callable[..., Any]) -> Callable[..., Any]:
+            return fn
+
+        return decorate
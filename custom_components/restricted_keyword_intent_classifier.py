@@ -19,6 +19,9 @@ import rasa.shared.utils.io
 from rasa.shared.nlu.training_data.training_data import TrainingData
 from rasa.shared.nlu.training_data.message import Message
 
+from .profiling import profile_calls
+from .keyword_index import find_ambiguous_keywords
+
 logger = logging.getLogger(__name__)
 
 
@@ -32,6 +35,14 @@ class RestrictedKeywordIntentClassifier(GraphComponent, IntentClassifier):
     learns keywords from a configurable list of `allowed_intents`. It also
     supports filtering short/ambiguous keywords via `min_keyword_length` and
     a configurable `blocklist_keywords`.
+
+    The keyword map is compiled once (in `train`/`load`) into a single
+    alternation regex `\b(?:kw1|kw2|...)\b`, so each message is scanned in
+    one pass. Matching precedence: the match that starts earliest in the
+    message wins; among keywords matching at the same position the longest
+    one wins (ties on length fall back to keyword order). The compiled
+    pattern is persisted as `RestrictedKeywordIntentClassifier.pattern.json`
+    next to the keyword map.
     """
 
     @staticmethod
@@ -55,6 +66,7 @@ class RestrictedKeywordIntentClassifier(GraphComponent, IntentClassifier):
         resource: Resource,
         execution_context: ExecutionContext,
         intent_keyword_map: Optional[Dict] = None,
+        keyword_pattern: Optional[Text] = None,
     ) -> None:
         self.component_config = config
         self._model_storage = model_storage
@@ -67,6 +79,9 @@ class RestrictedKeywordIntentClassifier(GraphComponent, IntentClassifier):
         self.blocklist_keywords: Set[Text] = set(self.component_config.get("blocklist_keywords", []))
 
         self.intent_keyword_map = intent_keyword_map or {}
+        self._keyword_regex: Optional[re.Pattern] = None
+        self._keyword_lookup: Dict[Text, Text] = {}
+        self._compile_keyword_map(keyword_pattern)
 
     @classmethod
     def create(
@@ -119,32 +134,30 @@ class RestrictedKeywordIntentClassifier(GraphComponent, IntentClassifier):
             )
 
         self._validate_keyword_map()
+        self._compile_keyword_map()
         self.persist()
         return self._resource
 
     def _validate_keyword_map(self) -> None:
-        re_flag = 0 if self.case_sensitive else re.IGNORECASE
-
         ambiguous_mappings = []
-        for keyword1, intent1 in list(self.intent_keyword_map.items()):
-            for keyword2, intent2 in list(self.intent_keyword_map.items()):
-                if (
-                    re.search(r"\b" + re.escape(keyword1) + r"\b", keyword2, flags=re_flag)
-                    and intent1 != intent2
-                ):
-                    ambiguous_mappings.append((intent1, keyword1))
-                    rasa.shared.utils.io.raise_warning(
-                        f"Keyword '{keyword1}' is a keyword of intent '{intent1}', "
-                        f"but also a substring of '{keyword2}', which is a keyword of intent '{intent2}'. "
-                        f"'{keyword1}' will be removed from the list of keywords.",
-                        docs=DOCS_URL_COMPONENTS + "#keyword-intent-classifier",
-                    )
+        # Token index: only keyword pairs sharing a token are regex-checked
+        for keyword1, intent1, keyword2, intent2 in find_ambiguous_keywords(
+            self.intent_keyword_map, self.case_sensitive
+        ):
+            ambiguous_mappings.append((intent1, keyword1))
+            rasa.shared.utils.io.raise_warning(
+                f"Keyword '{keyword1}' is a keyword of intent '{intent1}', "
+                f"but also a substring of '{keyword2}', which is a keyword of intent '{intent2}'. "
+                f"'{keyword1}' will be removed from the list of keywords.",
+                docs=DOCS_URL_COMPONENTS + "#keyword-intent-classifier",
+            )
         for intent, keyword in ambiguous_mappings:
             self.intent_keyword_map.pop(keyword, None)
             logger.debug(
                 f"Removed keyword '{keyword}' from intent '{intent}' because it matched a keyword of another intent."
             )
 
+    @profile_calls("RestrictedKeywordIntentClassifier.process")
     def process(self, messages: List[Message]) -> List[Message]:
         for message in messages:
             intent_name = self._map_keyword_to_intent(message.get(TEXT))
@@ -158,26 +171,56 @@ class RestrictedKeywordIntentClassifier(GraphComponent, IntentClassifier):
 
         return messages
 
-    def _map_keyword_to_intent(self, text: Text) -> Optional[Text]:
+    def _build_keyword_pattern(self) -> Optional[Text]:
+        if not self.intent_keyword_map:
+            return None
+        # Longest first so that, at a given start position, the regex engine
+        # tries longer keywords before their prefixes. `sorted` is stable, so
+        # equal-length keywords keep their keyword map order.
+        keywords = sorted(self.intent_keyword_map, key=len, reverse=True)
+        return r"\b(?:" + "|".join(re.escape(k) for k in keywords) + r")\b"
+
+    def _compile_keyword_map(self, pattern: Optional[Text] = None) -> None:
+        """Compile the keyword map into one regex plus a match -> intent lookup."""
+        if pattern is None:
+            pattern = self._build_keyword_pattern()
+        self._keyword_pattern = pattern
+        if pattern is None:
+            self._keyword_regex = None
+            self._keyword_lookup = {}
+            return
         re_flag = 0 if self.case_sensitive else re.IGNORECASE
-        for keyword, intent in self.intent_keyword_map.items():
-            try:
-                if re.search(r"\b" + re.escape(keyword) + r"\b", text or "", flags=re_flag):
-                    logger.debug(
-                        f"RestrictedKeywordClassifier matched keyword '{keyword}' to intent '{intent}'."
-                    )
-                    return intent
-            except re.error:
-                # Skip invalid regex patterns (should not happen but be defensive)
-                logger.debug(f"Invalid regex for keyword '{keyword}', skipping.")
-                continue
-        return None
+        self._keyword_regex = re.compile(pattern, flags=re_flag)
+        if self.case_sensitive:
+            self._keyword_lookup = dict(self.intent_keyword_map)
+        else:
+            # Keywords differing only in case with different intents are
+            # already removed by `_validate_keyword_map`
+            self._keyword_lookup = {k.lower(): v for k, v in self.intent_keyword_map.items()}
+
+    def _map_keyword_to_intent(self, text: Text) -> Optional[Text]:
+        if self._keyword_regex is None:
+            return None
+        match = self._keyword_regex.search(text or "")
+        if match is None:
+            return None
+        keyword = match.group(0)
+        intent = self._keyword_lookup.get(keyword if self.case_sensitive else keyword.lower())
+        logger.debug(
+            f"RestrictedKeywordClassifier matched keyword '{keyword}' to intent '{intent}'."
+        )
+        return intent
 
     def persist(self) -> None:
         with self._model_storage.write_to(self._resource) as model_dir:
             file_name = f"{self.__class__.__name__}.json"
             keyword_file = model_dir / file_name
             rasa.shared.utils.io.dump_obj_as_json_to_file(keyword_file, self.intent_keyword_map)
+            pattern_file = model_dir / f"{self.__class__.__name__}.pattern.json"
+            rasa.shared.utils.io.dump_obj_as_json_to_file(
+                pattern_file,
+                {"pattern": self._keyword_pattern, "case_sensitive": self.case_sensitive},
+            )
 
     @classmethod
     def load(
@@ -188,13 +231,23 @@ class RestrictedKeywordIntentClassifier(GraphComponent, IntentClassifier):
         execution_context: ExecutionContext,
         **kwargs: Any,
     ) -> "RestrictedKeywordIntentClassifier":
+        keyword_pattern = None
         try:
             with model_storage.read_from(resource) as model_dir:
                 keyword_file = model_dir / f"{cls.__name__}.json"
                 intent_keyword_map = rasa.shared.utils.io.read_json_file(keyword_file)
+                pattern_file = model_dir / f"{cls.__name__}.pattern.json"
+                # Models trained before the pattern was persisted: rebuild it
+                if pattern_file.exists():
+                    persisted = rasa.shared.utils.io.read_json_file(pattern_file)
+                    case_sensitive = bool(config.get("case_sensitive", False))
+                    if persisted.get("case_sensitive") == case_sensitive:
+                        keyword_pattern = persisted.get("pattern")
         except ValueError:
             logger.warning(
                 f"Failed to load {cls.__name__} from model storage. Resource '{resource.name}' doesn't exist."
             )
             intent_keyword_map = None
-        return cls(config, model_storage, resource, execution_context, intent_keyword_map)
+        return cls(
+            config, model_storage, resource, execution_context, intent_keyword_map, keyword_pattern
+        )
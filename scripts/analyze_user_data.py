@@ -1,9 +1,28 @@
+import argparse
+import os
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 from collections import Counter
 
-def analyze_user_conversations():
+
+def load_log(csv_name, columns=None, since=None):
+    """Baca log dari dataset Parquet terpartisi (bila ada) atau dari CSV.
+
+    Untuk Parquet hanya partisi `date >= since` dan kolom `columns` yang dibaca.
+    """
+    dataset = os.path.splitext(csv_name)[0]
+    if os.path.isdir(dataset):
+        filters = [("date", ">=", since)] if since else None
+        return pd.read_parquet(dataset, columns=columns, filters=filters)
+
+    df = pd.read_csv(csv_name)
+    if since:
+        df = df[df['timestamp'].astype(str) >= since]
+    return df if columns is None else df[columns]
+
+
+def analyze_user_conversations(since=None):
     """Analisis data conversasi user"""
     
     print("="*60)
@@ -11,7 +30,11 @@ def analyze_user_conversations():
     print("="*60)
     
     try:
-        df = pd.read_csv('user_conversations_log.csv')
+        df = load_log(
+            'user_conversations_log.csv',
+            columns=['timestamp', 'user_id', 'user_message', 'predicted_intent', 'confidence_score'],
+            since=since,
+        )
     except FileNotFoundError:
         print("❌ File user_conversations_log.csv tidak ditemukan!")
         print("Jalankan chatbot dulu untuk collect data.")
@@ -150,7 +173,7 @@ def create_visualizations(df):
         print(f"⚠️  Warning: Could not create visualizations: {e}")
 
 
-def analyze_conversation_quality():
+def analyze_conversation_quality(since=None):
     """Analisis kualitas conversation"""
     
     print("\n" + "="*60)
@@ -158,7 +181,7 @@ def analyze_conversation_quality():
     print("="*60)
     
     try:
-        df = pd.read_csv('conversation_quality_log.csv')
+        df = load_log('conversation_quality_log.csv', since=since)
     except FileNotFoundError:
         print("❌ File conversation_quality_log.csv tidak ditemukan!")
         return
@@ -182,5 +205,10 @@ def analyze_conversation_quality():
 
 
 if __name__ == '__main__':
-    analyze_user_conversations()
-    analyze_conversation_quality()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Analisis log percakapan chatbot")
+    parser.add_argument("--since", default=None,
+                        help="Hanya baca data sejak tanggal ini (YYYY-MM-DD)")
+    args = parser.parse_args()
+
+    analyze_user_conversations(args.since)
+    analyze_conversation_quality(args.since)
\ No newline at end of file
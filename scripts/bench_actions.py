@@ -0,0 +1,361 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark suite for the custom actions (actions.py and data_collector.py).
+
+Every Action subclass and every `validate_<slot>` method of the
+FormValidationActions is run in-process with a fresh CollectingDispatcher
+against realistic Trackers: a long event history (--events), a long
+`kisah_cinta` text (--kisah-chars) and the slot values the action reads.
+For each case it reports the median and p95 latency per call, the peak
+traced memory of one call and the memory still held after many calls
+(tracemalloc, measured in a separate pass so it does not skew the timings).
+
+Results can be saved as a baseline JSON and compared against later runs;
+with --compare the script exits with status 1 when a case got slower than
+--threshold times its baseline median.
+
+Usage examples:
+  python scripts/bench_actions.py
+  python scripts/bench_actions.py --save bench_actions_baseline.json
+  python scripts/bench_actions.py --compare bench_actions_baseline.json --threshold 1.3
+  python scripts/bench_actions.py --filter kisah --events 2000 --no-cache
+
+Run from the project root (the directory that contains `actions/`). Files
+the actions write (research CSV, conversation logs) go to a temporary
+directory; Supabase, the metrics server and profiling are disabled.
+"""
+
+import argparse
+import inspect
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from latency_stats import percentile
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ACTION_MODULES = ("actions.actions", "actions.data_collector")
+
+KISAH_SENTENCES = [
+    "Kami bertemu pertama kali di pantai Kuta saat matahari terbenam.",
+    "Dia berasal dari Jawa dan saya dari Bali, jadi kami beda budaya dan beda agama.",
+    "Sempat LDR dua tahun karena dia kuliah di luar negeri, banyak rintangan yang kami lalui.",
+    "Orang tua awalnya tidak setuju, tapi kami berjuang dan tetap setia.",
+    "Rasanya seperti takdir, dari awal sudah ada chemistry yang kuat.",
+    "Kami suka suasana tenang di danau dan pegunungan, jauh dari keramaian kota.",
+]
+
+DEFAULT_SLOTS = {
+    "nama_pasangan": "Budi & Ani",
+    "latar_belakang": "beda budaya, Bali dan Jawa",
+    "tahu_legenda": "belum",
+    "kepuasan": "5",
+    "budget": "b",
+    "rekomendasi_tema": "ratu_pantai",
+    "tema": "ratu_pantai",
+    "lokasi_kategori": "pantai",
+    "kisah_id": "sri_jaya_pangus",
+    "kisah_version": None,
+}
+
+# Variasi per action: (nama kasus, slot yang di-override, teks pesan terakhir, intent)
+ACTION_CASES = {
+    "action_analisis_kisah_cinta": [
+        ("long_story", {}, None, None),
+        ("no_keywords", {"kisah_cinta": "kami biasa saja", "latar_belakang": ""}, None, None),
+    ],
+    "action_analisis_kisah_cinta_v2": [
+        ("known_intent", {}, None, "cerita_ldr"),
+        ("fallback", {}, None, "greet"),
+    ],
+    "action_rekomendasi_tema": [
+        ("with_tema", {}, None, None),
+        ("no_tema", {"rekomendasi_tema": None}, None, None),
+    ],
+    "action_detail_konsep": [
+        ("tema", {}, None, None),
+        ("from_rekomendasi", {"tema": None, "rekomendasi_tema": "ulun_danu"}, None, None),
+    ],
+    "action_jelaskan_legenda": [
+        ("tema_slot", {}, "ceritakan legenda ratu pantai selatan", None),
+        ("synonym_text", {"tema": None, "rekomendasi_tema": None, "kisah_id": None},
+         "boleh jelaskan kisah jayaprana dan layonsari?", None),
+    ],
+    "action_kisah_cinta_bali": [
+        ("full", {"kisah_id": None}, None, None),
+        ("selected", {}, None, None),
+    ],
+    "action_rekomendasi_dari_kisah": [
+        ("known", {}, None, None),
+        ("unknown", {"kisah_id": "tidak_ada"}, None, None),
+    ],
+    "action_info_lokasi_kontekstual": [
+        ("text_location", {"lokasi_kategori": None}, "ada lokasi di gunung atau danau?", None),
+        ("from_slot", {}, "lokasinya di mana saja?", None),
+    ],
+    "action_log_user_input": [
+        ("confident", {}, None, None),
+        ("low_confidence", {}, None, "nlu_fallback"),
+    ],
+    "action_analyze_conversation_quality": [
+        ("incremental", {}, None, None),
+        ("cold_sender", {}, None, None),
+    ],
+}
+
+VALIDATOR_VALUES = {
+    "nama_pasangan": [("ok", "Budi & Ani"), ("too_short", "Bu")],
+    "kisah_cinta": [("long", None), ("too_short", "singkat")],
+    "kepuasan": [("digit", "nilai saya 4"), ("invalid", "bagus sekali")],
+    "budget": [("letter", "b"), ("phrase", "sekitar 3 juta saja"), ("invalid", "terserah")],
+}
+
+
+def long_kisah(chars):
+    sentences = []
+    i = 0
+    while sum(len(s) + 1 for s in sentences) < chars:
+        sentences.append(KISAH_SENTENCES[i % len(KISAH_SENTENCES)])
+        i += 1
+    return " ".join(sentences)
+
+
+def event_history(count, low_confidence_every=7, fallback_every=11):
+    """Riwayat event ala tracker Rasa: user → action → bot → slot, berulang"""
+    events = []
+    ts = 1_700_000_000.0
+    turn = 0
+    while len(events) < count:
+        turn += 1
+        confidence = 0.55 if turn % low_confidence_every == 0 else 0.93
+        events.append({
+            "event": "user", "timestamp": ts, "text": KISAH_SENTENCES[turn % len(KISAH_SENTENCES)],
+            "parse_data": {
+                "intent": {"name": "cerita_perbedaan", "confidence": confidence},
+                "entities": [],
+                "intent_ranking": [{"name": "cerita_perbedaan", "confidence": confidence}],
+            },
+        })
+        action = "action_default_fallback" if turn % fallback_every == 0 else "action_analisis_kisah_cinta"
+        events.append({"event": "action", "timestamp": ts + 0.1, "name": action})
+        events.append({"event": "bot", "timestamp": ts + 0.2, "text": "…", "data": {}})
+        events.append({"event": "slot", "timestamp": ts + 0.3, "name": "rekomendasi_tema", "value": "ratu_pantai"})
+        ts += 1.0
+    return events[:count]
+
+
+class Case:
+    def __init__(self, name, call, make_tracker):
+        self.name = name
+        self.call = call
+        self.make_tracker = make_tracker
+
+
+def build_cases(args):
+    from rasa_sdk import Action, FormValidationAction, Tracker
+
+    kisah = long_kisah(args.kisah_chars)
+    events = event_history(args.events)
+    domain = {"slots": {}, "forms": {}, "responses": {}}
+
+    def tracker_factory(overrides, text, intent, fresh_sender=False):
+        slots = dict(DEFAULT_SLOTS, kisah_cinta=kisah)
+        slots.update(overrides)
+        latest = {
+            "text": text or KISAH_SENTENCES[0],
+            "intent": {"name": intent or "cerita_perbedaan",
+                       "confidence": 0.42 if intent == "nlu_fallback" else 0.93},
+            "entities": [],
+        }
+        counter = iter(range(10 ** 9))
+
+        def make():
+            sender = f"bench-{next(counter)}" if fresh_sender else "bench-user"
+            return Tracker(sender, slots, latest, events, False, None, {}, "action_listen")
+
+        if fresh_sender:
+            return make
+        tracker = make()
+        return lambda: tracker
+
+    actions = []
+    for module_name in ACTION_MODULES:
+        module = __import__(module_name, fromlist=["*"])
+        for obj in vars(module).values():
+            if (inspect.isclass(obj) and issubclass(obj, Action) and obj.__module__ == module_name
+                    and not inspect.isabstract(obj)):
+                actions.append(obj())
+
+    cases = []
+    for action in actions:
+        name = action.name()
+        if isinstance(action, FormValidationAction):
+            for slot, values in VALIDATOR_VALUES.items():
+                validator = getattr(action, f"validate_{slot}", None)
+                if validator is None:
+                    continue
+                for label, value in values:
+                    value = kisah if value is None else value
+                    cases.append(Case(
+                        f"{name}.validate_{slot}[{label}]",
+                        lambda d, t, v=validator, value=value: v(value, d, t, domain),
+                        tracker_factory({}, None, None),
+                    ))
+            continue
+        for label, overrides, text, intent in ACTION_CASES.get(name, [("default", {}, None, None)]):
+            cases.append(Case(
+                f"{name}[{label}]",
+                lambda d, t, a=action: a.run(d, t, domain),
+                tracker_factory(overrides, text, intent, fresh_sender=(label == "cold_sender")),
+            ))
+    return cases
+
+
+def invoke(case, loop):
+    from rasa_sdk.executor import CollectingDispatcher
+
+    result = case.call(CollectingDispatcher(), case.make_tracker())
+    if inspect.isawaitable(result):
+        result = loop.run_until_complete(result)
+    return result
+
+
+def time_case(case, loop, number, repeat, warmup):
+    for _ in range(warmup):
+        invoke(case, loop)
+    per_call = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(number):
+            invoke(case, loop)
+        per_call.append((time.perf_counter() - started) / number)
+    per_call.sort()
+    return {
+        "median_us": statistics.median(per_call) * 1e6,
+        "p95_us": percentile(per_call, 95) * 1e6,
+    }
+
+
+def memory_case(case, loop, number):
+    invoke(case, loop)
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        before, _ = tracemalloc.get_traced_memory()
+        invoke(case, loop)
+        _, peak = tracemalloc.get_traced_memory()
+        peak_bytes = peak - before
+
+        before, _ = tracemalloc.get_traced_memory()
+        for _ in range(number):
+            invoke(case, loop)
+        after, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"peak_kib": peak_bytes / 1024, "retained_b_per_call": (after - before) / number}
+
+
+def git_commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT_DIR,
+                             capture_output=True, text=True, check=True)
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline, threshold, report_missing=True):
+    regressions = []
+    print(f"\n{'case':<66} {'baseline':>10} {'now':>10} {'ratio':>7}")
+    for name, now in results.items():
+        old = baseline.get("results", {}).get(name)
+        if old is None:
+            print(f"{name:<66} {'-':>10} {now['median_us']:>9.1f}u {'new':>7}")
+            continue
+        ratio = now["median_us"] / max(old["median_us"], 1e-9)
+        flag = "  <-- slower" if ratio > threshold else ""
+        print(f"{name:<66} {old['median_us']:>9.1f}u {now['median_us']:>9.1f}u {ratio:>6.2f}x{flag}")
+        if ratio > threshold:
+            regressions.append(name)
+    missing = sorted(set(baseline.get("results", {})) - set(results))
+    if missing and report_missing:
+        print(f"Not run (in baseline only): {', '.join(missing)}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark every custom action in-process")
+    parser.add_argument("--events", type=int, default=500, help="Events in the tracker history (default: 500)")
+    parser.add_argument("--kisah-chars", type=int, default=2000, help="Length of the kisah_cinta slot (default: 2000)")
+    parser.add_argument("--number", type=int, default=200, help="Calls per timing sample (default: 200)")
+    parser.add_argument("--repeat", type=int, default=7, help="Timing samples per case (default: 7)")
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--filter", default="", help="Only run cases whose name contains this text")
+    parser.add_argument("--no-cache", action="store_true", help="Disable the action result cache (action_cache.py)")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc pass")
+    parser.add_argument("--save", default=None, help="Write the results to this baseline JSON file")
+    parser.add_argument("--compare", default=None, help="Compare against this baseline JSON file")
+    parser.add_argument("--threshold", type=float, default=1.25,
+                        help="Fail --compare when median latency exceeds baseline by this factor (default: 1.25)")
+    args = parser.parse_args()
+
+    # Harus di-set sebelum modul action diimpor
+    os.environ["SUPABASE_ENABLED"] = "false"
+    os.environ["ACTION_METRICS_PORT"] = "0"
+    os.environ["PROFILING_ENABLED"] = "0"
+    if args.no_cache:
+        os.environ["ACTION_CACHE_DISABLED"] = "1"
+    sys.path.insert(0, ROOT_DIR)
+    workdir = tempfile.mkdtemp(prefix="bench_actions_")
+    os.chdir(workdir)
+
+    import asyncio
+
+    loop = asyncio.new_event_loop()
+    cases = [c for c in build_cases(args) if args.filter in c.name]
+
+    results = {}
+    print(f"{'case':<66} {'median':>10} {'p95':>10} {'peak':>10} {'retained':>10}")
+    for case in cases:
+        stats = time_case(case, loop, args.number, args.repeat, args.warmup)
+        if not args.no_memory:
+            stats.update(memory_case(case, loop, args.number))
+        results[case.name] = stats
+        memory = ("" if args.no_memory else
+                  f" {stats['peak_kib']:>8.1f}Ki {stats['retained_b_per_call']:>9.1f}B")
+        print(f"{case.name:<66} {stats['median_us']:>9.1f}u {stats['p95_us']:>9.1f}u{memory}")
+    loop.close()
+
+    if args.save:
+        path = os.path.join(ROOT_DIR, args.save) if not os.path.isabs(args.save) else args.save
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({
+                "commit": git_commit(),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "settings": {k: getattr(args, k) for k in ("events", "kisah_chars", "number", "repeat", "no_cache")},
+                "results": results,
+            }, f, indent=2)
+        print(f"\nBaseline written to {path}")
+
+    if args.compare:
+        path = os.path.join(ROOT_DIR, args.compare) if not os.path.isabs(args.compare) else args.compare
+        with open(path, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold, report_missing=not args.filter)
+        if regressions:
+            print(f"FAIL: {len(regressions)} case(s) slower than {args.threshold:.2f}x baseline "
+                  f"(baseline commit {baseline.get('commit') or '?'})")
+            sys.exit(1)
+        print("OK: no regressions against baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark for the actions package (cold import time and RSS).
+
+Each run starts a fresh interpreter and imports every submodule of
+`actions` the same way `rasa run actions` does (rasa_sdk imports the whole
+package before registering actions). The script fails when the median
+import time or RSS growth exceeds the budget, or when a heavy dependency is
+imported eagerly.
+
+Usage examples:
+  python scripts/bench_actions_startup.py
+  python scripts/bench_actions_startup.py --runs 10 --max-import-ms 400 --json startup.json
+
+Run from the project root (the directory that contains `actions/`).
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Dijalankan di interpreter baru; rasa_sdk diimpor lebih dulu agar yang
+# diukur hanya biaya package actions sendiri.
+PROBE = r"""
+import json, pkgutil, resource, sys, time, importlib
+import rasa_sdk, rasa_sdk.executor
+rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+t0 = time.perf_counter()
+pkg = importlib.import_module("actions")
+for info in pkgutil.iter_modules(pkg.__path__, prefix="actions."):
+    importlib.import_module(info.name)
+elapsed = time.perf_counter() - t0
+rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+scale = 1 if sys.platform == "darwin" else 1024  # ru_maxrss: bytes di macOS, KB di Linux
+print(json.dumps({
+    "import_ms": elapsed * 1000,
+    "rss_mb": rss_after * scale / 2**20,
+    "rss_delta_mb": (rss_after - rss_before) * scale / 2**20,
+    "modules": sorted(sys.modules),
+}))
+"""
+
+DEFAULT_FORBIDDEN = ["pandas", "numpy", "requests", "pyarrow", "matplotlib"]
+
+
+def run_probe():
+    out = subprocess.run(
+        [sys.executable, "-c", PROBE],
+        cwd=ROOT_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure cold import time and RSS of the actions package")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--max-import-ms", type=float, default=150.0,
+                        help="Budget for median import time of the actions package (default: 150)")
+    parser.add_argument("--max-rss-delta-mb", type=float, default=15.0,
+                        help="Budget for median RSS growth caused by the import (default: 15)")
+    parser.add_argument("--forbid", default=",".join(DEFAULT_FORBIDDEN),
+                        help="Comma separated modules that must not be imported at startup")
+    parser.add_argument("--json", dest="json_path", default=None, help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    samples = [run_probe() for _ in range(args.runs)]
+    import_ms = statistics.median(s["import_ms"] for s in samples)
+    rss_delta = statistics.median(s["rss_delta_mb"] for s in samples)
+    rss_total = statistics.median(s["rss_mb"] for s in samples)
+    forbidden = [m for m in args.forbid.split(",") if m and m in samples[0]["modules"]]
+
+    print(f"actions import time (median of {args.runs}): {import_ms:.1f} ms (budget {args.max_import_ms:.0f} ms)")
+    print(f"RSS growth from import:          {rss_delta:.1f} MB (budget {args.max_rss_delta_mb:.0f} MB)")
+    print(f"Process RSS after import:        {rss_total:.1f} MB")
+    print(f"Eagerly imported heavy modules:  {', '.join(forbidden) or '-'}")
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "runs": args.runs,
+                "import_ms_median": import_ms,
+                "rss_delta_mb_median": rss_delta,
+                "rss_mb_median": rss_total,
+                "forbidden_imported": forbidden,
+                "samples": [{k: v for k, v in s.items() if k != "modules"} for s in samples],
+            }, f, indent=2)
+
+    failures = []
+    if import_ms > args.max_import_ms:
+        failures.append(f"import time {import_ms:.1f} ms > {args.max_import_ms:.0f} ms")
+    if rss_delta > args.max_rss_delta_mb:
+        failures.append(f"RSS growth {rss_delta:.1f} MB > {args.max_rss_delta_mb:.0f} MB")
+    if forbidden:
+        failures.append(f"heavy modules imported at startup: {', '.join(forbidden)}")
+    if failures:
+        print("FAIL: " + "; ".join(failures))
+        sys.exit(1)
+    print("OK: startup within budget")
+
+
+if __name__ == "__main__":
+    main()
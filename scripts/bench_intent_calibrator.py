@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Benchmark for IntentConfidenceCalibrator: per-message loop vs batched path.
+
+Generates synthetic intent rankings (34 intents, as in data/nlu.yml, with
+varying ranking lengths) and calibrates them with the original per-message
+NumPy loop and with the batched `calibrate_batch` path used by
+`IntentConfidenceCalibrator.process`. Both must produce the same top intent
+for every message and the same confidences up to float32 rounding. With
+--ranking-length k, the reference ranking is sorted and cut to k entries
+before comparing, and the JSON size of the rankings is reported.
+
+Usage examples:
+  python scripts/bench_intent_calibrator.py
+  python scripts/bench_intent_calibrator.py --sizes 1000,10000,50000 --repeat 5
+  python scripts/bench_intent_calibrator.py --ranking-length 0
+
+Run from the project root (the directory that contains `custom_components/`).
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def load_calibration():
+    # Loaded straight from the file: importing the custom_components package
+    # would pull in rasa, which the numeric path does not need
+    path = os.path.join(ROOT_DIR, "custom_components", "calibration.py")
+    spec = importlib.util.spec_from_file_location("calibration", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def per_message(rankings, T, max_c, min_c):
+    """The original loop body of IntentConfidenceCalibrator.process"""
+    results = []
+    for ranking in rankings:
+        names = [r.get("name") for r in ranking]
+        probs = np.array([max(float(r.get("confidence", 0.0)), 0.0) for r in ranking], dtype=np.float32)
+        exps = np.power(probs + min_c, 1.0 / max(T, 1e-3))
+        denom = float(np.sum(exps))
+        if denom <= 0.0:
+            results.append(None)
+            continue
+        calibrated = np.minimum(exps / denom, max_c)
+        new_ranking = [{"name": n, "confidence": float(c)} for n, c in zip(names, calibrated)]
+        top_idx = int(np.argmax(calibrated))
+        results.append((new_ranking, {"name": names[top_idx], "confidence": float(calibrated[top_idx])}))
+    return results
+
+
+def truncate(results, ranking_length):
+    """Apply ranking_length to per-message results (stable sort, best first)"""
+    if ranking_length <= 0:
+        return results
+    return [
+        None if r is None else (sorted(r[0], key=lambda x: -x["confidence"])[:ranking_length], r[1])
+        for r in results
+    ]
+
+
+def batched(calibration, rankings, T, max_c, min_c, ranking_length):
+    """What IntentConfidenceCalibrator.process does per batch"""
+    split = [calibration.ranking_probs(r) for r in rankings]
+    calibrated, top_idx, valid = calibration.calibrate_batch([p for _, p in split], T, max_c, min_c)
+    kept_idx, kept_conf = calibration.top_k(calibrated, [len(n) for n, _ in split], ranking_length)
+    results = []
+    for row, (names, _) in enumerate(split):
+        if not valid[row]:
+            results.append(None)
+            continue
+        top = int(top_idx[row])
+        results.append((
+            [{"name": names[i], "confidence": c} for i, c in zip(kept_idx[row], kept_conf[row])],
+            {"name": names[top], "confidence": float(calibrated[row, top])},
+        ))
+    return results
+
+
+def synthetic_rankings(size, intents, seed):
+    rng = np.random.default_rng(seed)
+    names = [f"intent_{i:02d}" for i in range(intents)]
+    rankings = []
+    for _ in range(size):
+        length = int(rng.integers(1, intents + 1))
+        probs = np.sort(rng.dirichlet(np.full(intents, 0.3)))[::-1][:length]
+        order = rng.permutation(intents)[:length]
+        rankings.append([{"name": names[i], "confidence": float(p)} for i, p in zip(order, probs)])
+    return rankings
+
+
+def compare(reference, candidate):
+    max_diff = 0.0
+    for ref, cand in zip(reference, candidate):
+        if (ref is None) != (cand is None):
+            return False, max_diff
+        if ref is None:
+            continue
+        if ref[1]["name"] != cand[1]["name"]:
+            return False, max_diff
+        if [r["name"] for r in ref[0]] != [c["name"] for c in cand[0]]:
+            return False, max_diff
+        for r, c in zip(ref[0], cand[0]):
+            max_diff = max(max_diff, abs(r["confidence"] - c["confidence"]))
+    return max_diff <= 1e-6, max_diff
+
+
+def best_of(repeat, fn):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the intent confidence calibrator")
+    parser.add_argument("--sizes", default="1000,10000", help="Comma separated batch sizes")
+    parser.add_argument("--intents", type=int, default=34)
+    parser.add_argument("--temperature", type=float, default=1.6)
+    parser.add_argument("--max-confidence", type=float, default=0.92)
+    parser.add_argument("--min-confidence", type=float, default=1e-6)
+    parser.add_argument("--ranking-length", type=int, default=10,
+                        help="Intents kept per ranking, 0 keeps all (default: 10)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    calibration = load_calibration()
+    params = (args.temperature, args.max_confidence, args.min_confidence)
+    failed = False
+    for size in [int(s) for s in args.sizes.split(",") if s]:
+        rankings = synthetic_rankings(size, args.intents, args.seed)
+        loop_s, reference = best_of(args.repeat, lambda: per_message(rankings, *params))
+        batch_s, candidate = best_of(
+            args.repeat, lambda: batched(calibration, rankings, *params, args.ranking_length)
+        )
+        same, max_diff = compare(truncate(reference, args.ranking_length), candidate)
+        failed = failed or not same
+        full_kb = len(json.dumps([r[0] for r in reference if r])) / 1024
+        kept_kb = len(json.dumps([r[0] for r in candidate if r])) / 1024
+        print(f"n={size:>6}: per-message {loop_s * 1000:8.1f} ms | batched {batch_s * 1000:8.1f} ms "
+              f"({loop_s / max(batch_s, 1e-9):.1f}x) | same results: {same} (max diff {max_diff:.1e}) "
+              f"| ranking JSON {full_kb:.0f} KB -> {kept_kb:.0f} KB")
+
+    if failed:
+        print("FAIL: batched path differs from the per-message path")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the keyword and phrase matching on the action hot path.
+
+Each case times the current implementation against the original inline
+checks it replaced:
+
+  kisah_scores   WeightedKeywordScorer (action_analisis_kisah_cinta) vs the
+                 per-theme `keyword in text` loop, on stories of --lengths;
+  lokasi         gazetteer 'lokasi' group (ActionInfoLokasiKontekstual) vs
+                 the pantai/gunung/danau `any(k in text ...)` chain;
+  budget         gazetteer 'budget' group (validate_budget) vs the
+                 '<5'/'>10'/'juta' checks;
+  tema           gazetteer 'tema' group (ActionJelaskanLegenda) vs the
+                 original normalize_key synonym loop.
+
+Inputs are synthetic, built from the real keyword lists and phrases plus
+filler words. Where the semantics did not change, every input is checked
+for identical results. The tema case is timed only: whole-word matching
+intentionally differs from the old substring loop
+(see scripts/verify_content_catalog.py for its expected results).
+
+Usage examples:
+  python scripts/bench_keyword_matcher.py
+  python scripts/bench_keyword_matcher.py --lengths 115,555,2200,10000 --number 500
+
+Run from the project root (the directory that contains `actions/`).
+"""
+
+import argparse
+import os
+import random
+import sys
+import timeit
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+FILLER = (
+    "hari itu kami pergi makan bersama teman teman lalu pulang ke rumah masing masing "
+    "dan bercerita tentang banyak hal sampai larut malam sambil minum kopi "
+).split()
+
+UTTERANCE_LENGTHS = (30, 80)
+
+
+def load_actions():
+    # Harus di-set sebelum modul action diimpor
+    os.environ["SUPABASE_ENABLED"] = "false"
+    os.environ["ACTION_METRICS_PORT"] = "0"
+    os.environ["PROFILING_ENABLED"] = "0"
+    sys.path.insert(0, ROOT_DIR)
+    from actions import actions
+
+    return actions
+
+
+def kisah_keywords(actions):
+    return {
+        "ratu_pantai": actions.KEYWORDS_PERDAMAIAN,
+        "putri_ayu": actions.KEYWORDS_ROMANTIS,
+        "manik_angkeran": actions.KEYWORDS_PERJUANGAN,
+        "sri_jaya_pangus": actions.KEYWORDS_AKULTURASI,
+        "ulun_danu": actions.KEYWORDS_ALAM,
+        "jayaprana_layonsari": actions.KEYWORDS_TRAGIS,
+    }
+
+
+def reference_kisah_scores(keywords, text):
+    """The original calculate_score loop of ActionAnalisisKisahCinta"""
+    scores, matches = {}, {}
+    for theme, keywords_dict in keywords.items():
+        score = 0
+        matched = []
+        for strength, words in keywords_dict.items():
+            weight = 3 if strength == 'strong' else 2 if strength == 'medium' else 1
+            for keyword in words:
+                if keyword in text:
+                    score += weight
+                    matched.append(keyword)
+        scores[theme] = score
+        matches[theme] = matched
+    return scores, matches
+
+
+def reference_lokasi(text):
+    """The original category chain of ActionInfoLokasiKontekstual"""
+    if any(k in text for k in ["pantai", "kuta", "melasti", "tanah lot", "uluwatu", "sanur", "nusa dua"]):
+        return "pantai"
+    elif any(k in text for k in ["gunung", "batur", "campuhan", "sekumpul", "ridge"]):
+        return "gunung"
+    elif any(k in text for k in ["danau", "beratan", "ulun danu", "danu"]):
+        return "danau"
+    return None
+
+
+def current_lokasi(gazetteer, text):
+    return gazetteer.first_category_in(text, "lokasi")
+
+
+def reference_budget(value):
+    """The original phrase checks of validate_budget"""
+    if 'juta' in value or any(char.isdigit() for char in value):
+        if any(x in value for x in ['<5', 'kurang 5', 'dibawah 5', 'di bawah 5']):
+            return "a"
+        elif any(x in value for x in ['>10', 'lebih 10', 'diatas 10', 'di atas 10']):
+            return "c"
+        return "b"
+    return None
+
+
+def current_budget(gazetteer, value):
+    found = gazetteer.categories_in(value, "budget")
+    if 'juta' in found or any(char.isdigit() for char in value):
+        if 'a' in found:
+            return "a"
+        elif 'c' in found:
+            return "c"
+        return "b"
+    return None
+
+
+def reference_tema(synonyms_map, text):
+    """The original normalize_key of ActionJelaskanLegenda, for one free-text value"""
+    v = (text or "").lower().strip().replace("_", " ")
+    for key, syns in synonyms_map.items():
+        if v == key or v in syns:
+            return key
+        if any(s in v for s in syns):
+            return key
+    return ""
+
+
+def synthetic_texts(phrases, length, count, rng):
+    """Lowercase texts of about `length` chars: filler words with some phrases mixed in"""
+    texts = []
+    for _ in range(count):
+        words = []
+        while sum(len(w) + 1 for w in words) < length:
+            words.append(rng.choice(phrases) if rng.random() < 0.08 else rng.choice(FILLER))
+        texts.append(" ".join(words)[:length])
+    return texts
+
+
+def time_per_call(fn, texts, number, repeat):
+    def run():
+        for text in texts:
+            fn(text)
+
+    best = min(timeit.repeat(run, number=number, repeat=repeat))
+    return best / (number * len(texts)) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark keyword matching against the original checks")
+    parser.add_argument("--lengths", default="115,555,2200", help="Comma separated story lengths in chars")
+    parser.add_argument("--texts", type=int, default=20, help="Distinct texts per case (default: 20)")
+    parser.add_argument("--number", type=int, default=200, help="Passes over the texts per sample")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    actions = load_actions()
+    from actions.content_catalog import get_content_catalog
+    from actions.gazetteer import get_gazetteer
+
+    keywords = kisah_keywords(actions)
+    scorer = actions.KISAH_KEYWORD_SCORER
+    gazetteer = get_gazetteer()
+    synonyms_map = get_content_catalog().synonyms
+    rng = random.Random(args.seed)
+
+    # (nama, panjang, teks, fungsi lama, fungsi baru, bandingkan hasil)
+    cases = []
+    kisah_phrases = [w for by_strength in keywords.values() for words in by_strength.values() for w in words]
+    for length in (int(n) for n in args.lengths.split(",") if n):
+        cases.append(("kisah_scores", length, synthetic_texts(kisah_phrases, length, args.texts, rng),
+                      lambda t: reference_kisah_scores(keywords, t), scorer.score, True))
+    for group, reference, current, compare in (
+        ("lokasi", reference_lokasi, lambda t: current_lokasi(gazetteer, t), True),
+        ("budget", reference_budget, lambda t: current_budget(gazetteer, t), True),
+        ("tema", lambda t: reference_tema(synonyms_map, t), gazetteer.resolve_tema, False),
+    ):
+        phrases = [p for phrases in gazetteer_phrases(gazetteer, group) for p in phrases]
+        for length in UTTERANCE_LENGTHS:
+            cases.append((group, length, synthetic_texts(phrases, length, args.texts, rng),
+                          reference, current, compare))
+
+    print(f"{'case':<16} {'chars':>6} {'original':>12} {'current':>12} {'speedup':>8} {'results':>10}")
+    mismatches = 0
+    for name, length, texts, reference, current, compare in cases:
+        status = "timed only"
+        if compare:
+            differing = sum(1 for text in texts if reference(text) != current(text))
+            mismatches += differing
+            status = "identical" if not differing else f"{differing} differ"
+        before = time_per_call(reference, texts, args.number, args.repeat)
+        after = time_per_call(current, texts, args.number, args.repeat)
+        print(f"{name:<16} {length:>6} {before:>10.2f}us {after:>10.2f}us {before / after:>7.2f}x {status:>10}")
+
+    if mismatches:
+        print(f"\n{mismatches} input(s) gave different results")
+        sys.exit(1)
+
+
+def gazetteer_phrases(gazetteer, group):
+    """Frasa per kategori sebuah grup gazetteer"""
+    by_category = {}
+    for phrase, category in gazetteer._owners[group].items():
+        by_category.setdefault(category, []).append(phrase)
+    return list(by_category.values())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the keyword ambiguity check of RestrictedKeywordIntentClassifier.
+
+Builds a synthetic keyword map (short phrases over a shared vocabulary,
+spread over many intents, with some keywords deliberately contained in
+keywords of other intents) and times the token-indexed check against the
+original all-pairs regex loop. For sizes up to --max-reference both are run
+and their results must be identical (same pairs, same order).
+
+Usage examples:
+  python scripts/bench_keyword_validation.py
+  python scripts/bench_keyword_validation.py --sizes 500,2000,10000 --intents 34 --case-sensitive
+
+Run from the project root (the directory that contains `custom_components/`).
+"""
+
+import argparse
+import importlib.util
+import os
+import random
+import re
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def load_keyword_index():
+    # Loaded straight from the file: importing the custom_components package
+    # would pull in rasa, which the check itself does not need
+    path = os.path.join(ROOT_DIR, "custom_components", "keyword_index.py")
+    spec = importlib.util.spec_from_file_location("keyword_index", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def reference_ambiguous_keywords(intent_keyword_map, case_sensitive):
+    """The original O(K²) loop from _validate_keyword_map"""
+    re_flag = 0 if case_sensitive else re.IGNORECASE
+    ambiguous = []
+    for keyword1, intent1 in list(intent_keyword_map.items()):
+        for keyword2, intent2 in list(intent_keyword_map.items()):
+            if (
+                re.search(r"\b" + re.escape(keyword1) + r"\b", keyword2, flags=re_flag)
+                and intent1 != intent2
+            ):
+                ambiguous.append((keyword1, intent1, keyword2, intent2))
+    return ambiguous
+
+
+def synthetic_keyword_map(size, intents, vocab_size, seed):
+    rng = random.Random(seed)
+    syllables = ["ka", "la", "ma", "na", "pa", "ra", "sa", "ta", "wa", "ya", "ba", "da", "ga", "ja"]
+    vocab = list(dict.fromkeys(
+        "".join(rng.choice(syllables) for _ in range(rng.randint(2, 4))) for _ in range(vocab_size)
+    ))
+    intent_names = [f"intent_{i:02d}" for i in range(intents)]
+
+    keyword_map = {}
+    while len(keyword_map) < size:
+        if keyword_map and rng.random() < 0.05:
+            # Sub-phrase of an existing keyword, assigned to a random intent
+            words = rng.choice(list(keyword_map)).split()
+            start = rng.randrange(len(words))
+            keyword = " ".join(words[start:rng.randint(start + 1, len(words))])
+        else:
+            keyword = " ".join(rng.choice(vocab) for _ in range(rng.randint(1, 4)))
+        if rng.random() < 0.1:
+            keyword = keyword.title()
+        keyword_map.setdefault(keyword, rng.choice(intent_names))
+    return keyword_map
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the keyword ambiguity check")
+    parser.add_argument("--sizes", default="1000,10000", help="Comma separated keyword map sizes")
+    parser.add_argument("--intents", type=int, default=34)
+    parser.add_argument("--vocab", type=int, default=3000, help="Number of distinct synthetic words")
+    parser.add_argument("--case-sensitive", action="store_true")
+    parser.add_argument("--max-reference", type=int, default=2000,
+                        help="Only run the all-pairs reference up to this size (default: 2000)")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    keyword_index = load_keyword_index()
+    failed = False
+    for size in [int(s) for s in args.sizes.split(",") if s]:
+        keyword_map = synthetic_keyword_map(size, args.intents, args.vocab, args.seed)
+
+        t0 = time.perf_counter()
+        indexed = keyword_index.find_ambiguous_keywords(keyword_map, args.case_sensitive)
+        indexed_s = time.perf_counter() - t0
+        line = f"K={size:>6}: indexed {indexed_s * 1000:9.1f} ms, {len(indexed)} ambiguous pairs"
+
+        if size <= args.max_reference:
+            t0 = time.perf_counter()
+            reference = reference_ambiguous_keywords(keyword_map, args.case_sensitive)
+            reference_s = time.perf_counter() - t0
+            same = reference == indexed
+            failed = failed or not same
+            line += (f" | all-pairs {reference_s * 1000:9.1f} ms "
+                     f"({reference_s / max(indexed_s, 1e-9):.0f}x) | identical: {same}")
+        print(line)
+
+    if failed:
+        print("FAIL: indexed check differs from the all-pairs reference")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
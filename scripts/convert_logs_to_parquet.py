@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Convert existing conversation CSV logs into daily-partitioned Parquet datasets.
+
+The output layout is the same one written by the action server when
+CONVERSATION_LOG_FORMAT=parquet, e.g.:
+  user_conversations_log/date=2025-11-09/part-csv-import.parquet
+
+Usage examples:
+  python scripts/convert_logs_to_parquet.py
+  python scripts/convert_logs_to_parquet.py --csv user_conversations_log.csv
+
+Requires: pyarrow
+"""
+
+import argparse
+import csv
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from actions.columnar_log import SCHEMAS, dataset_dir, rows_to_table, write_partitioned
+
+
+def convert(csv_path: str, out_dir: str) -> None:
+    name = os.path.basename(csv_path)
+    if name not in SCHEMAS:
+        print(f"Skip {csv_path}: unknown log (expected one of {', '.join(SCHEMAS)})")
+        return
+    if not os.path.exists(csv_path):
+        print(f"CSV not found: {csv_path}")
+        return
+
+    with open(csv_path, newline="", encoding="utf-8") as f:
+        # Buang baris header ganda yang mungkin tertulis di tengah file
+        rows = [r for r in csv.DictReader(f) if r.get("timestamp") not in (None, "", "timestamp")]
+
+    table = rows_to_table(rows, SCHEMAS[name]())
+    # Nama file tetap sehingga konversi ulang menimpa hasil sebelumnya
+    written = write_partitioned(table, out_dir, basename="part-csv-import")
+    print(f"{csv_path}: {len(rows)} rows → {len(written)} partitions in {out_dir}/")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert conversation CSV logs to partitioned Parquet")
+    parser.add_argument("--csv", dest="csv_paths", action="append",
+                        help="CSV log to convert (default: all known logs in the current directory)")
+    parser.add_argument("--out", dest="out_dir", default=None,
+                        help="Output dataset directory, only with a single --csv (default: CSV name without extension)")
+    args = parser.parse_args()
+
+    csv_paths = args.csv_paths or list(SCHEMAS)
+    if args.out_dir and len(csv_paths) > 1:
+        parser.error("--out can only be used with a single --csv")
+    for csv_path in csv_paths:
+        convert(csv_path, args.out_dir or dataset_dir(csv_path))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,10 @@
 import os
 import sys
-import json
 from datetime import datetime
 import pandas as pd
-import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from actions.supabase_client import SupabaseClient
 
 CSV_PATH_DEFAULT = "/Users/dwraputra/Code/ChatbotV2/data_riset_prewedding.csv"
 
@@ -38,22 +39,13 @@ def to_ts(s):
 
 def main():
     csv_path = sys.argv[1] if len(sys.argv) > 1 else CSV_PATH_DEFAULT
-    url = os.environ.get("SUPABASE_URL")
-    key = os.environ.get("SUPABASE_SERVICE_KEY") or os.environ.get("SUPABASE_KEY")
+    client = SupabaseClient.from_env()
     table = os.environ.get("SUPABASE_TABLE", "data_riset_prewedding")
 
-    if not url or not key:
+    if client is None:
         print("ERROR: set SUPABASE_URL and SUPABASE_SERVICE_KEY env variables.")
         sys.exit(1)
 
-    endpoint = f"{url.rstrip('/')}/rest/v1/{table}?on_conflict=conversation_id,timestamp"
-    headers = {
-        "apikey": key,
-        "Authorization": f"Bearer {key}",
-        "Content-Type": "application/json",
-        "Prefer": "resolution=merge-duplicates"
-    }
-
     df = pd.read_csv(csv_path)
 
     # Drop rows that accidentally contain header names duplicated in data
@@ -96,7 +88,7 @@ def main():
         }
         payload.append(item)
 
-    resp = requests.post(endpoint, headers=headers, data=json.dumps(payload))
+    resp = client.upsert(table, payload, on_conflict=("conversation_id", "timestamp"), endpoint="bulk_upsert")
     if resp.status_code >= 200 and resp.status_code < 300:
         print(f"Uploaded {len(payload)} rows to {table}.")
     else:
@@ -0,0 +1,20 @@
+"""
+Shared latency statistics for the benchmark and load-test scripts
+(bench_actions.py, load_test_actions.py, replay_action_trace.py,
+profile_nlu_pipeline.py). Not meant to be run directly.
+"""
+
+import math
+
+
+def percentile(sorted_values, q):
+    """Nearest-rank percentile `q` (0-100) of an ascending list; 0.0 when empty.
+
+    The value at rank ceil(q/100 * n): with n=100, p95 is the 95th value and
+    p99 the 99th. q * n is computed first so that e.g. 7 * 100 / 100 stays
+    exactly 7 instead of 7.000000000000001.
+    """
+    if not sorted_values:
+        return 0.0
+    rank = math.ceil(q * len(sorted_values) / 100.0)
+    return sorted_values[min(max(rank, 1), len(sorted_values)) - 1]
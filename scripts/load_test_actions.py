@@ -0,0 +1,416 @@
+#!/usr/bin/env python3
+"""
+Concurrent webhook load generator for the action server.
+
+Turns the conversations in scripts/user_testing_guide.py (SCENARIOS) into
+the requests Rasa sends to the action server (`action_endpoint` in
+endpoints.yml, default http://localhost:5055/webhook):
+
+  * each scenario message is given the intent of its most similar example
+    in data/nlu.yml (token overlap, a stand-in for the NLU model);
+  * the custom actions that follow that intent in data/rules.yml and
+    data/stories.yml are called in order, forms via their validate_<form>
+    action with the next required slot filled from the message;
+  * the request body carries a tracker shaped like Rasa's (slots, events,
+    latest_message, active_loop) and the domain from domain.yml; slot
+    events returned by the action server are applied to the tracker.
+
+Conversations arrive as a Poisson process at --rate per second (or back to
+back when --rate is 0) and are run by --concurrency worker threads; turns of
+one conversation are sequential, like Rasa. At the end it prints throughput
+and p50/p95/p99 latency per action name.
+
+Usage examples:
+  python scripts/load_test_actions.py --dry-run
+  python scripts/load_test_actions.py --concurrency 20 --rate 5 --duration 60
+  python scripts/load_test_actions.py --url http://10.0.0.5:5055/webhook --conversations 500 --json load.json
+
+Run from the project root (the directory that contains domain.yml).
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+import yaml
+
+from latency_stats import percentile
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_URL = "http://localhost:5055/webhook"
+FALLBACK_INTENT = "nlu_fallback"
+
+_TOKEN_RE = re.compile(r"\w+")
+# [teks](entity) atau [teks]{"entity": ...} pada contoh NLU
+_ANNOTATION_RE = re.compile(r"\[([^\]]+)\](?:\([^)]*\)|\{[^}]*\})")
+
+
+def load_yaml(name):
+    with open(os.path.join(ROOT_DIR, name), encoding="utf-8") as f:
+        return yaml.safe_load(f) or {}
+
+
+def load_scenarios():
+    path = os.path.join(ROOT_DIR, "scripts", "user_testing_guide.py")
+    spec = importlib.util.spec_from_file_location("user_testing_guide", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.SCENARIOS
+
+
+def action_url_from_endpoints():
+    try:
+        endpoint = load_yaml("endpoints.yml").get("action_endpoint") or {}
+        return endpoint.get("url") or DEFAULT_URL
+    except OSError:
+        return DEFAULT_URL
+
+
+def tokens(text):
+    return set(_TOKEN_RE.findall(text.lower()))
+
+
+class IntentMatcher:
+    """Nearest NLU example by Jaccard token overlap"""
+
+    def __init__(self, nlu, min_score):
+        self.min_score = min_score
+        self.examples = []
+        for block in nlu.get("nlu", []):
+            if "intent" not in block:
+                continue
+            for line in str(block.get("examples", "")).splitlines():
+                line = line.strip()
+                if line.startswith("- "):
+                    text = _ANNOTATION_RE.sub(r"\1", line[2:])
+                    self.examples.append((tokens(text), block["intent"]))
+
+    def match(self, text):
+        query = tokens(text)
+        best_intent, best_score = FALLBACK_INTENT, 0.0
+        for example, intent in self.examples:
+            if not example:
+                continue
+            score = len(query & example) / len(query | example)
+            if score > best_score:
+                best_intent, best_score = intent, score
+        if best_score < self.min_score:
+            return FALLBACK_INTENT, best_score
+        return best_intent, best_score
+
+
+def intent_actions(domain, *trainings):
+    """intent → custom action / form yang dijalankan setelahnya.
+
+    Rule atau story pertama yang menyebut intent itu menang, meskipun
+    isinya hanya utter_*. Rule dengan `condition` (hanya berlaku saat form
+    tertentu aktif) dilewati.
+    """
+    custom = {a for a in domain.get("actions", []) if not a.startswith("utter_")}
+    custom.update(domain.get("forms") or {})
+    mapping = {}
+    for training in trainings:
+        for flow in training.get("rules", []) + training.get("stories", []):
+            if flow.get("condition"):
+                continue
+            found = {}
+            intents = []
+            for step in flow.get("steps", []):
+                if "intent" in step:
+                    intents = [step["intent"]]
+                elif "or" in step:
+                    intents = [option["intent"] for option in step["or"] if "intent" in option]
+                else:
+                    for intent in intents:
+                        actions = found.setdefault(intent, [])
+                        if step.get("action") in custom:
+                            actions.append(step["action"])
+                    continue
+                for intent in intents:
+                    found.setdefault(intent, [])
+            for intent, actions in found.items():
+                mapping.setdefault(intent, actions)
+    return {intent: actions for intent, actions in mapping.items() if actions}
+
+
+class Conversation:
+    """Tracker satu percakapan, dibangun seperti yang dikirim Rasa ke action server"""
+
+    def __init__(self, domain, sender_id):
+        self.domain = domain
+        self.sender_id = sender_id
+        self.slots = {name: None for name in domain.get("slots") or {}}
+        self.events = []
+        self.active_loop = {}
+        self.latest_message = {}
+        self.latest_action_name = "action_listen"
+        self.now = time.time()
+
+    def _event(self, event):
+        self.now += 0.001
+        event["timestamp"] = self.now
+        self.events.append(event)
+
+    def user(self, text, intent, confidence):
+        self.latest_message = {
+            "text": text,
+            "intent": {"name": intent, "confidence": confidence},
+            "intent_ranking": [{"name": intent, "confidence": confidence}],
+            "entities": [],
+            "message_id": uuid.uuid4().hex,
+        }
+        self._event({"event": "user", "text": text, "parse_data": self.latest_message,
+                     "input_channel": "rest", "message_id": self.latest_message["message_id"]})
+
+    def fill_form_slot(self, form, text):
+        """Isi required slot berikutnya dari teks, seperti slot mapping from_text"""
+        required = (self.domain.get("forms") or {}).get(form, {}).get("required_slots") or []
+        pending = [slot for slot in required if self.slots.get(slot) in (None, "")]
+        self.active_loop = {"name": form}
+        if pending:
+            self._event({"event": "slot", "name": pending[0], "value": text})
+            self.slots[pending[0]] = text
+            self.slots["requested_slot"] = pending[0]
+
+    def body(self, action_name):
+        return {
+            "next_action": action_name,
+            "sender_id": self.sender_id,
+            "tracker": {
+                "sender_id": self.sender_id,
+                "slots": self.slots,
+                "latest_message": self.latest_message,
+                "latest_event_time": self.now,
+                "followup_action": None,
+                "paused": False,
+                "events": self.events,
+                "latest_input_channel": "rest",
+                "active_loop": self.active_loop,
+                "latest_action": {"action_name": self.latest_action_name},
+                "latest_action_name": self.latest_action_name,
+            },
+            "domain": self.domain,
+            "version": str(self.domain.get("version", "3.1")),
+        }
+
+    def apply(self, action_name, response):
+        self._event({"event": "action", "name": action_name})
+        self.latest_action_name = action_name
+        for event in response.get("events") or []:
+            if event.get("event") == "slot":
+                self.slots[event.get("name")] = event.get("value")
+            elif event.get("event") == "active_loop":
+                self.active_loop = {"name": event.get("name")} if event.get("name") else {}
+            self._event(dict(event))
+        for message in response.get("responses") or []:
+            self._event({"event": "bot", "text": message.get("text"), "data": {}})
+
+
+class Plan:
+    def __init__(self, scenarios, matcher, actions_by_intent, domain):
+        self.domain = domain
+        self.conversations = []
+        forms = set(domain.get("forms") or {})
+        known = set(domain.get("actions") or [])
+        for name, messages in scenarios.items():
+            turns = []
+            for text in messages:
+                intent, score = matcher.match(text)
+                calls = []
+                for action in actions_by_intent.get(intent, []):
+                    if action in forms:
+                        validator = f"validate_{action}"
+                        if validator in known:
+                            calls.append(("form", action, validator))
+                    else:
+                        calls.append(("action", action, action))
+                turns.append((text, intent, score, calls))
+            self.conversations.append((name, turns))
+
+
+class Results:
+    def __init__(self):
+        self.latencies = {}
+        self.errors = {}
+        self.conversations = 0
+        self._lock = threading.Lock()
+
+    def record(self, action, seconds, error=None):
+        with self._lock:
+            self.latencies.setdefault(action, []).append(seconds)
+            if error is not None:
+                self.errors[action] = self.errors.get(action, 0) + 1
+
+    def finished_conversation(self):
+        with self._lock:
+            self.conversations += 1
+
+
+_local = threading.local()
+
+
+def session():
+    s = getattr(_local, "session", None)
+    if s is None:
+        s = _local.session = requests.Session()
+    return s
+
+
+def run_conversation(plan_entry, domain, url, timeout, think_time, results):
+    name, turns = plan_entry
+    conversation = Conversation(domain, f"load-{uuid.uuid4().hex[:12]}")
+    for text, intent, score, calls in turns:
+        conversation.user(text, intent, round(max(score, 0.3), 4))
+        for kind, form_or_action, action in calls:
+            if kind == "form":
+                conversation.fill_form_slot(form_or_action, text)
+            body = conversation.body(action)
+            started = time.perf_counter()
+            error = None
+            response = {}
+            try:
+                r = session().post(url, data=json.dumps(body), timeout=timeout,
+                                   headers={"Content-Type": "application/json"})
+                if r.status_code != 200:
+                    error = f"HTTP {r.status_code}"
+                else:
+                    response = r.json()
+            except (requests.RequestException, ValueError) as e:
+                error = type(e).__name__
+            results.record(action, time.perf_counter() - started, error)
+            conversation.apply(action, response)
+        if think_time:
+            time.sleep(think_time)
+    results.finished_conversation()
+
+
+def print_plan(plan):
+    for name, turns in plan.conversations:
+        print(f"\n{name}")
+        for text, intent, score, calls in turns:
+            actions = ", ".join(action for _, _, action in calls) or "-"
+            print(f"  {text[:48]:<48} → {intent:<26} ({score:.2f})  {actions}")
+
+
+def report(results, elapsed):
+    total = sum(len(v) for v in results.latencies.values())
+    print(f"\n{results.conversations} conversations, {total} webhook calls in {elapsed:.1f} s "
+          f"→ {total / max(elapsed, 1e-9):.1f} req/s")
+    print(f"{'action':<36} {'calls':>7} {'errors':>7} {'req/s':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    summary = {}
+    everything = []
+    for action in sorted(results.latencies):
+        values = sorted(results.latencies[action])
+        everything.extend(values)
+        row = {
+            "calls": len(values),
+            "errors": results.errors.get(action, 0),
+            "rps": len(values) / max(elapsed, 1e-9),
+            "p50_ms": percentile(values, 50) * 1000,
+            "p95_ms": percentile(values, 95) * 1000,
+            "p99_ms": percentile(values, 99) * 1000,
+            "max_ms": values[-1] * 1000,
+        }
+        summary[action] = row
+        print(f"{action:<36} {row['calls']:>7} {row['errors']:>7} {row['rps']:>7.1f} {row['p50_ms']:>8.1f} "
+              f"{row['p95_ms']:>8.1f} {row['p99_ms']:>8.1f} {row['max_ms']:>8.1f}")
+    everything.sort()
+    overall = {
+        "conversations": results.conversations,
+        "calls": total,
+        "errors": sum(results.errors.values()),
+        "elapsed_s": elapsed,
+        "rps": total / max(elapsed, 1e-9),
+        "p50_ms": percentile(everything, 50) * 1000,
+        "p95_ms": percentile(everything, 95) * 1000,
+        "p99_ms": percentile(everything, 99) * 1000,
+    }
+    print(f"{'ALL':<36} {total:>7} {overall['errors']:>7} {overall['rps']:>7.1f} {overall['p50_ms']:>8.1f} "
+          f"{overall['p95_ms']:>8.1f} {overall['p99_ms']:>8.1f}")
+    return {"overall": overall, "actions": summary}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay user testing scenarios against the action server webhook")
+    parser.add_argument("--url", default=None, help="Webhook URL (default: action_endpoint from endpoints.yml)")
+    parser.add_argument("--concurrency", type=int, default=10, help="Worker threads (default: 10)")
+    parser.add_argument("--rate", type=float, default=0.0,
+                        help="Conversation arrivals per second, Poisson; 0 = back to back (default: 0)")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds to generate arrivals (default: 30)")
+    parser.add_argument("--conversations", type=int, default=0,
+                        help="Stop after this many conversations instead of --duration")
+    parser.add_argument("--think-time", type=float, default=0.0, help="Seconds between turns of a conversation")
+    parser.add_argument("--timeout", type=float, default=10.0, help="HTTP timeout per request (default: 10)")
+    parser.add_argument("--min-intent-score", type=float, default=0.15,
+                        help=f"Below this token overlap a message is treated as {FALLBACK_INTENT}")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--dry-run", action="store_true", help="Only print scenario → intent → actions")
+    parser.add_argument("--json", dest="json_path", default=None, help="Write the summary to this JSON file")
+    args = parser.parse_args()
+
+    domain = load_yaml("domain.yml")
+    matcher = IntentMatcher(load_yaml(os.path.join("data", "nlu.yml")), args.min_intent_score)
+    actions_by_intent = intent_actions(domain, load_yaml(os.path.join("data", "rules.yml")),
+                                       load_yaml(os.path.join("data", "stories.yml")))
+    plan = Plan(load_scenarios(), matcher, actions_by_intent, domain)
+    if args.dry_run:
+        print_plan(plan)
+        return
+    if not any(calls for _, turns in plan.conversations for *_, calls in turns):
+        print("No scenario message maps to a custom action; nothing to send")
+        sys.exit(1)
+
+    url = args.url or action_url_from_endpoints()
+    rng = random.Random(args.seed)
+    results = Results()
+    print(f"Sending to {url} with {args.concurrency} workers, "
+          f"{'%.2f conversations/s' % args.rate if args.rate > 0 else 'back to back'}")
+
+    started = time.perf_counter()
+    futures = []
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        submitted = 0
+        next_arrival = started
+        while True:
+            now = time.perf_counter()
+            if args.conversations and submitted >= args.conversations:
+                break
+            if not args.conversations and now - started >= args.duration:
+                break
+            if args.rate > 0:
+                if now < next_arrival:
+                    time.sleep(min(next_arrival - now, 0.05))
+                    continue
+                next_arrival += rng.expovariate(args.rate)
+            elif submitted - results.conversations >= args.concurrency:
+                # Closed model: jangan menumpuk antrian melebihi jumlah worker
+                time.sleep(0.001)
+                continue
+            entry = plan.conversations[submitted % len(plan.conversations)]
+            futures.append(pool.submit(run_conversation, entry, domain, url,
+                                       args.timeout, args.think_time, results))
+            submitted += 1
+    for future in futures:
+        future.result()
+    elapsed = time.perf_counter() - started
+
+    summary = report(results, elapsed)
+    if args.json_path:
+        summary["settings"] = {k: getattr(args, k) for k in
+                               ("concurrency", "rate", "duration", "conversations", "think_time")}
+        summary["settings"]["url"] = url
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
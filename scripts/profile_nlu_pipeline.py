@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Per-component timing and memory harness for the NLU pipeline in config.yml.
+
+Loads a trained model with rasa's Agent, runs every message of a corpus
+through the NLU graph (the same path as `rasa shell nlu` / the REST parse
+endpoint) and records, for each graph node (WhitespaceTokenizer,
+LanguageModelFeaturizer, DIETClassifier, RestrictedKeywordIntentClassifier,
+...):
+
+  * wall time per message (mean, p50, p95, max) and share of the total;
+  * peak Python heap allocated during the call (tracemalloc, measured in a
+    second pass so it does not inflate the timings);
+  * growth of the process peak RSS, which also covers native memory that
+    tracemalloc cannot see (TensorFlow, tokenizers).
+
+Timing works by wrapping `rasa.engine.graph.GraphNode.__call__`, which every
+node of the inference graph goes through. The first --warmup messages are
+not recorded (TensorFlow traces its graphs on the first call).
+
+Usage examples:
+  python scripts/profile_nlu_pipeline.py
+  python scripts/profile_nlu_pipeline.py --model models/20240101-120000.tar.gz --corpus tests/test_data.yml
+  python scripts/profile_nlu_pipeline.py --corpus tests/realistic_eval.yml --repeat 3 --json nlu_profile.json
+
+Run from the project root (the directory that contains config.yml); the
+custom components are imported from there.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import resource
+import statistics
+import sys
+import time
+import tracemalloc
+
+from latency_stats import percentile
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class NodeRecorder:
+    """Collects per-node timings and memory while `active` is set"""
+
+    def __init__(self):
+        self.active = False
+        self.measure_memory = False
+        self.times = {}
+        self.peaks = {}
+        self.rss_growth = {}
+        self.components = {}
+        self.order = []
+
+    def observe(self, node, call, inputs):
+        if not self.active:
+            return call(node, *inputs)
+        name = getattr(node, "_node_name", repr(node))
+        if name not in self.components:
+            component = getattr(node, "_component_class", None)
+            self.components[name] = (getattr(component, "__name__", str(component)), getattr(node, "_fn_name", "?"))
+            self.order.append(name)
+
+        if self.measure_memory:
+            tracemalloc.reset_peak()
+            before, _ = tracemalloc.get_traced_memory()
+            result = call(node, *inputs)
+            _, peak = tracemalloc.get_traced_memory()
+            self.peaks.setdefault(name, []).append(peak - before)
+            return result
+
+        rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        started = time.perf_counter()
+        result = call(node, *inputs)
+        self.times.setdefault(name, []).append(time.perf_counter() - started)
+        rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        self.rss_growth[name] = self.rss_growth.get(name, 0) + (rss_after - rss_before)
+        return result
+
+
+def install_recorder():
+    from rasa.engine.graph import GraphNode
+
+    recorder = NodeRecorder()
+    original_call = GraphNode.__call__
+
+    def recorded_call(self, *inputs):
+        return recorder.observe(self, original_call, inputs)
+
+    GraphNode.__call__ = recorded_call
+    return recorder
+
+
+def load_corpus(paths):
+    texts = []
+    for path in paths:
+        if path.endswith((".txt", ".text")):
+            with open(path, encoding="utf-8") as f:
+                texts.extend(line.strip() for line in f if line.strip())
+            continue
+        from rasa.shared.nlu.training_data.loading import load_data
+
+        data = load_data(path)
+        texts.extend(m.get("text") for m in data.training_examples if m.get("text"))
+    return texts
+
+
+def latest_model(models_dir):
+    from rasa.model import get_latest_model
+
+    return get_latest_model(models_dir)
+
+
+def summarize(recorder, end_to_end, messages):
+    rss_scale = 1 if sys.platform == "darwin" else 1024  # ru_maxrss is bytes on macOS, KiB on Linux
+    total = sum(sum(v) for v in recorder.times.values()) or 1e-12
+    nodes = []
+    for name in recorder.order:
+        values = sorted(recorder.times.get(name, []))
+        peaks = recorder.peaks.get(name, [])
+        component, fn = recorder.components[name]
+        nodes.append({
+            "node": name,
+            "component": component,
+            "fn": fn,
+            "calls": len(values),
+            "mean_ms": statistics.mean(values) * 1000 if values else 0.0,
+            "p50_ms": percentile(values, 50) * 1000,
+            "p95_ms": percentile(values, 95) * 1000,
+            "max_ms": values[-1] * 1000 if values else 0.0,
+            "share_pct": sum(values) / total * 100,
+            "peak_heap_kib_max": max(peaks) / 1024 if peaks else None,
+            "peak_heap_kib_mean": statistics.mean(peaks) / 1024 if peaks else None,
+            "rss_peak_growth_mb": recorder.rss_growth.get(name, 0) * rss_scale / 2**20,
+        })
+    end_to_end = sorted(end_to_end)
+    return {
+        "messages": messages,
+        "parse_ms": {
+            "mean": statistics.mean(end_to_end) * 1000 if end_to_end else 0.0,
+            "p50": percentile(end_to_end, 50) * 1000,
+            "p95": percentile(end_to_end, 95) * 1000,
+            "p99": percentile(end_to_end, 99) * 1000,
+        },
+        "graph_overhead_pct": max(0.0, 1 - total / max(sum(end_to_end), 1e-12)) * 100,
+        "nodes": nodes,
+    }
+
+
+def print_table(summary):
+    print(f"\n{'node':<58} {'calls':>6} {'mean ms':>8} {'p50 ms':>8} {'p95 ms':>8} {'share':>6} "
+          f"{'heap KiB':>9} {'RSS MB':>7}")
+    for row in summary["nodes"]:
+        heap = f"{row['peak_heap_kib_max']:>9.1f}" if row["peak_heap_kib_max"] is not None else f"{'-':>9}"
+        print(f"{row['node'][:58]:<58} {row['calls']:>6} {row['mean_ms']:>8.2f} {row['p50_ms']:>8.2f} "
+              f"{row['p95_ms']:>8.2f} {row['share_pct']:>5.1f}% {heap} {row['rss_peak_growth_mb']:>7.1f}")
+    parse = summary["parse_ms"]
+    print(f"\nparse_message per message: mean {parse['mean']:.2f} ms, p50 {parse['p50']:.2f} ms, "
+          f"p95 {parse['p95']:.2f} ms, p99 {parse['p99']:.2f} ms "
+          f"(outside graph nodes: {summary['graph_overhead_pct']:.1f}%)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time each NLU graph component of a trained model")
+    parser.add_argument("--model", default=None, help="Model archive (default: latest in --models-dir)")
+    parser.add_argument("--models-dir", default="models")
+    parser.add_argument("--corpus", default=os.path.join("tests", "test_data.yml"),
+                        help="Comma separated NLU YAML files or .txt files with one message per line "
+                             "(default: tests/test_data.yml)")
+    parser.add_argument("--repeat", type=int, default=1, help="Run the corpus this many times (default: 1)")
+    parser.add_argument("--warmup", type=int, default=5, help="Unrecorded messages before timing (default: 5)")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc pass")
+    parser.add_argument("--json", dest="json_path", default="nlu_pipeline_profile.json",
+                        help="JSON artifact path (default: nlu_pipeline_profile.json)")
+    args = parser.parse_args()
+
+    os.chdir(ROOT_DIR)
+    sys.path.insert(0, ROOT_DIR)
+
+    recorder = install_recorder()
+    from rasa.core.agent import Agent
+    import rasa
+
+    model_path = args.model or latest_model(args.models_dir)
+    if not model_path:
+        print(f"No trained model found in {args.models_dir}; run `rasa train` or pass --model")
+        sys.exit(1)
+    texts = load_corpus([p for p in args.corpus.split(",") if p])
+    if not texts:
+        print(f"No messages in {args.corpus}")
+        sys.exit(1)
+
+    print(f"Loading {model_path}")
+    started = time.perf_counter()
+    agent = Agent.load(model_path)
+    load_s = time.perf_counter() - started
+    print(f"Model loaded in {load_s:.1f} s; {len(texts)} messages x {args.repeat}")
+
+    loop = asyncio.new_event_loop()
+    for text in texts[:args.warmup]:
+        loop.run_until_complete(agent.parse_message(text))
+
+    recorder.active = True
+    end_to_end = []
+    for _ in range(args.repeat):
+        for text in texts:
+            t0 = time.perf_counter()
+            loop.run_until_complete(agent.parse_message(text))
+            end_to_end.append(time.perf_counter() - t0)
+
+    if not args.no_memory:
+        recorder.measure_memory = True
+        tracemalloc.start()
+        try:
+            for text in texts:
+                loop.run_until_complete(agent.parse_message(text))
+        finally:
+            tracemalloc.stop()
+    recorder.active = False
+    loop.close()
+
+    summary = summarize(recorder, end_to_end, len(texts) * args.repeat)
+    print_table(summary)
+
+    if args.json_path:
+        summary.update({
+            "model": model_path,
+            "model_load_s": load_s,
+            "corpus": args.corpus,
+            "repeat": args.repeat,
+            "rasa": getattr(rasa, "__version__", None),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        })
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+        print(f"\nWritten to {args.json_path}")
+
+
+if __name__ == "__main__":
+    main()
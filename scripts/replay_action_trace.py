@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+"""
+Replay a captured action trace against an action server.
+
+Traces are written by the action server itself when ACTION_TRACE=1 (see
+actions/trace_capture.py): one JSONL file per process with the tracker
+state, domain, response and run time of every action call, anonymized.
+This script rebuilds the webhook request for every call and sends it to
+--url:
+
+  * --speed 1 or 10 keeps the original arrival pattern, 1x or 10x faster;
+  * --speed max sends as fast as possible, one worker per conversation at a
+    time (calls of one conversation stay in order, as with Rasa).
+
+Actions that write research data (action_simpan_data_riset writes the
+research CSV and queues a Supabase upsert; the data_collector actions append
+to CSV logs) are skipped unless --include-side-effects is given; only replay
+those against a server whose storage is disposable.
+
+Every response body (events and messages) is compared with the captured
+one; event timestamps are ignored. Calls where masked text reaches the
+response (text redaction is on by default, see ACTION_TRACE_REDACT_TEXT)
+are marked "redacted" in the trace and not compared, because the captured
+response was computed from the original text. Traces meant for correctness
+checks must be captured with ACTION_TRACE_REDACT_TEXT=0 on disposable
+storage. At the end it prints latency per action: the captured in-process
+run time next to the replayed HTTP round trip. The exit status is 1 when any
+response differs, or when comparison is on but no response was compared.
+
+Usage examples:
+  python scripts/replay_action_trace.py logs/traces/actions-*.jsonl
+  python scripts/replay_action_trace.py trace.jsonl --speed 10 --url http://localhost:5055/webhook
+  python scripts/replay_action_trace.py trace.jsonl --speed max --concurrency 16 --json replay.json
+
+Run from the project root (the directory that contains endpoints.yml).
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from latency_stats import percentile
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_URL = "http://localhost:5055/webhook"
+# Action yang menulis ke CSV riset, log percakapan atau Supabase
+SIDE_EFFECT_ACTIONS = frozenset({
+    "action_simpan_data_riset",
+    "action_log_user_input",
+    "action_collect_feedback",
+    "action_analyze_conversation_quality",
+})
+
+
+def default_url():
+    try:
+        import yaml
+
+        with open(os.path.join(ROOT_DIR, "endpoints.yml"), encoding="utf-8") as f:
+            endpoint = (yaml.safe_load(f) or {}).get("action_endpoint") or {}
+        return endpoint.get("url") or DEFAULT_URL
+    except (ImportError, OSError):
+        return DEFAULT_URL
+
+
+def load_trace(paths):
+    """Return (calls sorted by time, domains by hash)"""
+    calls, domains = [], {}
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            for line_no, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    print(f"{path}:{line_no}: skipped unreadable line")
+                    continue
+                kind = record.get("type")
+                if kind == "domain":
+                    domains[record["hash"]] = record["domain"]
+                elif kind == "call":
+                    calls.append(record)
+    calls.sort(key=lambda c: c["t"])
+    return calls, domains
+
+
+def webhook_body(call, domains):
+    tracker = call["tracker"]
+    return {
+        "next_action": call["action"],
+        "sender_id": tracker.get("sender_id"),
+        "tracker": tracker,
+        "domain": domains.get(call.get("domain_hash")),
+        "version": str((domains.get(call.get("domain_hash")) or {}).get("version", "3.1")),
+    }
+
+
+def normalize(response):
+    """Response body without event timestamps, for comparison"""
+    events = [{k: v for k, v in e.items() if k != "timestamp"} for e in response.get("events") or []]
+    return {"events": events, "responses": response.get("responses") or []}
+
+
+def first_difference(expected, actual):
+    for key in ("events", "responses"):
+        exp, act = expected[key], actual[key]
+        if len(exp) != len(act):
+            return f"{key}: {len(exp)} captured vs {len(act)} replayed"
+        for i, (a, b) in enumerate(zip(exp, act)):
+            if a != b:
+                return f"{key}[{i}]: captured {json.dumps(a, ensure_ascii=False)[:160]} " \
+                       f"vs replayed {json.dumps(b, ensure_ascii=False)[:160]}"
+    return None
+
+
+class Replay:
+    def __init__(self, url, domains, timeout, compare):
+        self.url = url
+        self.domains = domains
+        self.timeout = timeout
+        self.compare = compare
+        self.latencies = {}
+        self.captured = {}
+        self.mismatches = []
+        self.errors = {}
+        self.compared = 0
+        self.not_compared = 0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _session(self):
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = requests.Session()
+        return session
+
+    def send(self, index, call):
+        body = json.dumps(webhook_body(call, self.domains))
+        started = time.perf_counter()
+        status, response, error = None, None, None
+        try:
+            r = self._session().post(self.url, data=body, timeout=self.timeout,
+                                     headers={"Content-Type": "application/json"})
+            status = r.status_code
+            response = r.json() if status == 200 else None
+        except (requests.RequestException, ValueError) as e:
+            error = type(e).__name__
+        elapsed = time.perf_counter() - started
+
+        action = call["action"]
+        problem = None
+        if error is not None:
+            problem = f"request failed: {error}"
+        elif call.get("error"):
+            # Dulu action melempar exception; respons sukses sekarang juga perbedaan
+            if status == 200:
+                problem = f"captured {call['error']}, replay returned 200"
+        elif status != 200:
+            problem = f"HTTP {status}"
+        elif self.compare and not call.get("redacted"):
+            problem = first_difference(normalize(call.get("response") or {}), normalize(response))
+
+        with self._lock:
+            self.latencies.setdefault(action, []).append(elapsed)
+            self.captured.setdefault(action, []).append(call.get("duration_ms", 0.0) / 1000)
+            if error is not None or (status is not None and status != 200 and not call.get("error")):
+                self.errors[action] = self.errors.get(action, 0) + 1
+            if self.compare and call.get("redacted"):
+                self.not_compared += 1
+            elif self.compare:
+                self.compared += 1
+            if problem:
+                self.mismatches.append((index, action, call["tracker"].get("sender_id"), problem))
+
+
+def replay_timed(calls, replay, speed, concurrency):
+    """Kirim setiap panggilan pada offset aslinya dibagi `speed`"""
+    t0 = calls[0]["t"]
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for index, call in enumerate(calls):
+            delay = (call["t"] - t0) / speed - (time.perf_counter() - started)
+            if delay > 0:
+                time.sleep(delay)
+            pool.submit(replay.send, index, call)
+
+
+def replay_max(calls, replay, concurrency):
+    """Secepat mungkin; panggilan satu percakapan tetap berurutan"""
+    conversations = OrderedDict()
+    for index, call in enumerate(calls):
+        conversations.setdefault(call["tracker"].get("sender_id"), []).append((index, call))
+
+    def run_conversation(items):
+        for index, call in items:
+            replay.send(index, call)
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for items in conversations.values():
+            pool.submit(run_conversation, items)
+
+
+def report(replay, elapsed, total):
+    print(f"\nReplayed {total} calls in {elapsed:.1f} s → {total / max(elapsed, 1e-9):.1f} req/s")
+    print(f"{'action':<36} {'calls':>6} {'errors':>6} | {'captured run ms':^26} | {'replay round trip ms':^26}")
+    print(f"{'':<36} {'':>6} {'':>6} | {'p50':>8} {'p95':>8} {'p99':>8} | {'p50':>8} {'p95':>8} {'p99':>8}")
+    summary = {}
+    for action in sorted(replay.latencies):
+        now = sorted(replay.latencies[action])
+        before = sorted(replay.captured[action])
+        row = {
+            "calls": len(now),
+            "errors": replay.errors.get(action, 0),
+            "captured_ms": {f"p{q}": percentile(before, q) * 1000 for q in (50, 95, 99)},
+            "replay_ms": {f"p{q}": percentile(now, q) * 1000 for q in (50, 95, 99)},
+        }
+        summary[action] = row
+        c, r = row["captured_ms"], row["replay_ms"]
+        print(f"{action:<36} {row['calls']:>6} {row['errors']:>6} | {c['p50']:>8.2f} {c['p95']:>8.2f} {c['p99']:>8.2f} "
+              f"| {r['p50']:>8.2f} {r['p95']:>8.2f} {r['p99']:>8.2f}")
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a captured action trace and compare responses")
+    parser.add_argument("traces", nargs="+", help="Trace JSONL files written with ACTION_TRACE=1")
+    parser.add_argument("--url", default=None, help="Webhook URL (default: action_endpoint from endpoints.yml)")
+    parser.add_argument("--speed", default="1", help="1, 10, any factor, or 'max' (default: 1)")
+    parser.add_argument("--concurrency", type=int, default=32, help="Worker threads (default: 32)")
+    parser.add_argument("--timeout", type=float, default=10.0)
+    parser.add_argument("--limit", type=int, default=0, help="Only replay the first N calls")
+    parser.add_argument("--include-side-effects", action="store_true",
+                        help="Also replay actions that write research data: " + ", ".join(sorted(SIDE_EFFECT_ACTIONS)))
+    parser.add_argument("--no-compare", action="store_true", help="Only measure latency")
+    parser.add_argument("--show", type=int, default=10, help="Print at most this many differences (default: 10)")
+    parser.add_argument("--json", dest="json_path", default=None, help="Write the summary to this JSON file")
+    args = parser.parse_args()
+
+    calls, domains = load_trace(args.traces)
+    skipped = {}
+    if not args.include_side_effects:
+        for call in calls:
+            if call["action"] in SIDE_EFFECT_ACTIONS:
+                skipped[call["action"]] = skipped.get(call["action"], 0) + 1
+        calls = [c for c in calls if c["action"] not in SIDE_EFFECT_ACTIONS]
+        if skipped:
+            print(f"Skipping {sum(skipped.values())} call(s) of side-effecting actions "
+                  f"({', '.join(sorted(skipped))}); pass --include-side-effects to replay them")
+    if args.limit:
+        calls = calls[:args.limit]
+    if not calls:
+        print("No calls in trace")
+        sys.exit(1)
+    missing = {c.get("domain_hash") for c in calls} - set(domains)
+    if missing:
+        print(f"Warning: {len(missing)} domain version(s) missing from the trace; "
+              "those calls are sent without a domain")
+
+    url = args.url or default_url()
+    replay = Replay(url, domains, args.timeout, compare=not args.no_compare)
+    span = calls[-1]["t"] - calls[0]["t"]
+    print(f"Replaying {len(calls)} calls ({span:.1f} s of traffic) to {url} at speed {args.speed}")
+
+    started = time.perf_counter()
+    if args.speed == "max":
+        replay_max(calls, replay, args.concurrency)
+    else:
+        speed = float(args.speed)
+        if speed <= 0:
+            parser.error("--speed must be positive or 'max'")
+        replay_timed(calls, replay, speed, args.concurrency)
+    elapsed = time.perf_counter() - started
+
+    summary = report(replay, elapsed, len(calls))
+    replay.mismatches.sort()
+    if not args.no_compare:
+        print(f"\nCompared {replay.compared} responses ({replay.not_compared} redacted, not compared): "
+              f"{len(replay.mismatches)} differ")
+        for index, action, sender, problem in replay.mismatches[:args.show]:
+            print(f"  #{index} {action} ({sender}): {problem}")
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "url": url,
+                "speed": args.speed,
+                "calls": len(calls),
+                "skipped_side_effects": skipped,
+                "elapsed_s": elapsed,
+                "compared": replay.compared,
+                "not_compared": replay.not_compared,
+                "mismatches": [
+                    {"index": i, "action": a, "sender_id": s, "problem": p} for i, a, s, p in replay.mismatches
+                ],
+                "actions": summary,
+            }, f, indent=2, ensure_ascii=False)
+
+    if replay.mismatches:
+        sys.exit(1)
+    if not args.no_compare and replay.compared == 0:
+        print("\nNo response was compared: every call in the trace is redacted. Traces meant for "
+              "correctness checks must be captured with ACTION_TRACE_REDACT_TEXT=0 on disposable storage "
+              "(or pass --no-compare to only measure latency)")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Local HTTP stub of the Supabase REST endpoints used by this project.
+
+Useful to exercise actions/supabase_client.py (connection pool, timeouts,
+circuit breaker) and the batched writer without a real Supabase project.
+
+Usage examples:
+  python scripts/supabase_stub.py --port 54321
+  python scripts/supabase_stub.py --port 54321 --fail-rate 0.5 --latency-ms 200
+  SUPABASE_URL=http://127.0.0.1:54321 SUPABASE_SERVICE_KEY=dev rasa run actions
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+class StubState:
+    def __init__(self, fail_rate: float, fail_status: int, latency_ms: int) -> None:
+        self.fail_rate = fail_rate
+        self.fail_status = fail_status
+        self.latency_ms = latency_ms
+        self.tables = {}
+        self.requests = 0
+        self.lock = threading.Lock()
+
+
+def make_handler(state: StubState):
+    class Handler(BaseHTTPRequestHandler):
+        # Keep-alive agar connection pool klien benar-benar dipakai ulang
+        protocol_version = "HTTP/1.1"
+
+        def _reply(self, status: int, body=None) -> None:
+            data = b"" if body is None else json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _prelude(self):
+            with state.lock:
+                state.requests += 1
+            if state.latency_ms:
+                time.sleep(state.latency_ms / 1000.0)
+            parsed = urlparse(self.path)
+            if not parsed.path.startswith("/rest/v1/"):
+                self._reply(404, {"message": "not found"})
+                return None
+            if random.random() < state.fail_rate:
+                self._reply(state.fail_status, {"message": "stub failure"})
+                return None
+            return parsed.path[len("/rest/v1/"):], parse_qs(parsed.query)
+
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            pre = self._prelude()
+            if pre is None:
+                return
+            table, query = pre
+            rows = json.loads(body or b"[]")
+            rows = rows if isinstance(rows, list) else [rows]
+            conflict = (query.get("on_conflict") or [""])[0].split(",")
+            with state.lock:
+                stored = state.tables.setdefault(table, {})
+                for row in rows:
+                    stored[tuple(row.get(c) for c in conflict)] = row
+            self._reply(201)
+
+        def do_GET(self):
+            pre = self._prelude()
+            if pre is None:
+                return
+            table, query = pre
+            limit = int((query.get("limit") or ["100"])[0])
+            with state.lock:
+                rows = list(state.tables.get(table, {}).values())
+            for col, cond in query.items():
+                if cond[0].startswith("eq."):
+                    rows = [r for r in rows if str(r.get(col)) == cond[0][3:]]
+            self._reply(200, rows[-limit:][::-1])
+
+        def log_message(self, fmt, *args):
+            pass
+
+    return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local Supabase REST stub")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=54321)
+    parser.add_argument("--fail-rate", type=float, default=0.0,
+                        help="Fraction of requests answered with --fail-status (default: 0)")
+    parser.add_argument("--fail-status", type=int, default=503)
+    parser.add_argument("--latency-ms", type=int, default=0, help="Delay added to every request")
+    args = parser.parse_args()
+
+    state = StubState(args.fail_rate, args.fail_status, args.latency_ms)
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(state))
+    print(f"Supabase stub listening on http://{args.host}:{server.server_port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(f"Handled {state.requests} requests; rows per table: "
+              f"{ {t: len(r) for t, r in state.tables.items()} }")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,59 +1,61 @@
+# Dipakai juga oleh scripts/load_test_actions.py
+SCENARIOS = {
+    "Scenario 1: First Time User (Casual)": [
+        "hai",
+        "aku mau prewedding di bali",
+        "ada konsep apa aja?",
+        "yang romantis",
+        "harganya berapa?",
+        "mahal ya",
+        "udah dulu deh, makasih"
+    ],
+    
+    "Scenario 2: Confused User (Butuh Bantuan)": [
+        "halo",
+        "aku bingung mau pilih tema",
+        "kami beda agama sih, orangtua awalnya ga setuju",
+        "tapi sekarang udah oke",
+        "kira-kira tema apa yang cocok?",
+        "oke menarik",
+        "budget kami sekitar 8 juta",
+        "gimana cara bookingnya?"
+    ],
+    
+    "Scenario 3: LDR Couple Story": [
+        "selamat siang",
+        "mau konsultasi dong",
+        "kami LDR 4 tahun Jakarta-Bali",
+        "sempet mau putus tapi akhirnya bertahan",
+        "sekarang mau nikah",
+        "pengen foto prewedding yang ada makna gitu",
+        "bantu pilihkan tema"
+    ],
+    
+    "Scenario 4: Love at First Sight": [
+        "hi",
+        "kami cinta pada pandangan pertama",
+        "ketemu di wedding temen langsung klik",
+        "rasanya kayak udah kenal lama",
+        "percaya sama takdir",
+        "pengen konsep yang soft romantic",
+        "info paket ya"
+    ],
+    
+    "Scenario 5: Budget Conscious": [
+        "halo kak",
+        "mau tanya paket prewedding",
+        "budget kami terbatas sih",
+        "maksimal 5 juta",
+        "bisa dapet apa aja?",
+        "lokasinya dimana?",
+        "oke noted thanks"
+    ]
+}
+
+
 def generate_test_scenarios():
     """Generate test scenarios untuk user testing"""
     
-    scenarios = {
-        "Scenario 1: First Time User (Casual)": [
-            "hai",
-            "aku mau prewedding di bali",
-            "ada konsep apa aja?",
-            "yang romantis",
-            "harganya berapa?",
-            "mahal ya",
-            "udah dulu deh, makasih"
-        ],
-        
-        "Scenario 2: Confused User (Butuh Bantuan)": [
-            "halo",
-            "aku bingung mau pilih tema",
-            "kami beda agama sih, orangtua awalnya ga setuju",
-            "tapi sekarang udah oke",
-            "kira-kira tema apa yang cocok?",
-            "oke menarik",
-            "budget kami sekitar 8 juta",
-            "gimana cara bookingnya?"
-        ],
-        
-        "Scenario 3: LDR Couple Story": [
-            "selamat siang",
-            "mau konsultasi dong",
-            "kami LDR 4 tahun Jakarta-Bali",
-            "sempet mau putus tapi akhirnya bertahan",
-            "sekarang mau nikah",
-            "pengen foto prewedding yang ada makna gitu",
-            "bantu pilihkan tema"
-        ],
-        
-        "Scenario 4: Love at First Sight": [
-            "hi",
-            "kami cinta pada pandangan pertama",
-            "ketemu di wedding temen langsung klik",
-            "rasanya kayak udah kenal lama",
-            "percaya sama takdir",
-            "pengen konsep yang soft romantic",
-            "info paket ya"
-        ],
-        
-        "Scenario 5: Budget Conscious": [
-            "halo kak",
-            "mau tanya paket prewedding",
-            "budget kami terbatas sih",
-            "maksimal 5 juta",
-            "bisa dapet apa aja?",
-            "lokasinya dimana?",
-            "oke noted thanks"
-        ]
-    }
-    
     output = []
     output.append("="*60)
     output.append("🧪 USER TESTING SCENARIOS")
@@ -65,7 +67,7 @@ def generate_test_scenarios():
     output.append("  3. Apakah mereka puas dengan rekomendasinya?")
     output.append("="*60)
     
-    for scenario_name, messages in scenarios.items():
+    for scenario_name, messages in SCENARIOS.items():
         output.append(f"\n\n📋 {scenario_name}")
         output.append("-" * 60)
         for i, msg in enumerate(messages, 1):
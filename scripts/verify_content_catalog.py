@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Consistency check for actions/content_catalog.json.
+
+Verifies that every id the bot uses still resolves in the content catalog:
+- concept and theme ids referenced in button payloads (actions, domain,
+  frontend);
+- kisah_id values annotated in the NLU/test data, and the canonical values
+  of the NLU entity synonyms;
+- every story id, every kisah -> tema mapping and every synonym;
+- every recommendation template renders for every budget;
+- every theme/legend synonym resolves through the gazetteer 'tema' group to
+  its pinned key (PINNED_SYNONYMS), on its own and inside a sentence, and
+  whole-word matching holds.
+
+Usage:
+  python scripts/verify_content_catalog.py
+
+Run from the project root (the directory that contains `actions/`).
+"""
+
+import glob
+import os
+import re
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from actions.content_catalog import get_content_catalog  # noqa: E402
+from actions.gazetteer import get_gazetteer  # noqa: E402
+
+# Berkas yang berisi payload/anotasi id tema atau kisah
+SOURCE_GLOBS = [
+    "actions/*.py",
+    "domain.yml",
+    "data/*.yml",
+    "tests/*.yml",
+    "tarumenyan/tarumenyan-web/src/**/*.jsx",
+]
+PAYLOAD_RE = re.compile(r'\\?"(tema|rekomendasi_tema|kisah_id)\\?"\s*:\s*\\?"([a-z0-9_]+)\\?"')
+ANNOTATION_RE = re.compile(r"\]\((kisah_id):([a-z0-9_]+)\)")
+SYNONYM_RE = re.compile(r"^- synonym:\s*([a-z0-9_]+)\s*$", re.MULTILINE)
+
+# Resolusi yang diharapkan untuk setiap key dan sinonim di katalog. Sinonim
+# yang dipakai beberapa key (mis. 'unity') menang untuk key pertama.
+PINNED_SYNONYMS = {
+    "ratu pantai": "ratu_pantai",
+    "ratu pantai kuta": "ratu_pantai",
+    "pantai kuta": "ratu_pantai",
+    "tema perdamaian": "ratu_pantai",
+    "damai": "ratu_pantai",
+    "peace": "ratu_pantai",
+    "unity": "ratu_pantai",
+    "putri ayu": "putri_ayu",
+    "ayu": "putri_ayu",
+    "tema romantis": "putri_ayu",
+    "romantis": "putri_ayu",
+    "takdir": "putri_ayu",
+    "love at first sight": "putri_ayu",
+    "manik angkeran": "manik_angkeran",
+    "manik": "manik_angkeran",
+    "angkeran": "manik_angkeran",
+    "tema perjuangan": "manik_angkeran",
+    "perjuangan": "manik_angkeran",
+    "ldr": "manik_angkeran",
+    "jarak jauh": "manik_angkeran",
+    "fighter": "manik_angkeran",
+    "fairytale": "fairytale",
+    "dongeng": "fairytale",
+    "magical": "fairytale",
+    "fantasy": "fairytale",
+    "classic": "classic",
+    "klasik": "classic",
+    "elegan": "classic",
+    "vintage": "vintage",
+    "retro": "vintage",
+    "nostalgia": "vintage",
+    "bohemian": "bohemian",
+    "boho": "bohemian",
+    "artistik": "bohemian",
+    "soft": "soft",
+    "lembut": "soft",
+    "pastel": "soft",
+    "dramatic": "dramatic",
+    "dramatik": "dramatic",
+    "kontras": "dramatic",
+    "harmoni": "unity",
+    "rekonsiliasi": "unity",
+    "sri jaya pangus": "sri_jaya_pangus",
+    "jayapangus": "sri_jaya_pangus",
+    "kang cing wie": "sri_jaya_pangus",
+    "jayaprana layonsari": "jayaprana_layonsari",
+    "jayaprana": "jayaprana_layonsari",
+    "layonsari": "jayaprana_layonsari",
+    "ulun danu": "ulun_danu",
+    "bedugul": "ulun_danu",
+    "pura ulun danu": "ulun_danu",
+}
+
+# Teks bebas → key yang diharapkan (None = tidak boleh terdeteksi)
+RESOLUTION_CASES = [
+    ("rayuan gombal", None),  # 'ayu' hanya cocok sebagai kata utuh
+    ("pakai microsoft teams", None),
+    ("mau yang ratu_pantai", "ratu_pantai"),
+    ("Ceritakan Legenda Ulun Danu", "ulun_danu"),
+    ("manik atau jayaprana layonsari", "jayaprana_layonsari"),  # frasa terpanjang menang
+    ("ldr atau ayu", "manik_angkeran"),  # sama panjang: paling kiri menang
+    ("", None),
+]
+
+
+def referenced_ids():
+    refs = []
+    for pattern in SOURCE_GLOBS:
+        for path in sorted(glob.glob(os.path.join(ROOT_DIR, pattern), recursive=True)):
+            with open(path, encoding="utf-8") as f:
+                text = f.read()
+            rel = os.path.relpath(path, ROOT_DIR)
+            for kind, value in PAYLOAD_RE.findall(text) + ANNOTATION_RE.findall(text):
+                refs.append((rel, kind, value))
+    return refs
+
+
+def main():
+    catalog = get_content_catalog()
+    gazetteer = get_gazetteer()
+    errors = []
+    checked = 0
+
+    for concept_id in catalog.concepts:
+        checked += 1
+        if concept_id not in catalog.theme_explanations:
+            errors.append(f"concept '{concept_id}' has no theme explanation")
+        if concept_id not in catalog.rekomendasi_templates:
+            errors.append(f"concept '{concept_id}' has no recommendation template")
+
+    for tema in catalog.rekomendasi_templates:
+        for budget in catalog.paket:
+            checked += 1
+            text = catalog.render_rekomendasi(tema, budget)
+            if "{paket}" in text or catalog.paket[budget] not in text:
+                errors.append(f"template '{tema}' does not render budget '{budget}'")
+
+    for story in catalog.stories:
+        checked += 1
+        if catalog.story(story["id"]) is not story or catalog.story_json(story["id"]) is None:
+            errors.append(f"story '{story['id']}' does not resolve by id")
+        for theme in story["themes"]:
+            if story not in catalog.stories_by_theme.get(theme, ()):
+                errors.append(f"story '{story['id']}' missing from theme index '{theme}'")
+
+    for kisah_id, tema in catalog.kisah_tema.items():
+        checked += 1
+        if catalog.story(kisah_id) is None:
+            errors.append(f"kisah_tema key '{kisah_id}' is not a story id")
+        if catalog.concept(tema) is None:
+            errors.append(f"kisah '{kisah_id}' maps to unknown concept '{tema}'")
+
+    for key, syns in catalog.synonyms.items():
+        if key not in catalog.theme_explanations and key not in catalog.legend_explanations:
+            errors.append(f"synonym key '{key}' has no explanation")
+        for syn in syns:
+            checked += 1
+            if catalog.key_for_synonym(syn) is None:
+                errors.append(f"synonym '{syn}' of '{key}' does not resolve")
+
+    for phrase, expected in PINNED_SYNONYMS.items():
+        for text in (phrase, phrase.upper(), f"tolong jelaskan {phrase} dong"):
+            checked += 1
+            resolved = gazetteer.resolve_tema(text)
+            if resolved != expected:
+                errors.append(f"'{text}' resolves to '{resolved}', expected '{expected}'")
+    for phrase in catalog.by_synonym:
+        if phrase not in PINNED_SYNONYMS:
+            errors.append(f"synonym '{phrase}' is not pinned in PINNED_SYNONYMS")
+    for text, expected in RESOLUTION_CASES:
+        checked += 1
+        resolved = gazetteer.resolve_tema(text)
+        if resolved != expected:
+            errors.append(f"'{text}' resolves to '{resolved}', expected '{expected}'")
+
+    # Nilai kanonik entity synonym di data NLU harus berupa kisah atau konsep
+    for path in sorted(glob.glob(os.path.join(ROOT_DIR, "data", "*.yml"))):
+        with open(path, encoding="utf-8") as f:
+            values = SYNONYM_RE.findall(f.read())
+        for value in values:
+            checked += 1
+            if catalog.story(value) is None and catalog.concept(value) is None:
+                errors.append(f"{os.path.relpath(path, ROOT_DIR)}: synonym '{value}' is neither a story nor a concept")
+
+    for rel, kind, value in referenced_ids():
+        checked += 1
+        if kind == "kisah_id":
+            if catalog.story(value) is None or catalog.tema_for_kisah(value) is None:
+                errors.append(f"{rel}: kisah_id '{value}' does not resolve")
+        elif catalog.concept(value) is None:
+            errors.append(f"{rel}: {kind} '{value}' is not a concept id")
+
+    for error in errors:
+        print(f"ERROR: {error}")
+    print(f"Checked {checked} ids/renders: {len(errors)} problem(s)")
+    sys.exit(1 if errors else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -17,34 +17,25 @@ import os
 import sys
 import json
 import argparse
-import requests
 import pandas as pd
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from actions.supabase_client import SupabaseClient
+
 
 def verify_supabase(table: str, cid: str | None, limit: int) -> None:
-    url = os.environ.get("SUPABASE_URL")
-    key = (
-        os.environ.get("SUPABASE_ANON_KEY")
-        or os.environ.get("SUPABASE_SERVICE_KEY")
-        or os.environ.get("SUPABASE_KEY")
-    )
-
-    if not url or not key:
+    client = SupabaseClient.from_env(("SUPABASE_ANON_KEY", "SUPABASE_SERVICE_KEY", "SUPABASE_KEY"))
+
+    if client is None:
         print("ERROR: set SUPABASE_URL and SUPABASE_ANON_KEY (or SUPABASE_SERVICE_KEY).")
         return
 
-    endpoint = f"{url.rstrip('/')}/rest/v1/{table}?select=*&order=created_at.desc&limit={limit}"
+    params = {"select": "*", "order": "created_at.desc", "limit": limit}
     if cid:
-        endpoint += f"&conversation_id=eq.{cid}"
-
-    headers = {
-        "apikey": key,
-        "Authorization": f"Bearer {key}",
-        "Accept": "application/json",
-    }
+        params["conversation_id"] = f"eq.{cid}"
 
     try:
-        r = requests.get(endpoint, headers=headers, timeout=15)
+        r = client.select(table, params)
         r.raise_for_status()
         rows = r.json()
         print("Supabase rows:")
@@ -16,6 +16,8 @@ export default function Chatbot({ embedded = false }) {
   const endRef = useRef(null)
   const [stickToBottom, setStickToBottom] = useState(true)
   const retryTimeoutRef = useRef(null)
+  // Payload kisah_bali lengkap terakhir (beserta version) untuk respons delta/not_modified
+  const kisahPayloadRef = useRef(null)
 
   const senderId = useMemo(() => {
     const existing = localStorage.getItem("rasa_sender_id")
@@ -93,6 +95,62 @@ export default function Chatbot({ embedded = false }) {
     return () => clearInterval(interval)
   }, [connectionStatus])
 
+  // Sertakan versi kisah_bali yang sudah dipegang agar server tidak mengirim ulang semua kisah
+  function withKisahVersion(text) {
+    const version = kisahPayloadRef.current?.version
+    if (!version || !text.startsWith("/kisah_cinta_bali")) return text
+    const brace = text.indexOf("{")
+    if (brace === -1) return `${text}{"kisah_version":"${version}"}`
+    const rest = text.slice(brace + 1)
+    // Koma hanya bila objek entity yang sudah ada tidak kosong ("{}" tetap JSON valid)
+    const separator = rest.trimStart().startsWith("}") ? "" : ","
+    return `${text.slice(0, brace + 1)}"kisah_version":"${version}"${separator}${rest}`
+  }
+
+  // not_modified/delta hanya bisa dirender dari cache dengan versi yang sama
+  function needsFullKisah(custom) {
+    if (!custom || custom.type !== "kisah_bali" || !(custom.not_modified || custom.delta)) return false
+    const cached = kisahPayloadRef.current
+    return !cached || cached.version !== custom.version
+  }
+
+  function resolveKisahPayload(custom) {
+    if (!custom || custom.type !== "kisah_bali") return custom
+    const cached = kisahPayloadRef.current
+    if (custom.not_modified) return cached && cached.version === custom.version ? cached : null
+    if (custom.delta) return cached && cached.version === custom.version ? { ...cached, ...custom } : custom
+    if (custom.version) kisahPayloadRef.current = custom
+    return custom
+  }
+
+  async function postToRasa(message, signal) {
+    const res = await fetch(RASA_URL, {
+      method: "POST",
+      headers: { "Content-Type": "application/json" },
+      body: JSON.stringify({ sender: senderId, message }),
+      signal
+    })
+
+    if (!res.ok) {
+      throw new Error(`HTTP ${res.status}: ${res.statusText}`)
+    }
+
+    // Robust parsing: handle 204/empty body and non-JSON gracefully
+    let data = []
+    try {
+      if (res.status === 204) {
+        data = []
+      } else {
+        const raw = await res.text()
+        data = raw ? JSON.parse(raw) : []
+      }
+    } catch (parseErr) {
+      console.warn("Parse error:", parseErr)
+      data = []
+    }
+    return Array.isArray(data) ? data : []
+  }
+
   async function sendMessage(text, retryCount = 0) {
     if (!text || loading) return
 
@@ -128,39 +186,22 @@ export default function Chatbot({ embedded = false }) {
       const controller = new AbortController()
       const timeoutId = setTimeout(() => controller.abort(), 15000) // 15 detik timeout
 
-      const res = await fetch(RASA_URL, {
-        method: "POST",
-        headers: { "Content-Type": "application/json" },
-        body: JSON.stringify({ sender: senderId, message: text }),
-        signal: controller.signal
-      })
-
-      clearTimeout(timeoutId)
-
-      if (!res.ok) {
-        throw new Error(`HTTP ${res.status}: ${res.statusText}`)
+      let data = await postToRasa(withKisahVersion(text), controller.signal)
+      // Cache kisah_bali hilang/usang sehingga not_modified/delta tidak bisa dirender:
+      // kirim ulang tanpa kisah_version untuk mendapatkan payload lengkap
+      if (data.some((d) => needsFullKisah(d.custom || d.json_message))) {
+        kisahPayloadRef.current = null
+        data = await postToRasa(text, controller.signal)
       }
 
-      // Robust parsing: handle 204/empty body and non-JSON gracefully
-      let data = []
-      try {
-        if (res.status === 204) {
-          data = []
-        } else {
-          const raw = await res.text()
-          data = raw ? JSON.parse(raw) : []
-        }
-      } catch (parseErr) {
-        console.warn("Parse error:", parseErr)
-        data = []
-      }
+      clearTimeout(timeoutId)
 
       const botMsgs = (Array.isArray(data) ? data : []).map((d) => ({
         from: "bot",
         text: d.text || null,
         image: d.image,
         buttons: d.buttons || [],
-        custom: d.custom || d.json_message || null,
+        custom: resolveKisahPayload(d.custom || d.json_message || null),
       }))
 
       if (botMsgs.length === 0) {